@@ -0,0 +1,102 @@
+"""
+Cold-start import cost of the Lambda entry point and of every collector.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``,
+as a cold Lambda container would, and the cumulative import time is read from
+the report. The slowest third-party packages below each collector are listed
+so deferring them can be judged.
+
+    python benchmarks/import_time.py [--repeat 3] [--top 5] [--output FILE]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def import_times(module):
+    """
+    Import ``module`` in a fresh interpreter.
+
+    Returns
+    -------
+    dict
+        Imported module name -> cumulative import time in microseconds.
+    """
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(module, repeat):
+    """best-of-``repeat`` cumulative time of ``module`` and its slowest imports"""
+    runs = [import_times(module) for _ in range(repeat)]
+    best = min(runs, key=lambda times: times[module])
+    return best[module], best
+
+
+def top_level_packages(times, top):
+    """slowest top-level third-party packages pulled in by an import"""
+    local = (
+        "data_clients",
+        "data_collectors",
+        "features",
+        "odds_analytics",
+        "reference",
+        "s3_io",
+        "main",
+        "config",
+    )
+    packages = {}
+    for name, cumulative in times.items():
+        if "." in name or name.startswith("_") or name.startswith(local):
+            continue
+        packages[name] = cumulative
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--output", help="also append the report to this file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, SRC)
+    import main as entry_point
+
+    modules = ["main"] + [
+        path.split(":")[0] for path in entry_point.collector_map.values()
+    ]
+    lines = [f"{'module':<50} {'import ms':>10}  slowest packages (ms)"]
+    for module in modules:
+        cumulative, times = measure(module, args.repeat)
+        slowest = ", ".join(
+            f"{name} {us / 1000:.0f}"
+            for name, us in top_level_packages(times, args.top)
+        )
+        lines.append(f"{module:<50} {cumulative / 1000:>10.1f}  {slowest}")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+Throughput and peak memory of the collectors' data path on synthetic data.
+
+Odds responses (games x books x markets) and a month of odds runs, and
+32-team rankings snapshots with ``--columns`` stat columns, go through the
+odds response parser, parquet type conversion, the collectors' upserts and
+dedup, and parquet round trips. S3 is replaced by a local directory, so disk
+and parquet costs are measured without the network. Each case reports its
+best and median time over ``--repeat`` runs, rows per second and its peak
+memory: the resident set size sampled during one more run, above the size
+before it with freed memory returned to the OS (Linux only; tracemalloc would
+slow pandas several fold and miss native parquet buffers).
+
+Every run appends one JSON line (commit, parameters, results) to
+``--output``; ``--compare`` prints the change against the latest saved run
+of another commit with the same parameters.
+
+    python benchmarks/pipeline.py [--repeat 3] [--runs 360] [--games 16]
+        [--columns 1500] [--only odds] [--output bench_output.txt] [--compare]
+"""
+
+import argparse
+import contextlib
+import ctypes
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+
+BUCKET = "benchmark"
+
+# seconds between resident set size samples
+SAMPLE_SECONDS = 0.002
+
+
+class LocalDiskBoto:
+    """boto3 S3 client stand-in storing objects as files under ``root``"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, key)
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(buffer, f)
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        with open(self._path(bucket, key), "rb") as f:
+            shutil.copyfileobj(f, buffer)
+
+    def upload_file(self, file_path, bucket, key, Config=None):
+        with open(file_path, "rb") as f:
+            self.upload_fileobj(f, bucket, key)
+
+    def download_file(self, bucket, key, file_path, Config=None):
+        with open(file_path, "wb") as f:
+            self.download_fileobj(bucket, key, f)
+
+    def put_object(self, Body, Bucket, Key, **kwargs):
+        data = Body if isinstance(Body, (bytes, bytearray)) else Body.encode()
+        self.upload_fileobj(io.BytesIO(data), Bucket, Key)
+
+    def get_object(self, Bucket, Key):
+        with open(self._path(Bucket, Key), "rb") as f:
+            return {"Body": io.BytesIO(f.read())}
+
+
+class Case:
+    def __init__(self, name, run, rows, setup=None, nbytes=None):
+        """
+        Parameters
+        ----------
+        name : str
+        run : callable
+            The timed work; takes ``setup()``'s return value, if any.
+        rows : int
+            Rows handled per run, for throughput.
+        setup : callable, optional
+            Untimed preparation before every run, e.g. restoring a partition.
+        nbytes : int, optional
+            Bytes handled per run, for MB/s.
+        """
+        self.name = name
+        self.run = run
+        self.rows = rows
+        self.setup = setup
+        self.nbytes = nbytes
+
+    def once(self):
+        args = self.setup() if self.setup else None
+        started = time.perf_counter()
+        self.run(args) if self.setup else self.run()
+        return time.perf_counter() - started
+
+
+def rss_bytes():
+    """resident set size of this process, None where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def release_memory():
+    """return freed memory to the OS, so the next run's growth shows in RSS"""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class PeakRss(threading.Thread):
+    """samples the resident set size until stopped and keeps the highest"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.baseline = rss_bytes()
+        self.peak = self.baseline
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(SAMPLE_SECONDS):
+            self.peak = max(self.peak, rss_bytes())
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        if self.baseline is None:
+            return None
+        return max(self.peak, rss_bytes()) - self.baseline
+
+
+def measure(case, repeat):
+    """time ``case`` ``repeat`` times, then sample its peak memory once"""
+    times = [case.once() for _ in range(repeat)]
+    release_memory()
+    sampler = PeakRss()
+    if sampler.baseline is not None:
+        sampler.start()
+    case.once()
+    peak = sampler.stop()
+    best = min(times)
+    result = {
+        "case": case.name,
+        "rows": case.rows,
+        "best_seconds": round(best, 5),
+        "median_seconds": round(statistics.median(times), 5),
+        "rows_per_second": round(case.rows / best, 1),
+        "peak_mb": None if peak is None else round(peak / 2**20, 2),
+    }
+    if case.nbytes:
+        result["mb_per_second"] = round(case.nbytes / 2**20 / best, 2)
+    return result
+
+
+def odds_cases(s3c, args):
+    import pandas as pd
+    import synthetic
+
+    from data_clients.odds import get_odds
+    from data_collectors import odds_data_collector
+
+    response_to_df = getattr(get_odds, "__response_to_df")
+    response = synthetic.odds_response(n_games=args.games)
+    snapshot = response_to_df(response)
+    # the month's runs, evenly spaced
+    every = pd.Timedelta(days=30) / args.runs
+    month = synthetic.odds_snapshots(snapshot, args.runs, every=every)
+    run_at = month["timestamp"].iloc[-1] + every
+    latest = month.tail(len(snapshot)).assign(timestamp=run_at)
+
+    collector = odds_data_collector.OddsDataCollector(s3c=s3c)
+    collector.bucket = BUCKET
+    key = f"data/raw/odds/year={run_at.year}/month={run_at.month:02d}/data.parquet"
+    s3c.push_dataframe_to_s3(month, bucket_name=BUCKET, s3_key=key)
+    path = s3c.s3_client._path(BUCKET, key)
+    with open(path, "rb") as f:
+        partition = f.read()
+
+    def restore_partition():
+        with open(path, "wb") as f:
+            f.write(partition)
+
+    def dedup():
+        combined = pd.concat([month, latest], ignore_index=True)
+        return combined.drop_duplicates(keep="last")
+
+    def round_trip():
+        s3c.push_dataframe_to_s3(month, bucket_name=BUCKET, s3_key="bench/odds.parquet")
+        s3c.read_dataframe_from_s3(bucket_name=BUCKET, s3_key="bench/odds.parquet")
+
+    return [
+        Case("odds.response_to_df", lambda: response_to_df(response), len(snapshot)),
+        Case(
+            "odds.convert_types",
+            lambda: s3c._convert_dataframe_types(month),
+            len(month),
+        ),
+        Case("odds.dedup", dedup, len(month) + len(latest)),
+        Case(
+            "odds.upsert",
+            lambda _: collector._append_to_partition(latest, run_at),
+            len(month) + len(latest),
+            setup=restore_partition,
+            nbytes=len(partition),
+        ),
+        Case("odds.parquet_round_trip", round_trip, len(month), nbytes=len(partition)),
+    ]
+
+
+def rankings_cases(s3c, args):
+    import pandas as pd
+    import synthetic
+
+    from data_collectors import team_rankings_data_collector
+
+    snapshot = synthetic.rankings_frame(n_columns=args.columns)
+    run_at = pd.Timestamp("2024-11-18", tz="US/Central")
+
+    class Scraper:
+        unfinished_tables = []
+
+        def get_all_tables_for_date(self, date, deadline=None):
+            return snapshot.copy()
+
+    # skip __init__, which builds a real scraper
+    collector = team_rankings_data_collector.TeamRankingsDataCollector.__new__(
+        team_rankings_data_collector.TeamRankingsDataCollector
+    )
+    collector.s3c, collector.bucket, collector.trs = s3c, BUCKET, Scraper()
+
+    # a month of daily snapshots already stored
+    days = pd.date_range("2024-11-01", periods=17, tz="US/Central")
+    month = pd.concat(
+        [
+            synthetic.rankings_frame(n_columns=args.columns, seed=i).assign(
+                date=day.strftime("%Y-%m-%d"), timestamp=day
+            )
+            for i, day in enumerate(days)
+        ],
+        ignore_index=True,
+    )
+    key = f"data/raw/team_rankings/year={run_at.year}/month={run_at.month:02d}/data.parquet"
+    s3c.push_dataframe_to_s3(month, bucket_name=BUCKET, s3_key=key)
+    path = s3c.s3_client._path(BUCKET, key)
+    with open(path, "rb") as f:
+        partition = f.read()
+
+    def restore_partition():
+        with open(path, "wb") as f:
+            f.write(partition)
+
+    def round_trip():
+        s3c.push_dataframe_to_s3(
+            snapshot, bucket_name=BUCKET, s3_key="bench/rankings.parquet"
+        )
+        s3c.read_dataframe_from_s3(bucket_name=BUCKET, s3_key="bench/rankings.parquet")
+
+    return [
+        Case(
+            "rankings.convert_types",
+            lambda: s3c._convert_dataframe_types(snapshot),
+            len(snapshot),
+        ),
+        Case(
+            "rankings.upsert",
+            lambda _: collector.collect(run_at),
+            len(month) + len(snapshot),
+            setup=restore_partition,
+            nbytes=len(partition),
+        ),
+        Case("rankings.parquet_round_trip", round_trip, len(snapshot)),
+    ]
+
+
+def git_commit():
+    out = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return out.stdout.strip() or "unknown"
+
+
+def baseline(path, commit, params):
+    """latest saved run of another commit with the same parameters"""
+    if not os.path.exists(path):
+        return None
+    found = None
+    with open(path) as f:
+        for line in f:
+            try:
+                saved = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if saved.get("commit") != commit and saved.get("params") == params:
+                found = saved
+    return found
+
+
+def report(results, previous=None):
+    before = {}
+    if previous:
+        before = {r["case"]: r["best_seconds"] for r in previous["results"]}
+    lines = [
+        f"{'case':<30} {'rows':>9} {'best s':>9} {'median s':>9} "
+        f"{'rows/s':>12} {'peak MB':>9}  vs {previous['commit'] if previous else '-'}"
+    ]
+    for r in results:
+        change = ""
+        if r["case"] in before:
+            change = f"{r['best_seconds'] / before[r['case']] - 1:+.1%}"
+        lines.append(
+            f"{r['case']:<30} {r['rows']:>9} {r['best_seconds']:>9.4f} "
+            f"{r['median_seconds']:>9.4f} {r['rows_per_second']:>12.0f} "
+            f"{r['peak_mb'] if r['peak_mb'] is not None else '-':>9}  {change}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=360, help="odds runs per month")
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--columns", type=int, default=1500)
+    parser.add_argument("--only", choices=["odds", "rankings"])
+    parser.add_argument("--output", default=os.path.join(ROOT, "bench_output.txt"))
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    sys.path.insert(0, SRC)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from loguru import logger
+
+    from s3_io import s3_client
+
+    logger.remove()
+    params = {"runs": args.runs, "games": args.games, "columns": args.columns}
+
+    with tempfile.TemporaryDirectory() as root:
+        # bypass __init__: no boto3 client, objects live under root
+        s3c = s3_client.S3Client.__new__(s3_client.S3Client)
+        s3c.s3_client = LocalDiskBoto(root)
+        results = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            cases = []
+            if args.only in (None, "odds"):
+                cases += odds_cases(s3c, args)
+            if args.only in (None, "rankings"):
+                cases += rankings_cases(s3c, args)
+            for case in cases:
+                results.append(measure(case, args.repeat))
+
+    commit = git_commit()
+    previous = baseline(args.output, commit, params) if args.compare else None
+    print(report(results, previous))
+
+    record = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    with open(args.output, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Synthetic data shaped like the pipeline's real inputs, for benchmarks.
+
+Every generator takes a ``seed`` and returns the same data for the same
+arguments, so timings are comparable across commits.
+"""
+
+import numpy as np
+import pandas as pd
+
+from reference import teams
+
+BOOKS = [
+    "draftkings",
+    "fanduel",
+    "betmgm",
+    "caesars",
+    "pointsbetus",
+    "betrivers",
+    "unibet_us",
+    "wynnbet",
+    "bovada",
+    "betonlineag",
+    "lowvig",
+    "mybookieag",
+    "betus",
+    "superbook",
+    "espnbet",
+]
+
+MARKETS = ["h2h", "spreads", "totals"]
+
+# share of rankings columns that arrive as numeric strings and as records
+STRING_NUMBER_SHARE = 0.25
+RECORD_SHARE = 0.05
+
+
+def _games(n_games, start, rng):
+    table = teams.team_table()
+    names = table["team_name"].to_numpy()
+    games = []
+    for g in range(n_games):
+        home, away = rng.choice(len(names), size=2, replace=False)
+        kickoff = pd.Timestamp(start, tz="UTC") + pd.Timedelta(
+            days=int(g // 16) * 7 + int(rng.integers(0, 4)), hours=17
+        )
+        games.append((f"game{g:04d}", kickoff, names[home], names[away]))
+    return games
+
+
+def odds_response(n_games=16, books=BOOKS, markets=MARKETS, start="2024-10-06", seed=0):
+    """
+    One odds api response: games x books x markets x two outcomes.
+
+    Returns
+    -------
+    list of dict
+        Shaped like the ``/odds`` endpoint's JSON.
+    """
+    rng = np.random.default_rng(seed)
+    response = []
+    for game_id, kickoff, home, away in _games(n_games, start, rng):
+        spread = float(rng.integers(-14, 15)) + 0.5
+        total = float(rng.integers(36, 56)) + 0.5
+        bookmakers = []
+        for book in books:
+            outcomes = {
+                "h2h": [
+                    {"name": home, "price": int(rng.integers(-400, -100))},
+                    {"name": away, "price": int(rng.integers(100, 350))},
+                ],
+                "spreads": [
+                    {"name": home, "price": -110, "point": spread},
+                    {"name": away, "price": -110, "point": -spread},
+                ],
+                "totals": [
+                    {"name": "Over", "price": -110, "point": total},
+                    {"name": "Under", "price": -110, "point": total},
+                ],
+            }
+            bookmakers.append(
+                {
+                    "key": book,
+                    "markets": [
+                        {"key": market, "outcomes": outcomes[market]}
+                        for market in markets
+                    ],
+                }
+            )
+        response.append(
+            {
+                "id": game_id,
+                "commence_time": kickoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "home_team": home,
+                "away_team": away,
+                "bookmakers": bookmakers,
+            }
+        )
+    return response
+
+
+def odds_snapshots(snapshot, n_runs, start="2024-10-01", every="1h", seed=0):
+    """
+    A month partition of odds: ``snapshot`` repeated once per collector run
+    with moving prices, as the odds collector stores it.
+
+    Parameters
+    ----------
+    snapshot : pd.DataFrame
+        One run in ``get_odds`` form, e.g. from an ``odds_response``.
+    n_runs : int
+    start : str, optional
+    every : str or pd.Timedelta, optional
+        Time between runs.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``n_runs * len(snapshot)`` rows with ``timestamp`` and team ids.
+    """
+    rng = np.random.default_rng(seed)
+    runs = pd.date_range(start, periods=n_runs, freq=every, tz="US/Central")
+    df = pd.concat([snapshot] * n_runs, ignore_index=True)
+    df["timestamp"] = np.repeat(runs, len(snapshot))
+    moves = rng.choice([-10, -5, 0, 0, 0, 5, 10], size=len(df))
+    df["price"] = df["price"].to_numpy(dtype=np.int64) + moves
+    return teams.add_team_ids(df, teams.ODDS_ID_COLUMNS, source="odds")
+
+
+def rankings_frame(n_columns=1500, date="2024-11-18", seed=0):
+    """
+    One team rankings snapshot: 32 teams x ``n_columns`` stat columns, as the
+    scraper returns it (numbers, numeric strings and "W-L" records).
+
+    Returns
+    -------
+    pd.DataFrame
+        ``team`` and ``date`` followed by the stat columns.
+    """
+    rng = np.random.default_rng(seed)
+    names = teams.team_table()["rankings_name"].to_numpy()
+    n_teams = len(names)
+    n_strings = int(n_columns * STRING_NUMBER_SHARE)
+    n_records = int(n_columns * RECORD_SHARE)
+    n_floats = n_columns - n_strings - n_records
+
+    values = rng.normal(20, 8, size=(n_teams, n_floats + n_strings)).round(1)
+    data = {"team": names, "date": np.full(n_teams, date)}
+    for i in range(n_floats):
+        data[f"stat_{i:04d}"] = values[:, i]
+    for i in range(n_strings):
+        data[f"text_{i:04d}"] = values[:, n_floats + i].astype(str)
+    wins = rng.integers(0, 17, size=(n_teams, n_records))
+    losses = rng.integers(0, 17, size=(n_teams, n_records))
+    for i in range(n_records):
+        data[f"record_{i:04d}"] = [f"{w}-{l}" for w, l in zip(wins[:, i], losses[:, i])]
+    return pd.DataFrame(data)
@@ -0,0 +1,198 @@
+"""
+Date-range backfills for the Lambda handler.
+
+An event with ``start_date``/``end_date`` (and an optional ``step``, e.g.
+"weekly") runs every requested collector once per date. Dates are processed
+in chunks of at most ``max_workers`` concurrent runs. Collectors upsert with a
+read-modify-write, so runs in one chunk never share a monthly partition:
+collectors in ``DATE_PARTITIONED`` write the partition of their run date and
+run one date per month at a time, while the others ignore the run date and
+rewrite shared state (coverage, fingerprints, high-water marks, manifests),
+so they run one date at a time. Completed (collector, date) pairs are recorded
+in a checkpoint object after every chunk; a run that wrote only part of its
+data (e.g. a partial team rankings snapshot) stays pending, and no new chunk
+starts once the slowest chunk so far would not finish before the invocation's
+deadline, so re-invoking the same event resumes where the last one stopped.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from loguru import logger
+
+from deadline import Deadline
+
+CHECKPOINT_PREFIX = "state/backfill"
+
+STEPS = {"daily": "1D", "weekly": "7D"}
+
+# kept free at the end of an invocation to write the checkpoint and return
+SAFETY_SECONDS = 30
+
+# collectors whose runs only upsert the monthly partition of their run date
+DATE_PARTITIONED = frozenset({"odds_data_collector", "team_rankings_data_collector"})
+
+
+def backfill_dates(start_date, end_date, step="1D"):
+    """
+    Dates of a backfill, as US/Central midnights.
+
+    Parameters
+    ----------
+    start_date, end_date : str
+    step : str, optional
+        "daily", "weekly" or a pandas frequency such as "3D".
+
+    Returns
+    -------
+    list of pd.Timestamp
+    """
+    freq = STEPS.get(step, step)
+    dates = pd.date_range(pd.Timestamp(start_date), pd.Timestamp(end_date), freq=freq)
+    return [date.tz_localize("US/Central") for date in dates]
+
+
+def checkpoint_key(collectors, start_date, end_date, step):
+    """checkpoint object of a backfill; the same event maps to the same key"""
+    name = "+".join(sorted(collectors))
+    return f"{CHECKPOINT_PREFIX}/{name}/{start_date}_{end_date}_{step}.json"
+
+
+def plan_chunks(tasks, max_workers, date_partitioned=DATE_PARTITIONED):
+    """
+    Split (collector, date) tasks into chunks that can run at once.
+
+    Tasks of the same collector and month are spread over different chunks,
+    in date order, so no two runs in a chunk upsert the same partition. Tasks
+    of a collector not in ``date_partitioned`` are all spread over different
+    chunks, since every run of it writes the same state.
+
+    Returns
+    -------
+    list of list of tuple(str, pd.Timestamp)
+    """
+    groups = {}
+    for collector, date in sorted(tasks, key=lambda task: task[1]):
+        if collector in date_partitioned:
+            group = (collector, date.year, date.month)
+        else:
+            group = (collector,)
+        groups.setdefault(group, []).append((collector, date))
+    rounds = []
+    for group in groups.values():
+        for i, task in enumerate(group):
+            if i == len(rounds):
+                rounds.append([])
+            rounds[i].append(task)
+    return [
+        sorted(chunk[lo : lo + max_workers], key=lambda task: task[1])
+        for chunk in rounds
+        for lo in range(0, len(chunk), max_workers)
+    ]
+
+
+def is_full(result):
+    """whether an ok run wrote its date in full, judged by the collector's report"""
+    report = result.get("report") or {}
+    return report.get("status") != "partial" and not report.get("unfinished_tables")
+
+
+def run_backfill(event, context, collectors, run, s3c, bucket, max_workers):
+    """
+    Run ``collectors`` over the event's date range, resuming from its
+    checkpoint.
+
+    Parameters
+    ----------
+    event : dict
+        ``start_date``, ``end_date``, optional ``step`` and
+        ``collector_options``.
+    context : LambdaContext or None
+    collectors : list of str
+    run : callable
+        ``run(collector, dt_central, s3c, options, deadline)`` returning a
+        result dict with a ``status``.
+    s3c : S3Client
+    bucket : str
+    max_workers : int
+
+    Returns
+    -------
+    dict
+        ``status`` ("complete", "incomplete" or "error"), counts, failed and
+        partial runs, the checkpoint key and every run's result.
+    """
+    start_date, end_date = event["start_date"], event["end_date"]
+    step = event.get("step", "1D")
+    collector_options = event.get("collector_options", {})
+    key = checkpoint_key(collectors, start_date, end_date, step)
+    checkpoint = s3c.read_json_from_s3(bucket_name=bucket, s3_key=key) or {}
+    completed = checkpoint.setdefault("completed", {})
+    failed = checkpoint.setdefault("failed", {})
+
+    dates = backfill_dates(start_date, end_date, step)
+    tasks = [
+        (collector, date)
+        for collector in collectors
+        for date in dates
+        if date.strftime("%Y-%m-%d") not in completed.get(collector, [])
+    ]
+    chunks = plan_chunks(tasks, max_workers)
+    logger.info(
+        f"backfill {key}: {len(tasks)} of {len(collectors) * len(dates)} runs "
+        f"left in {len(chunks)} chunks"
+    )
+
+    deadline = Deadline.from_context(context, reserve_seconds=SAFETY_SECONDS)
+    lock = threading.Lock()
+    results = []
+    slowest = 0.0
+    done = 0
+
+    def run_task(task):
+        collector, date = task
+        options = collector_options.get(collector, {})
+        result = run(collector, date, s3c, options, deadline)
+        day = date.strftime("%Y-%m-%d")
+        with lock:
+            if result["status"] != "ok":
+                failed.setdefault(collector, {})[day] = result.get("error")
+            elif is_full(result):
+                completed.setdefault(collector, []).append(day)
+                failed.get(collector, {}).pop(day, None)
+            else:
+                # retried by the next invocation, like a date never run
+                logger.warning(f"backfill {key}: {collector} {day} partial")
+        return dict(result, date=day)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk in chunks:
+            if not deadline.fits(slowest):
+                logger.warning(f"backfill {key}: stopping before the deadline")
+                break
+            started = time.monotonic()
+            results += executor.map(run_task, chunk)
+            slowest = max(slowest, time.monotonic() - started)
+            done += 1
+            s3c.push_json_to_s3(checkpoint, bucket_name=bucket, s3_key=key)
+
+    remaining = sum(len(chunk) for chunk in chunks[done:])
+    failures = [r for r in results if r["status"] != "ok"]
+    partial = [r for r in results if r["status"] == "ok" and not is_full(r)]
+    if remaining or partial:
+        status = "incomplete"
+    elif failures:
+        status = "error"
+    else:
+        status = "complete"
+    return {
+        "status": status,
+        "checkpoint": key,
+        "completed": len(results) - len(failures) - len(partial),
+        "remaining": remaining,
+        "failed": [(r["collector"], r["date"]) for r in failures],
+        "partial": [(r["collector"], r["date"]) for r in partial],
+        "results": results,
+    }
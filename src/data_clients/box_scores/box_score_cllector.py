@@ -1,17 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import dotenv
 import pandas as pd
-import sportsdataverse as sdv
+
+import instrumentation
 
 dotenv.load_dotenv()
 
+# seasons requested at once; each is a single scoreboard request
+MAX_WORKERS = 4
+
 
 class GameCollector:
-    def __init__(self):
-        pass
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+
+    def get_season(self, year):
+        """get box scores (or upcoming game info) for one calendar year
+
+        Parameters
+        ----------
+        year : int or str
+            year to collect
+
+        Returns
+        -------
+        pd.DataFrame
+            dataframe w/ the year's box score data, empty if there are no games
+        """
+        # sportsdataverse pulls in xgboost and scikit-learn; import it only
+        # when box scores are actually fetched
+        import sportsdataverse as sdv
+
+        print(f"collecting box scores for {year}")
+        with instrumentation.stage("http_fetch") as stage:
+            season = sdv.nfl.espn_nfl_schedule(dates=year, return_as_pandas=True)
+            stage.record(df=season)
+        print(f"collected {len(season)} games for {year}")
+        return season
+
+    def get_dates(self, start, end):
+        """get box scores (or upcoming game info) of the games between two dates
+
+        Parameters
+        ----------
+        start, end : datetime
+            first and last day to collect, inclusive
+
+        Returns
+        -------
+        pd.DataFrame
+            dataframe w/ the box score data of those days, empty if there are no games
+        """
+        import sportsdataverse as sdv
+
+        dates = f"{start:%Y%m%d}-{end:%Y%m%d}"
+        print(f"collecting box scores for {dates}")
+        with instrumentation.stage("http_fetch") as stage:
+            games = sdv.nfl.espn_nfl_schedule(dates=dates, return_as_pandas=True)
+            stage.record(df=games)
+        print(f"collected {len(games)} games for {dates}")
+        return games
 
     def get_box_scores(self, year_list):
         """get box scores (or upcoming game info) for a certain number of calendar years
 
+        Years are requested concurrently, ``max_workers`` at a time; their
+        fetches are attributed to the calling collector.
+
         Parameters
         ----------
         year_list : list(str)
@@ -22,17 +78,18 @@ class GameCollector:
         pd.DataFrame
             dataframe w/ all box score data
         """
-        all_seasons_list = []
-        for year in year_list:
-            print(f"collecting box scores for {year}")
-            season = sdv.nfl.espn_nfl_schedule(dates=year, return_as_pandas=True)
-            print(season.head())
-            all_seasons_list.append(season)
-        df = pd.concat(all_seasons_list)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            all_seasons_list = list(
+                executor.map(instrumentation.propagate(self.get_season), year_list)
+            )
+        all_seasons_list = [df for df in all_seasons_list if not df.empty]
+        if not all_seasons_list:
+            return pd.DataFrame()
+        df = pd.concat(all_seasons_list, ignore_index=True)
         return df
 
 
 if __name__ == "__main__":
     gc = GameCollector()
-    df = gc.collect([2024])
-    df.to_csv("../output/box_scores/odds.csv", index=False)
+    df = gc.get_box_scores([2024])
+    df.to_csv("../output/box_scores/box_scores.csv", index=False)
@@ -0,0 +1,290 @@
+"""
+Parser for saved betting games-archive pages.
+
+The archive page (see ``docs/Games Archive.html``) renders its grid client
+side from the ``games-archive.php`` table feed, one row per game with the
+column ids in ``HEADER_FIELDS``. Two kinds of files are read:
+
+- the JSON feed, saved as ``*.json`` (a list of rows, or ``{"data": [...]}``)
+- HTML pages whose games are in a ``<table>`` with the archive's headers
+
+HTML is stream-parsed with ``lxml.etree.iterparse`` one ``<tr>`` at a time,
+clearing rows as they are consumed, so a large mirror never holds a whole DOM.
+A page saved before the grid was rendered holds no rows and yields an empty
+frame.
+
+``parse_archive_file`` returns one normalized row per game; ``to_odds_rows``
+and ``to_box_score_rows`` reshape those into the odds and box score dataset
+schemas.
+"""
+
+import json
+import re
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+from data_clients.odds.get_odds import ODDS_COLUMNS
+from reference import teams
+
+# table header -> feed column id
+HEADER_FIELDS = {
+    "Game": "name",
+    "Kickoff": "kickoff",
+    "Month": "month",
+    "Start": "start",
+    "Season": "season",
+    "Week": "week",
+    "Score": "score",
+    "Over Under": "game_over_under",
+    "Home Line": "line",
+    "Surface": "surface",
+    "Weather": "weather_icon",
+    "Temperature": "temperature",
+    "Precip.": "precip_type",
+    "Precip. %": "precip_probability",
+    "Wind Speed": "wind_speed",
+}
+
+GAME_COLUMNS = [
+    "game_id",
+    "season",
+    "week",
+    "game_time",
+    "home_team",
+    "away_team",
+    "home_abbreviation",
+    "away_abbreviation",
+    "home_score",
+    "away_score",
+    "spread",
+    "total",
+    "surface",
+    "temperature",
+    "precip_type",
+    "precip_probability",
+    "wind_speed",
+]
+
+# bookmaker key of archive lines in the odds dataset
+ARCHIVE_BOOK = "archive"
+
+# archive lines are closing lines; they are stamped just before kickoff so
+# kickoff-bounded readers (e.g. the closing line engine) pick them up
+CLOSING_OFFSET = pd.Timedelta(minutes=1)
+
+# kickoff times on the archive are US/Eastern
+ARCHIVE_TIMEZONE = "US/Eastern"
+
+_TAG = re.compile(r"<[^>]+>")
+_MATCHUP = re.compile(r"^\s*(?P<away>.+?)\s+(?:@|at|vs\.?)\s+(?P<home>.+?)\s*$")
+_SCORE = re.compile(r"(?P<away>\d+)\s*-\s*(?P<home>\d+)")
+
+
+def _cell_text(cell):
+    return " ".join(" ".join(cell.itertext()).split())
+
+
+def iter_html_rows(path):
+    """
+    Yield the archive rows of an HTML page as {column id: text} dicts.
+
+    A ``<tr>`` whose cells are all known headers starts a table; following
+    rows with the same number of cells are mapped onto those columns.
+    """
+    fields = None
+    for _, row in etree.iterparse(path, events=("end",), tag="tr", html=True):
+        cells = [_cell_text(cell) for cell in row if cell.tag in ("td", "th")]
+        if cells and all(cell in HEADER_FIELDS for cell in cells):
+            fields = [HEADER_FIELDS[cell] for cell in cells]
+        elif fields is not None and len(cells) == len(fields):
+            yield dict(zip(fields, cells))
+        # free the parsed row and everything before it
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+
+
+def read_json_rows(path):
+    with open(path) as f:
+        rows = json.load(f)
+    if isinstance(rows, dict):
+        rows = rows.get("data", rows.get("rows", []))
+    return rows
+
+
+def _text(series):
+    """strip markup (bold winners, colored lines) and surrounding whitespace"""
+    return series.astype("string").str.replace(_TAG, "", regex=True).str.strip()
+
+
+def _number(series):
+    return pd.to_numeric(
+        _text(series).str.replace("+", "", regex=False), errors="coerce"
+    )
+
+
+def _teams(names):
+    """
+    Registry full name and abbreviation of archive team names; unknown names
+    keep their archive spelling and get no abbreviation.
+    """
+    ids = teams.team_ids(names, source="games archive")
+    full_names = pd.Series(teams.team_names(ids), index=names.index)
+    abbreviations = pd.Series(teams.abbreviations(ids), index=names.index)
+    return full_names.fillna(names), abbreviations
+
+
+def normalize_rows(rows):
+    """
+    Normalize raw archive rows into one row per game.
+
+    Parameters
+    ----------
+    rows : list of dict
+        Rows keyed by feed column id.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``GAME_COLUMNS``; ``game_time`` is UTC, team names are full names and
+        abbreviations from the ``reference.teams`` registry, ``spread`` is the home line.
+        Rows without a parsable matchup or kickoff are dropped.
+    """
+    raw = pd.DataFrame(rows, columns=list(dict.fromkeys(HEADER_FIELDS.values())))
+    if raw.empty:
+        return pd.DataFrame(columns=GAME_COLUMNS)
+
+    matchup = _text(raw["name"]).str.extract(_MATCHUP)
+    score = _text(raw["score"]).str.extract(_SCORE).astype("float64")
+    kickoff = pd.to_datetime(_text(raw["kickoff"]), errors="coerce", format="mixed")
+    if kickoff.dt.tz is None:
+        kickoff = kickoff.dt.tz_localize(ARCHIVE_TIMEZONE, ambiguous="NaT")
+    kickoff = kickoff.dt.tz_convert("UTC")
+
+    home_team, home_abbreviation = _teams(matchup["home"])
+    away_team, away_abbreviation = _teams(matchup["away"])
+    games = pd.DataFrame(
+        {
+            "season": _number(raw["season"]).astype("Int16"),
+            "week": _number(raw["week"]).astype("Int16"),
+            "game_time": kickoff,
+            "home_team": home_team,
+            "away_team": away_team,
+            "home_abbreviation": home_abbreviation,
+            "away_abbreviation": away_abbreviation,
+            "home_score": score["home"],
+            "away_score": score["away"],
+            "spread": _number(raw["line"]),
+            "total": _number(raw["game_over_under"]),
+            "surface": _text(raw["surface"]),
+            "temperature": _number(raw["temperature"]),
+            "precip_type": _text(raw["precip_type"]),
+            "precip_probability": _number(raw["precip_probability"]),
+            "wind_speed": _number(raw["wind_speed"]),
+        }
+    )
+    games = games.dropna(subset=["game_time", "home_team", "away_team"])
+    games.insert(
+        0,
+        "game_id",
+        "archive_"
+        + games["game_time"].dt.tz_convert(ARCHIVE_TIMEZONE).dt.strftime("%Y%m%d")
+        + "_"
+        + games["away_abbreviation"].fillna(games["away_team"])
+        + "_"
+        + games["home_abbreviation"].fillna(games["home_team"]),
+    )
+    return games.drop_duplicates("game_id", keep="last", ignore_index=True)
+
+
+def parse_archive_file(path):
+    """
+    Parse one saved archive page or feed file.
+
+    Parameters
+    ----------
+    path : str
+        ``*.json`` feed file or HTML page.
+
+    Returns
+    -------
+    pd.DataFrame
+        Output of ``normalize_rows``.
+    """
+    if str(path).lower().endswith(".json"):
+        rows = read_json_rows(path)
+    else:
+        rows = list(iter_html_rows(path))
+    return normalize_rows(rows)
+
+
+def to_odds_rows(games):
+    """
+    Archive closing lines in the odds dataset schema.
+
+    Every game gives two ``spreads`` rows (home line and its negation) and two
+    ``totals`` rows (Over/Under). Archive lines have no prices.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``ODDS_COLUMNS`` plus ``timestamp`` (``CLOSING_OFFSET`` before kickoff).
+    """
+    spreads = games.dropna(subset=["spread"])
+    totals = games.dropna(subset=["total"])
+    parts = [
+        (spreads, "spreads", spreads["home_team"], spreads["spread"]),
+        (spreads, "spreads", spreads["away_team"], -spreads["spread"]),
+        (totals, "totals", "Over", totals["total"]),
+        (totals, "totals", "Under", totals["total"]),
+    ]
+    frames = [
+        pd.DataFrame(
+            {
+                "game_id": part["game_id"],
+                "game_time": part["game_time"].dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "home_team": part["home_team"],
+                "away_team": part["away_team"],
+                "book": ARCHIVE_BOOK,
+                "market": market,
+                "outcome": outcome,
+                "price": np.nan,
+                "point": point.astype("float64"),
+                "timestamp": part["game_time"] - CLOSING_OFFSET,
+            }
+        )
+        for part, market, outcome, point in parts
+    ]
+    odds = pd.concat(frames, ignore_index=True)
+    return odds[ODDS_COLUMNS + ["timestamp"]].sort_values(
+        ["game_time", "game_id", "market", "outcome"], ignore_index=True
+    )
+
+
+def to_box_score_rows(games):
+    """
+    Archive results in the box score dataset schema (the ESPN scoreboard
+    columns the box score collector relies on).
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    final = games["home_score"].notna() & games["away_score"].notna()
+    return pd.DataFrame(
+        {
+            "game_id": games["game_id"],
+            "season": games["season"],
+            "week": games["week"],
+            "date": games["game_time"].dt.strftime("%Y-%m-%dT%H:%MZ"),
+            "status_type_name": np.where(final, "STATUS_FINAL", "STATUS_SCHEDULED"),
+            "home_score": games["home_score"],
+            "away_score": games["away_score"],
+            "home_abbreviation": games["home_abbreviation"],
+            "away_abbreviation": games["away_abbreviation"],
+            "home_display_name": games["home_team"],
+            "away_display_name": games["away_team"],
+        }
+    )
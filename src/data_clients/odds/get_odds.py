@@ -5,40 +5,105 @@ import pandas as pd
 import requests
 from loguru import logger
 
+import instrumentation
+
 dotenv.load_dotenv()
 
 __api_key = os.environ.get("ODDS_API_KEY")
 __base_url = "https://api.the-odds-api.com/v4/sports"
 
 
-def __request_upcoming_nfl_odds_us():
-    url = f"{__base_url}/americanfootball_nfl/odds/?apiKey={__api_key}&regions=us&markets=h2h,spreads,totals&oddsFormat=american"
-    payload = {}
-    headers = {}
-    response = requests.request("GET", url, headers=headers, data=payload)
+ODDS_COLUMNS = [
+    "game_id",
+    "game_time",
+    "home_team",
+    "away_team",
+    "book",
+    "market",
+    "outcome",
+    "price",
+    "point",
+]
+
+__quota_usage = {}
+
+
+def __record_quota_usage(response):
     requests_used = response.headers.get("X-Requests-Used")
     requests_remaining = response.headers.get("X-Requests-Remaining")
-    total_requests = response.headers.get("Requests")
+    total_requests = response.headers.get("X-Requests-Last")
     print(f"Requests Used This Query: {total_requests}")
     print(f"Requests Used this Month: {requests_used}")
     print(f"Requests Remaining: {requests_remaining}")
+    for key, value in (
+        ("requests_used", requests_used),
+        ("requests_remaining", requests_remaining),
+        ("requests_last", total_requests),
+    ):
+        try:
+            __quota_usage[key] = int(float(value))
+        except (TypeError, ValueError):
+            pass
+
+
+def __format_commence_time(dt):
+    ts = pd.Timestamp(dt)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def __commence_time_params(commence_time_from=None, commence_time_to=None):
+    params = ""
+    if commence_time_from is not None:
+        params += f"&commenceTimeFrom={__format_commence_time(commence_time_from)}"
+    if commence_time_to is not None:
+        params += f"&commenceTimeTo={__format_commence_time(commence_time_to)}"
+    return params
+
+
+def __fetch(url):
+    with instrumentation.stage("http_fetch") as stage:
+        response = requests.request("GET", url, headers={}, data={})
+        stage.record(nbytes=len(response.content))
+    return response
+
+
+def __request_upcoming_nfl_events(time_params=""):
+    # the events endpoint does not count against the usage quota
+    url = f"{__base_url}/americanfootball_nfl/events/?apiKey={__api_key}{time_params}"
+    response = __fetch(url)
     return response.json()
 
 
-def __request_upcoming_nfl_odds_us2():
-    url = f"{__base_url}/americanfootball_nfl/odds/?apiKey={__api_key}&regions=us2&markets=h2h,spreads,totals&oddsFormat=american"
-    payload = {}
-    headers = {}
-    response = requests.request("GET", url, headers=headers, data=payload)
-    requests_used = response.headers.get("X-Requests-Used")
-    requests_remaining = response.headers.get("X-Requests-Remaining")
-    total_requests = response.headers.get("Requests")
-    print(f"Requests Used This Query: {total_requests}")
-    print(f"Requests Used this Month: {requests_used}")
-    print(f"Requests Remaining: {requests_remaining}")
+def __request_upcoming_nfl_odds_us(time_params=""):
+    url = f"{__base_url}/americanfootball_nfl/odds/?apiKey={__api_key}&regions=us&markets=h2h,spreads,totals&oddsFormat=american{time_params}"
+    response = __fetch(url)
+    __record_quota_usage(response)
+    return response.json()
+
+
+def __request_upcoming_nfl_odds_us2(time_params=""):
+    url = f"{__base_url}/americanfootball_nfl/odds/?apiKey={__api_key}&regions=us2&markets=h2h,spreads,totals&oddsFormat=american{time_params}"
+    response = __fetch(url)
+    __record_quota_usage(response)
     return response.json()
 
 
+def get_quota_usage():
+    """
+    Quota headers reported by the odds api requests of the most recent
+    ``get_upcoming_nfl_odds`` call.
+
+    Returns:
+        dict: requests_used, requests_remaining and requests_last (credits
+            spent by the last request), for whichever headers were present;
+            empty when the call made no odds request
+    """
+    return dict(__quota_usage)
+
+
+@instrumentation.timed("parse")
 def __response_to_df(response):
     dct_list = []
     for game in response:
@@ -57,7 +122,7 @@ def __response_to_df(response):
                         "point": outcome.get("point"),
                     }
                     dct_list.append(row_dict)
-    df = pd.DataFrame(dct_list)
+    df = pd.DataFrame(dct_list, columns=ODDS_COLUMNS)
     df["point"] = df["point"].fillna(0.0)
     df.sort_values(
         by=["game_time", "game_id", "outcome", "point", "price"],
@@ -81,10 +146,32 @@ def __response_to_df(response):
     return df
 
 
-def get_upcoming_nfl_odds():
-    response = __request_upcoming_nfl_odds_us()
+def get_upcoming_nfl_odds(commence_time_from=None, commence_time_to=None):
+    """
+    Get h2h, spreads and totals odds for upcoming games from the us and us2 regions.
+
+    Args:
+        commence_time_from (datetime, optional): only games starting at or after this time
+        commence_time_to (datetime, optional): only games starting at or before this time
+
+    Returns:
+        pd.DataFrame: one row per game, book, market and outcome
+
+    When a commence time window is given, the free events endpoint is asked
+    first, and the odds requests are skipped (no quota spent) if no game
+    starts inside the window. ``get_quota_usage`` is cleared first, so after
+    a skipped request it is empty rather than left over from an earlier call.
+    """
+    __quota_usage.clear()
+    time_params = __commence_time_params(commence_time_from, commence_time_to)
+    if time_params:
+        events = __request_upcoming_nfl_events(time_params)
+        if not events:
+            logger.info("No games in commence time window, skipping odds requests")
+            return pd.DataFrame(columns=ODDS_COLUMNS)
+    response = __request_upcoming_nfl_odds_us(time_params)
     df = __response_to_df(response)
-    response = __request_upcoming_nfl_odds_us2()
+    response = __request_upcoming_nfl_odds_us2(time_params)
     df2 = __response_to_df(response)
     return pd.concat([df, df2]).reset_index(drop=True)
 
@@ -1,11 +1,15 @@
+import io
 import os
 import random
 import ssl
 import time
+import urllib.request
 from datetime import datetime
 
 import pandas as pd
 
+import instrumentation
+
 
 class TeamRankingsScraper:
     def __init__(self):
@@ -16,6 +20,7 @@ class TeamRankingsScraper:
         self.url_df = url_df.fillna("")
         self.stats_df = None
         self.stats_df_path = "../data/raw/tr_stats_short.xlsx"
+        self.unfinished_tables = []
 
     def __strip_team_names(self, df):
         """
@@ -165,10 +170,17 @@ class TeamRankingsScraper:
         print(f"getting {url}")
         random_float = random.uniform(0, 2)
         time.sleep(random_float)
-        tables = pd.read_html(url)
-        df = tables[0]
+        with instrumentation.stage("http_fetch") as stage:
+            with urllib.request.urlopen(url) as response:
+                html = response.read()
+            stage.record(nbytes=len(html))
+        with instrumentation.stage("parse") as stage:
+            tables = pd.read_html(io.StringIO(html.decode("utf-8", errors="replace")))
+            df = tables[0]
+            stage.record(df=df)
         return df
 
+    @instrumentation.timed("postprocess")
     def _postprocess_df(self, df, record_cols, category, table_name):
         """process the dataframe
 
@@ -200,17 +212,34 @@ class TeamRankingsScraper:
                 df[col] = df[col].astype(str)
         return df
 
-    def get_all_tables_for_date(self, date):
+    def get_all_tables_for_date(self, date, deadline=None):
         """get all the table data for a single date
 
+        With a deadline, no table is fetched unless the slowest table so far
+        would still finish before it; the tables left out are listed in
+        ``unfinished_tables`` and the tables fetched are returned as a
+        partial snapshot.
+
         Args:
             date (datetime):
+            deadline (Deadline, optional): when fetching must be done
 
         Returns:
-            pd.DataFrame: data for all teams on one date in DF
+            pd.DataFrame: data for all teams on one date in DF, empty if no
+                table was fetched
         """
         all_stats_df = pd.DataFrame()
+        self.unfinished_tables = []
+        slowest = 0.0
         for i, row in self.url_df.iterrows():
+            if deadline is not None and not deadline.fits(slowest):
+                self.unfinished_tables = [
+                    f"{r.category}_{r.table_name}"
+                    for r in self.url_df.loc[i:].itertuples()
+                ]
+                print(f"out of time, {len(self.unfinished_tables)} tables unfinished")
+                break
+            started = time.monotonic()
             record_cols = [
                 element.strip()
                 for element in row.record_cols.split(",")
@@ -229,10 +258,15 @@ class TeamRankingsScraper:
             if all_stats_df.empty:
                 all_stats_df = df
             else:
-                all_stats_df = pd.merge(
-                    left=all_stats_df, right=df, how="left", on="team"
-                )
+                with instrumentation.stage("merge") as stage:
+                    all_stats_df = pd.merge(
+                        left=all_stats_df, right=df, how="left", on="team"
+                    )
+                    stage.record(df=all_stats_df)
                 print(all_stats_df.shape)
+            slowest = max(slowest, time.monotonic() - started)
+        if all_stats_df.empty:
+            return all_stats_df
         all_stats_df = self.__add_date_to_df(all_stats_df, date)
         all_stats_df = self.__replace_weird_symbols(all_stats_df)
         all_stats_df = self.__replace_percentage_strings(all_stats_df)
@@ -0,0 +1,159 @@
+"""
+Cache policy for Open-Meteo responses.
+
+Archive responses never change and are kept until evicted; forecast responses
+expire after an hour. The SQLite cache is capped at ``max_entries`` responses
+with least-recently-used eviction and lives in a configurable directory
+(``/tmp`` on Lambda, where the working directory is read only). It can
+optionally be synced with the S3 bucket so warm responses survive cold
+starts. Hits and misses are counted for logging.
+"""
+
+import os
+from collections import OrderedDict
+from datetime import timedelta
+
+import requests_cache
+from loguru import logger
+
+NEVER_EXPIRE = requests_cache.NEVER_EXPIRE
+ARCHIVE_URL_PATTERN = "archive-api.open-meteo.com"
+FORECAST_URL_PATTERN = "api.open-meteo.com"
+DEFAULT_FORECAST_TTL = timedelta(hours=1)
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_S3_KEY = "cache/weather/weather_cache.sqlite"
+CACHE_FILE_NAME = "weather_cache.sqlite"
+
+
+def default_cache_dir():
+    """``WEATHER_CACHE_DIR`` if set, ``/tmp`` on Lambda, ``./.cache`` otherwise"""
+    if os.environ.get("WEATHER_CACHE_DIR"):
+        return os.environ["WEATHER_CACHE_DIR"]
+    if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        return "/tmp/weather_cache"
+    return os.path.join(os.getcwd(), ".cache")
+
+
+class BoundedCachedSession(requests_cache.CachedSession):
+    def __init__(self, cache_name, max_entries=DEFAULT_MAX_ENTRIES, **kwargs):
+        """
+        SQLite backed ``CachedSession`` holding at most ``max_entries``
+        responses, evicting the least recently used ones.
+
+        Parameters
+        ----------
+        cache_name : str
+            Path of the SQLite file.
+        max_entries : int, optional
+            Maximum number of cached responses.
+        **kwargs
+            Passed to ``requests_cache.CachedSession``.
+        """
+        super().__init__(cache_name, backend="sqlite", **kwargs)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # existing entries start in insertion order, oldest first
+        self._lru = OrderedDict.fromkeys(self.cache.responses.keys())
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if getattr(response, "from_cache", False):
+            self.hits += 1
+        else:
+            self.misses += 1
+        key = getattr(response, "cache_key", None)
+        if key and (key in self._lru or self.cache.contains(key=key)):
+            self._lru[key] = None
+            self._lru.move_to_end(key)
+            self._evict()
+        return response
+
+    def _evict(self):
+        excess = len(self._lru) - self.max_entries
+        if excess <= 0:
+            return
+        keys = [self._lru.popitem(last=False)[0] for _ in range(excess)]
+        self.cache.delete(*keys)
+        self.evictions += len(keys)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._lru),
+        }
+
+
+class WeatherCachePolicy:
+    def __init__(
+        self,
+        cache_dir=None,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        archive_ttl=NEVER_EXPIRE,
+        forecast_ttl=DEFAULT_FORECAST_TTL,
+        s3c=None,
+        bucket=None,
+        s3_key=DEFAULT_S3_KEY,
+    ):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Directory of the SQLite cache, ``default_cache_dir()`` by default.
+        max_entries : int, optional
+            Maximum number of cached responses before LRU eviction.
+        archive_ttl : timedelta or int, optional
+            Expiry of archive responses, never by default.
+        forecast_ttl : timedelta or int, optional
+            Expiry of forecast responses, one hour by default.
+        s3c : S3Client, optional
+            When given with ``bucket``, the cache file is downloaded from
+            ``s3_key`` if there is no local copy, and ``persist`` uploads it.
+        bucket : str, optional
+        s3_key : str, optional
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.cache_path = os.path.join(self.cache_dir, CACHE_FILE_NAME)
+        self.max_entries = max_entries
+        self.urls_expire_after = {
+            ARCHIVE_URL_PATTERN: archive_ttl,
+            FORECAST_URL_PATTERN: forecast_ttl,
+        }
+        self.forecast_ttl = forecast_ttl
+        self.s3c = s3c
+        self.bucket = bucket
+        self.s3_key = s3_key
+        self.session = None
+
+    def create_session(self):
+        """
+        Create the cached session, restoring the cache file from S3 first
+        when configured and no local copy exists (e.g. after a cold start).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if self.s3c is not None and not os.path.exists(self.cache_path):
+            self.s3c.read_file_from_s3(self.bucket, self.s3_key, self.cache_path)
+        self.session = BoundedCachedSession(
+            self.cache_path,
+            max_entries=self.max_entries,
+            expire_after=self.forecast_ttl,
+            urls_expire_after=self.urls_expire_after,
+        )
+        return self.session
+
+    def stats(self):
+        return self.session.stats() if self.session is not None else {}
+
+    def persist(self):
+        """
+        Log hit/miss counts and, when S3 backed, upload the cache file if this
+        session added responses.
+        """
+        stats = self.stats()
+        logger.info(f"weather cache stats: {stats}")
+        if self.s3c is not None and stats.get("misses"):
+            self.s3c.push_file_to_s3(self.cache_path, self.bucket, self.s3_key)
+        return stats
@@ -1,17 +1,132 @@
+import numpy as np
 import openmeteo_requests
 import pandas as pd
-import requests_cache
 from retry_requests import retry
 
+import instrumentation
+from data_clients.weather import weather_cache
+from reference import stadiums
+
+DEFAULT_HISTORICAL_PARAMS = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "apparent_temperature",
+    "precipitation",
+    "rain",
+    "snowfall",
+    "snow_depth",
+    "cloud_cover",
+    "wind_speed_10m",
+    "wind_gusts_10m",
+]
+DEFAULT_FORECAST_PARAMS = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "apparent_temperature",
+    "precipitation_probability",
+    "precipitation",
+    "rain",
+    "showers",
+    "snowfall",
+    "snow_depth",
+    "cloud_cover",
+    "wind_speed_10m",
+    "wind_gusts_10m",
+]
+# locations per request; open-meteo accepts many more, this keeps urls short
+MAX_LOCATIONS_PER_REQUEST = 50
+
+
+def hourly_time_index(hourly):
+    """
+    UTC time index of an Open-Meteo hourly section.
+
+    Parameters
+    ----------
+    hourly : openmeteo_sdk.VariablesWithTime
+        ``response.Hourly()``.
+
+    Returns
+    -------
+    pd.DatetimeIndex
+    """
+    return pd.date_range(
+        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
+        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
+        freq=pd.Timedelta(seconds=hourly.Interval()),
+        inclusive="left",
+    )
+
+
+def hourly_length(hourly):
+    return (hourly.TimeEnd() - hourly.Time()) // hourly.Interval()
+
+
+def extract_hourly(hourly, param_list, out=None):
+    """
+    Copy every hourly variable of a response into one float32 block.
+
+    Open-Meteo returns the variables in the order they were requested, so
+    column ``i`` of the block is ``param_list[i]`` for any parameter list.
+
+    Parameters
+    ----------
+    hourly : openmeteo_sdk.VariablesWithTime
+        ``response.Hourly()``, fetched once by the caller.
+    param_list : list of str
+        The requested hourly parameters, in request order.
+    out : np.ndarray, optional
+        Pre-allocated (hours x parameters) float32 block to fill, e.g. a row
+        slice of a larger block; allocated in column-major order when None.
+
+    Returns
+    -------
+    np.ndarray
+        The filled block.
+
+    Raises
+    ------
+    ValueError
+        If the response does not hold one variable per requested parameter.
+    """
+    n_variables = hourly.VariablesLength()
+    if n_variables != len(param_list):
+        raise ValueError(
+            f"response has {n_variables} hourly variables, expected {len(param_list)}"
+        )
+    if out is None:
+        out = np.empty(
+            (hourly_length(hourly), len(param_list)), dtype=np.float32, order="F"
+        )
+    for i in range(len(param_list)):
+        out[:, i] = hourly.Variables(i).ValuesAsNumpy()
+    return out
+
+
+def block_to_frame(block, param_list, index=None):
+    """
+    Expose a float32 block as a DataFrame without copying it.
+
+    A column-major block becomes the frame's single float32 block as is.
+    """
+    return pd.DataFrame(block, index=index, columns=list(param_list), copy=False)
+
 
 class WeatherClient:
-    def __init__(self):
+    def __init__(self, cache_policy=None):
         """
         Initializes the WeatherClient with a cached session and retry mechanism.
 
-        A CachedSession is used to cache API responses, and the retry mechanism
+        A bounded CachedSession is used to cache API responses, and the retry mechanism
         ensures that failed requests are retried up to 5 times with exponential backoff.
 
+        Parameters
+        ----------
+        cache_policy : weather_cache.WeatherCachePolicy, optional
+            Cache location, size cap, per-endpoint TTLs and optional S3 backing.
+            Defaults to a local cache where archive responses never expire and
+            forecast responses expire after an hour.
+
         Attributes
         ----------
         client : openmeteo_requests.Client
@@ -19,7 +134,8 @@ class WeatherClient:
         historical_url : str
             URL endpoint for historical weather data.
         """
-        cache_session = requests_cache.CachedSession(".cache", expire_after=-1)
+        self.cache_policy = cache_policy or weather_cache.WeatherCachePolicy()
+        cache_session = self.cache_policy.create_session()
         retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
         self.client = openmeteo_requests.Client(session=retry_session)
         self.historical_url = "https://archive-api.open-meteo.com/v1/archive"
@@ -126,28 +242,14 @@ class WeatherClient:
             "wind_speed_unit": wind_speed_unit,
             "precipitation_unit": precipitation_unit,
         }
-        responses = self.client.weather_api(self.historical_url, params=params)
+        with instrumentation.stage("http_fetch"):
+            responses = self.client.weather_api(self.historical_url, params=params)
         response = responses[0]
         timezone_name = response.Timezone()
-        time_index_utc = pd.date_range(
-            start=pd.to_datetime(response.Hourly().Time(), unit="s", utc=True),
-            end=pd.to_datetime(response.Hourly().TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=response.Hourly().Interval()),
-            inclusive="left",
-        )
-        time_index_local = time_index_utc.tz_convert(timezone_name)
-        hourly_data = {
-            "temperature_2m": response.Hourly().Variables(0).ValuesAsNumpy(),
-            "relative_humidity_2m": response.Hourly().Variables(1).ValuesAsNumpy(),
-            "apparent_temperature": response.Hourly().Variables(2).ValuesAsNumpy(),
-            "rain": response.Hourly().Variables(3).ValuesAsNumpy(),
-            "snowfall": response.Hourly().Variables(4).ValuesAsNumpy(),
-            "snow_depth": response.Hourly().Variables(5).ValuesAsNumpy(),
-            "cloud_cover": response.Hourly().Variables(6).ValuesAsNumpy(),
-            "wind_speed_10m": response.Hourly().Variables(7).ValuesAsNumpy(),
-            "wind_gusts_10m": response.Hourly().Variables(8).ValuesAsNumpy(),
-        }
-        df = pd.DataFrame(hourly_data, index=time_index_local)
+        hourly = response.Hourly()
+        time_index_local = hourly_time_index(hourly).tz_convert(timezone_name)
+        block = extract_hourly(hourly, param_list)
+        df = block_to_frame(block, param_list, index=time_index_local)
         return df
 
     def get_weather_forecast(
@@ -214,26 +316,179 @@ class WeatherClient:
             "precipitation_unit": precipitation_unit,
             "forecast_days": forecast_days,
         }
-        responses = self.client.weather_api(self.forecast_url, params=params)
+        with instrumentation.stage("http_fetch"):
+            responses = self.client.weather_api(self.forecast_url, params=params)
         response = responses[0]
         timezone = response.Timezone()
         hourly = response.Hourly()
-        hourly_data = {
-            "date": pd.date_range(
-                start=pd.to_datetime(hourly.Time(), unit="s")
-                .tz_localize("UTC")
-                .tz_convert(timezone),
-                end=pd.to_datetime(hourly.TimeEnd(), unit="s")
-                .tz_localize("UTC")
-                .tz_convert(timezone),
-                freq=pd.Timedelta(seconds=hourly.Interval()),
-                inclusive="left",
+        block = extract_hourly(hourly, param_list)
+        hourly_dataframe = block_to_frame(block, param_list)
+        hourly_dataframe.insert(
+            0, "date", hourly_time_index(hourly).tz_convert(timezone)
+        )
+        return hourly_dataframe
+
+    def _outdoor_venues(self, venues):
+        if venues is None:
+            return stadiums.venue_catalog(include_domes=False)
+        if "roof" in venues.columns:
+            venues = venues[venues["roof"] != stadiums.ROOF_DOME]
+        return venues.reset_index(drop=True)
+
+    def _batch_weather_api(self, url, venues, params):
+        """
+        Request ``params`` for every venue, ``MAX_LOCATIONS_PER_REQUEST``
+        locations per round trip, and return one long frame.
+        """
+        param_list = params["hourly"]
+        sections = []
+        for start in range(0, len(venues), MAX_LOCATIONS_PER_REQUEST):
+            chunk = venues.iloc[start : start + MAX_LOCATIONS_PER_REQUEST]
+            chunk_params = dict(
+                params,
+                latitude=chunk["latitude"].tolist(),
+                longitude=chunk["longitude"].tolist(),
             )
+            with instrumentation.stage("http_fetch"):
+                responses = self.client.weather_api(url, params=chunk_params)
+            # responses come back in the order of the requested locations
+            sections.extend(
+                (venue, response.Hourly())
+                for venue, response in zip(chunk["venue"], responses)
+            )
+
+        # fill one pre-allocated block for all venues instead of concatenating
+        lengths = [hourly_length(hourly) for _, hourly in sections]
+        n_rows = int(sum(lengths))
+        block = np.empty((n_rows, len(param_list)), dtype=np.float32, order="F")
+        times = np.empty(n_rows, dtype=np.int64)
+        venue_codes = np.empty(n_rows, dtype=np.int16)
+        offset = 0
+        for code, ((_, hourly), length) in enumerate(zip(sections, lengths)):
+            rows = slice(offset, offset + length)
+            extract_hourly(hourly, param_list, out=block[rows])
+            times[rows] = hourly_time_index(hourly).asi8
+            venue_codes[rows] = code
+            offset += length
+
+        df = block_to_frame(block, param_list)
+        df.insert(0, "time", pd.to_datetime(times, unit="ns", utc=True))
+        df.insert(
+            0,
+            "venue",
+            pd.Categorical.from_codes(
+                venue_codes, categories=[venue for venue, _ in sections]
+            ),
+        )
+        return df
+
+    def get_historical_weather_batch(
+        self,
+        start_date,
+        end_date,
+        venues=None,
+        param_list=DEFAULT_HISTORICAL_PARAMS,
+        temperature_unit="fahrenheit",
+        wind_speed_unit="mph",
+        precipitation_unit="inch",
+    ):
+        """
+        Retrieve historical hourly weather for many venues in one request.
+
+        Parameters
+        ----------
+        start_date : str
+            The start date, in 'YYYY-MM-DD' format.
+        end_date : str
+            The end date, in 'YYYY-MM-DD' format.
+        venues : pd.DataFrame, optional
+            Rows with ``venue``, ``latitude``, ``longitude`` and optionally
+            ``roof``. Defaults to every venue in the stadium catalog. Dome
+            venues are skipped.
+        param_list : list of str, optional
+            Hourly parameters to retrieve, by default ``DEFAULT_HISTORICAL_PARAMS``.
+        temperature_unit : str, optional
+            Unit for temperature, by default "fahrenheit".
+        wind_speed_unit : str, optional
+            Unit for wind speed, by default "mph".
+        precipitation_unit : str, optional
+            Unit for precipitation, by default "inch".
+
+        Returns
+        -------
+        pd.DataFrame
+            Long frame with one row per (venue, hour): ``venue``, ``time``
+            (UTC) and one column per parameter.
+
+        Examples
+        --------
+        >>> wc = WeatherClient()
+        >>> df = wc.get_historical_weather_batch("2024-09-05", "2024-09-09")
+        >>> df.groupby("venue")["wind_speed_10m"].max()
+        """
+        params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "hourly": param_list,
+            "temperature_unit": temperature_unit,
+            "wind_speed_unit": wind_speed_unit,
+            "precipitation_unit": precipitation_unit,
         }
-        for i, param in enumerate(param_list):
-            hourly_data[param] = hourly.Variables(i).ValuesAsNumpy()
-        hourly_dataframe = pd.DataFrame(data=hourly_data)
-        return hourly_dataframe
+        return self._batch_weather_api(
+            self.historical_url, self._outdoor_venues(venues), params
+        )
+
+    def get_weather_forecast_batch(
+        self,
+        venues=None,
+        forecast_days=14,
+        past_days=0,
+        param_list=DEFAULT_FORECAST_PARAMS,
+        temperature_unit="fahrenheit",
+        wind_speed_unit="mph",
+        precipitation_unit="inch",
+    ):
+        """
+        Retrieve forecast hourly weather for many venues in one request.
+
+        Parameters
+        ----------
+        venues : pd.DataFrame, optional
+            Rows with ``venue``, ``latitude``, ``longitude`` and optionally
+            ``roof``. Defaults to every venue in the stadium catalog. Dome
+            venues are skipped.
+        forecast_days : int, optional
+            Number of days to forecast, starting from today. Default is 14.
+        past_days : int, optional
+            Number of days before today to include, covering the days the
+            archive has not caught up with yet. Default is 0.
+        param_list : list of str, optional
+            Hourly parameters to retrieve, by default ``DEFAULT_FORECAST_PARAMS``.
+        temperature_unit : str, optional
+            Unit for temperature, by default "fahrenheit".
+        wind_speed_unit : str, optional
+            Unit for wind speed, by default "mph".
+        precipitation_unit : str, optional
+            Unit for precipitation, by default "inch".
+
+        Returns
+        -------
+        pd.DataFrame
+            Long frame with one row per (venue, hour): ``venue``, ``time``
+            (UTC) and one column per parameter.
+        """
+        params = {
+            "hourly": param_list,
+            "temperature_unit": temperature_unit,
+            "wind_speed_unit": wind_speed_unit,
+            "precipitation_unit": precipitation_unit,
+            "forecast_days": forecast_days,
+        }
+        if past_days:
+            params["past_days"] = past_days
+        return self._batch_weather_api(
+            self.forecast_url, self._outdoor_venues(venues), params
+        )
 
 
 if __name__ == "__main__":
@@ -246,3 +501,7 @@ if __name__ == "__main__":
     print(weather_df)
     forecast_df = wc.get_weather_forecast(latitude=lat, longitude=lon, forecast_days=7)
     print(forecast_df)
+    week_df = wc.get_historical_weather_batch(
+        start_date="2023-09-07", end_date="2023-09-11"
+    )
+    print(week_df)
@@ -0,0 +1,131 @@
+"""
+Columnar store for hourly weather in the bucket.
+
+Hourly frames from ``WeatherClient``'s batch methods are kept under
+``data/raw/weather/year=YYYY/month=MM/data.parquet`` (UTC month of ``time``),
+one row per (venue, hour). Parameters are stored as float32 and ``venue`` as a
+categorical, so a season of every outdoor venue stays a few MB and loads
+without per-column conversions.
+"""
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from s3_io import partitions
+
+DATASET = "weather"
+KEY_COLUMNS = ["venue", "time"]
+
+
+def compact(hourly):
+    """
+    Normalize an hourly frame to the stored layout.
+
+    Parameters
+    ----------
+    hourly : pd.DataFrame
+        ``venue``, ``time`` and parameter columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Categorical ``venue``, UTC ``time``, float32 parameters, sorted by
+        (venue, time) with one row per key (the last one wins).
+    """
+    df = hourly.dropna(subset=KEY_COLUMNS)
+    df = df.drop_duplicates(KEY_COLUMNS, keep="last")
+    df = df.assign(
+        venue=df["venue"].astype(str).astype("category"),
+        time=pd.to_datetime(df["time"], utc=True),
+    )
+    params = df.columns.drop(KEY_COLUMNS)
+    df = df.astype(dict.fromkeys(params, np.float32))
+    return df.sort_values(KEY_COLUMNS, ignore_index=True)
+
+
+class WeatherStore:
+    def __init__(self, s3c, bucket):
+        """
+        Parameters
+        ----------
+        s3c : S3Client
+        bucket : str
+        """
+        self.s3c = s3c
+        self.bucket = bucket
+
+    def write(self, hourly):
+        """
+        Upsert hourly rows into their monthly partitions.
+
+        Parameters
+        ----------
+        hourly : pd.DataFrame
+            ``venue``, ``time`` and parameter columns; rows replace stored rows
+            with the same (venue, time).
+
+        Returns
+        -------
+        list of str
+            Keys of the partitions written.
+        """
+        if hourly.empty:
+            return []
+        hourly = compact(hourly)
+        times = hourly["time"].dt
+        keys = []
+        for (year, month), new in hourly.groupby([times.year, times.month]):
+            s3_key = partitions.partition_key(DATASET, year, month)
+            existing = self.s3c.read_dataframe_from_s3(
+                bucket_name=self.bucket, s3_key=s3_key
+            )
+            if existing is not None:
+                new = pd.concat([existing, new], ignore_index=True)
+            new = compact(new)
+            self.s3c.push_dataframe_to_s3(
+                df=new, bucket_name=self.bucket, s3_key=s3_key
+            )
+            keys.append(s3_key)
+        logger.info(f"wrote {len(hourly)} weather hours to {len(keys)} partitions")
+        return keys
+
+    def read(self, start, end, venues=None, columns=None):
+        """
+        Hourly rows with ``start <= time <= end``.
+
+        Parameters
+        ----------
+        start : datetime-like
+            Naive values are taken as UTC.
+        end : datetime-like
+        venues : list of str, optional
+            Venue ids to keep, all by default.
+        columns : list of str, optional
+            Parameters to load, all by default; ``venue`` and ``time`` are
+            always loaded.
+
+        Returns
+        -------
+        pd.DataFrame
+            In the ``compact`` layout.
+        """
+        start = _utc(start)
+        end = _utc(end)
+        if columns is not None:
+            columns = KEY_COLUMNS + [c for c in columns if c not in KEY_COLUMNS]
+        df = partitions.read_partitions(
+            self.s3c, self.bucket, DATASET, start, end, columns=columns
+        )
+        if df.empty:
+            return df
+        times = pd.to_datetime(df["time"], utc=True)
+        keep = (times >= start) & (times <= end)
+        if venues is not None:
+            keep &= df["venue"].isin(venues)
+        return compact(df[keep])
+
+
+def _utc(value):
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tz is None else value.tz_convert("UTC")
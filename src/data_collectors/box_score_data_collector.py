@@ -0,0 +1,204 @@
+import os
+from datetime import datetime
+
+import dotenv
+import pandas as pd
+from loguru import logger
+
+from data_clients.box_scores import box_score_cllector
+from data_collectors import data_collector
+from reference import teams
+from s3_io import partitions, s3_client
+
+dotenv.load_dotenv()
+
+DATASET = "box_scores"
+
+# game id -> [season, status|home score|away score] of every stored game
+STATE_KEY = "state/box_scores.json"
+
+# a stored game is only rewritten when one of these changed
+CHANGE_COLUMNS = ["status_type_name", "home_score", "away_score"]
+
+FINAL_STATUS = "STATUS_FINAL"
+
+# a season's playoffs run into this month of the next calendar year
+LAST_PLAYOFF_MONTH = 2
+
+# days of the scoreboard a daily run fetches: recent games that may have
+# finished or been corrected since the last run, and the coming week
+SCOREBOARD_DAYS_BACK = 3
+SCOREBOARD_DAYS_AHEAD = 7
+
+
+def season_of(date):
+    """
+    NFL season a date falls in.
+
+    Args:
+        date (datetime): e.g. a game or collection time
+
+    Returns:
+        int: the year the season started, so January and February games
+            belong to the previous year's season
+    """
+    return date.year - 1 if date.month <= LAST_PLAYOFF_MONTH else date.year
+
+
+def scoreboard_window(date):
+    """
+    First and last day of the scoreboard a daily run fetches.
+
+    Args:
+        date (datetime): collection time
+
+    Returns:
+        tuple of pd.Timestamp: ``SCOREBOARD_DAYS_BACK`` days before ``date``
+            and ``SCOREBOARD_DAYS_AHEAD`` days after it
+    """
+    date = pd.Timestamp(date)
+    return (
+        date - pd.Timedelta(days=SCOREBOARD_DAYS_BACK),
+        date + pd.Timedelta(days=SCOREBOARD_DAYS_AHEAD),
+    )
+
+
+def _fingerprints(df):
+    """status|home score|away score of every game, as strings"""
+    columns = [col for col in CHANGE_COLUMNS if col in df.columns]
+    return df[columns].astype(str).agg("|".join, axis=1)
+
+
+def changed_games(df, state):
+    """
+    Games that are new or whose status or score differs from the stored state.
+
+    Args:
+        df (pd.DataFrame): fetched games with ``game_id`` and CHANGE_COLUMNS
+        state (dict): game id -> [season, fingerprint] of stored games
+
+    Returns:
+        pd.DataFrame: the rows of ``df`` to upsert
+    """
+    fingerprints = _fingerprints(df)
+    stored = (
+        df["game_id"]
+        .astype(str)
+        .map(lambda game_id: state.get(game_id, [None, None])[1])
+    )
+    return df[fingerprints != stored]
+
+
+class BoxScoreDataCollector(data_collector.DataCollector):
+    def __init__(self, s3c=None):
+        self.s3c = s3c or s3_client.S3Client()
+        self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
+        self.gc = box_score_cllector.GameCollector()
+
+    def _years_to_fetch(self, datetime, years, state):
+        """the current season, or the requested seasons with games not final yet"""
+        season = season_of(datetime)
+        if years is None:
+            return [season]
+        open_years = {
+            season
+            for season, fingerprint in state.values()
+            if not fingerprint.startswith(FINAL_STATUS)
+        }
+        stored_years = {season for season, _ in state.values()}
+        return [
+            year
+            for year in years
+            if int(year) in open_years
+            or int(year) not in stored_years
+            or int(year) >= season
+        ]
+
+    def collect(self, datetime, years=None):
+        """
+        Fetch box scores and upsert the games whose status or score changed.
+
+        A daily run (no ``years``) fetches only the scoreboard around
+        ``datetime`` (see ``scoreboard_window``), not the whole season.
+
+        Args:
+            datetime (datetime): collection time
+            years (list of int, optional): seasons to backfill; seasons whose
+                stored games are all final are skipped. Defaults to the
+                current scoreboard dates.
+
+        Returns:
+            pd.DataFrame: the upserted games
+        """
+        state = (
+            self.s3c.read_json_from_s3(bucket_name=self.bucket, s3_key=STATE_KEY) or {}
+        )
+        daily = years is None
+        years = self._years_to_fetch(datetime, years, state)
+        if not years:
+            logger.info("all requested box score years are final and stored")
+            return pd.DataFrame()
+
+        if daily:
+            start, end = scoreboard_window(datetime)
+            logger.info(
+                f"getting {years[0]} box scores from {start:%Y-%m-%d} to {end:%Y-%m-%d}"
+            )
+            df = self.gc.get_dates(start, end)
+        else:
+            logger.info(f"getting box scores for {years}")
+            df = self.gc.get_box_scores(years)
+        if df.empty:
+            return df
+        df = df.drop_duplicates("game_id", keep="last")
+        changed = changed_games(df, state)
+        logger.info(f"{len(changed)} of {len(df)} games new or changed")
+        if changed.empty:
+            return changed
+
+        changed = changed.assign(timestamp=datetime)
+        changed = teams.add_team_ids(
+            changed, teams.BOX_SCORE_ID_COLUMNS, source="box score"
+        )
+        self._upsert(changed)
+        for season, game_id, fingerprint in zip(
+            changed["season"], changed["game_id"].astype(str), _fingerprints(changed)
+        ):
+            state[game_id] = [int(season), fingerprint]
+        self.s3c.push_json_to_s3(state, bucket_name=self.bucket, s3_key=STATE_KEY)
+        return changed
+
+    def _upsert(self, changed):
+        """replace the rows of the changed games in each game-month partition"""
+        game_local = pd.to_datetime(changed["date"], utc=True).dt.tz_convert(
+            "US/Central"
+        )
+        for (year, month), new in changed.groupby(
+            [game_local.dt.year, game_local.dt.month]
+        ):
+            s3_key = partitions.partition_key(DATASET, year, month)
+            existing = self.s3c.read_dataframe_from_s3(
+                bucket_name=self.bucket, s3_key=s3_key
+            )
+            if existing is not None:
+                existing = existing[
+                    ~existing["game_id"].astype(str).isin(new["game_id"].astype(str))
+                ]
+                existing = teams.backfill_team_ids(existing, teams.BOX_SCORE_ID_COLUMNS)
+                # stored timestamps are epoch nanoseconds, the run's datetimes
+                new = pd.concat(
+                    [
+                        partitions.utc_timestamps(existing, ["timestamp"]),
+                        partitions.utc_timestamps(new, ["timestamp"]),
+                    ],
+                    ignore_index=True,
+                )
+            self.s3c.push_dataframe_to_s3(
+                df=new, bucket_name=self.bucket, s3_key=s3_key
+            )
+
+
+if __name__ == "__main__":
+    bsdc = BoxScoreDataCollector()
+    dt = datetime.now()
+    bsdc.collect(dt)
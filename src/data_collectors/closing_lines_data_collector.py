@@ -0,0 +1,37 @@
+import os
+from datetime import datetime
+
+import dotenv
+from loguru import logger
+
+from data_collectors import data_collector
+from odds_analytics import closing_lines
+from s3_io import s3_client
+
+dotenv.load_dotenv()
+
+
+class ClosingLinesDataCollector(data_collector.DataCollector):
+    def __init__(self, s3c=None):
+        self.s3c = s3c or s3_client.S3Client()
+        self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
+        self.engine = closing_lines.ClosingLineEngine(self.s3c, self.bucket)
+
+    def collect(self, datetime, start=None):
+        """
+        Derive opening/closing/consensus lines from odds snapshots collected
+        since the last run.
+
+        Args:
+            datetime (datetime): end of the odds range to process
+            start (str, optional): rebuild all games with snapshots from this
+                date on instead of resuming from the high-water mark
+        """
+        logger.info("deriving closing lines")
+        return self.engine.update(datetime, start=start)
+
+
+if __name__ == "__main__":
+    cldc = ClosingLinesDataCollector()
+    dt = datetime.now()
+    cldc.collect(dt)
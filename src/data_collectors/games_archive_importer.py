@@ -0,0 +1,180 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import dotenv
+import pandas as pd
+from loguru import logger
+
+from data_clients.games_archive import games_archive_parser
+from reference import teams
+from s3_io import partitions, s3_client
+
+dotenv.load_dotenv()
+
+ARCHIVE_EXTENSIONS = (".html", ".htm", ".json")
+
+
+def archive_files(paths):
+    """
+    Expand files and directories (local mirrors, searched recursively) into
+    the archive pages and feed files to import.
+
+    Args:
+        paths (list of str): files or directories
+
+    Returns:
+        list of str: sorted file paths
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in ARCHIVE_EXTENSIONS:
+                files.update(
+                    glob.glob(os.path.join(path, "**", f"*{ext}"), recursive=True)
+                )
+        else:
+            files.add(path)
+    return sorted(files)
+
+
+def _central_months(values):
+    local = pd.to_datetime(values, utc=True).dt.tz_convert("US/Central")
+    return [local.dt.year, local.dt.month]
+
+
+class GamesArchiveImporter:
+    def __init__(self, max_workers=None):
+        """
+        Seeds the odds and box score datasets from saved games-archive pages.
+
+        Pages are parsed in a process pool; the combined games are then
+        written with one read and one write per monthly partition. Meant to be
+        run locally (see ``__main__``): Lambda has no shared memory for
+        process pools.
+
+        Args:
+            max_workers (int, optional): parser processes, one per CPU by default
+        """
+        self.s3c = s3_client.S3Client()
+        self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
+        self.max_workers = max_workers
+
+    def parse(self, paths):
+        """
+        Parse every archive file under ``paths`` into one frame of games.
+
+        Args:
+            paths (list of str): files or directories
+
+        Returns:
+            pd.DataFrame: ``games_archive_parser.GAME_COLUMNS``, one row per game
+        """
+        files = archive_files(paths)
+        logger.info(f"parsing {len(files)} games archive files")
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = list(executor.map(games_archive_parser.parse_archive_file, files))
+        for path, df in zip(files, frames):
+            if df.empty:
+                logger.warning(f"no archive games found in {path}")
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            return pd.DataFrame(columns=games_archive_parser.GAME_COLUMNS)
+        games = pd.concat(frames, ignore_index=True)
+        return games.drop_duplicates("game_id", keep="last", ignore_index=True)
+
+    def import_paths(self, paths):
+        """
+        Parse archive files and upsert their lines and results.
+
+        Archive rows replace earlier archive rows of the same game. Box scores
+        of games the box score collector already stored (same home
+        ``team_id`` and kickoff date) are skipped so the two sources never double count a game.
+
+        Args:
+            paths (list of str): files or directories
+
+        Returns:
+            dict: games parsed and odds/box score rows written
+        """
+        games = self.parse(paths)
+        if games.empty:
+            return {"games": 0, "odds_rows": 0, "box_score_rows": 0}
+
+        odds = teams.add_team_ids(
+            games_archive_parser.to_odds_rows(games),
+            teams.ODDS_ID_COLUMNS,
+            source="games archive",
+        )
+        for (year, month), new in odds.groupby(_central_months(odds["timestamp"])):
+            self._upsert_odds(partitions.partition_key("odds", year, month), new)
+
+        box_scores = teams.add_team_ids(
+            games_archive_parser.to_box_score_rows(games), teams.BOX_SCORE_ID_COLUMNS
+        )
+        written = 0
+        for (year, month), new in box_scores.groupby(
+            _central_months(box_scores["date"])
+        ):
+            s3_key = partitions.partition_key("box_scores", year, month)
+            written += self._upsert_box_scores(s3_key, new)
+
+        logger.info(
+            f"imported {len(games)} archive games: {len(odds)} odds rows, "
+            f"{written} box score rows"
+        )
+        return {"games": len(games), "odds_rows": len(odds), "box_score_rows": written}
+
+    def _upsert_odds(self, s3_key, new):
+        existing = self.s3c.read_dataframe_from_s3(
+            bucket_name=self.bucket, s3_key=s3_key
+        )
+        if existing is not None:
+            replaced = (
+                existing["book"] == games_archive_parser.ARCHIVE_BOOK
+            ) & existing["game_id"].isin(new["game_id"])
+            existing = teams.backfill_team_ids(existing, teams.ODDS_ID_COLUMNS)
+            # stored timestamps are epoch nanoseconds, archive ones UTC and
+            # collector ones US/Central: one UTC dtype for the whole partition
+            new = pd.concat(
+                [
+                    partitions.utc_timestamps(existing[~replaced], ["timestamp"]),
+                    partitions.utc_timestamps(new, ["timestamp"]),
+                ],
+                ignore_index=True,
+            )
+        self.s3c.push_dataframe_to_s3(df=new, bucket_name=self.bucket, s3_key=s3_key)
+
+    def _upsert_box_scores(self, s3_key, new):
+        existing = self.s3c.read_dataframe_from_s3(
+            bucket_name=self.bucket, s3_key=s3_key
+        )
+        if existing is not None:
+            existing = existing[~existing["game_id"].astype(str).isin(new["game_id"])]
+            existing = teams.backfill_team_ids(existing, teams.BOX_SCORE_ID_COLUMNS)
+            # registry ids, not abbreviations: ESPN and the archive spell
+            # some teams differently ("WSH" / "WAS")
+            stored = pd.MultiIndex.from_arrays(
+                [existing["home_team_id"], existing["date"].astype(str).str[:10]]
+            )
+            keys = pd.MultiIndex.from_arrays(
+                [new["home_team_id"], new["date"].str[:10]]
+            )
+            new = new[~keys.isin(stored)]
+            if new.empty:
+                return 0
+            new_count = len(new)
+            new = pd.concat([existing, new], ignore_index=True)
+        else:
+            new_count = len(new)
+        self.s3c.push_dataframe_to_s3(df=new, bucket_name=self.bucket, s3_key=s3_key)
+        return new_count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import saved games archive pages")
+    parser.add_argument("paths", nargs="+", help="archive files or mirror directories")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    GamesArchiveImporter(max_workers=args.workers).import_paths(args.paths)
@@ -6,49 +6,148 @@ import pandas as pd
 from loguru import logger
 
 from data_clients.odds import get_odds
-from data_collectors import data_collector
-from s3_io import s3_client
+from data_collectors import data_collector, odds_poll_scheduler
+from memory_guard import MemoryGuard
+from reference import teams
+from s3_io import partitions, s3_client, upsert
 
 dotenv.load_dotenv()
 
+# latest known lines of every upcoming game, merged across full and window runs
+LATEST_KEY = "data/raw/odds_latest/data.parquet"
+SWEEP_STATE_KEY = "state/odds_sweep.json"
+TIME_COLUMNS = ["game_time", "timestamp"]
+
 
 class OddsDataCollector(data_collector.DataCollector):
-    def __init__(self):
-        self.s3c = s3_client.S3Client()
+    def __init__(self, s3c=None):
+        self.s3c = s3c or s3_client.S3Client()
         self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
 
-    def collect(self, datetime):
-        logger.info("getting odds")
-        odds_df = get_odds.get_upcoming_nfl_odds()
+    def collect(
+        self, datetime, adaptive=False, window_hours=None, full_sweep_hours=12
+    ):
+        """
+        Collect an odds snapshot and upsert it into the monthly partition.
+
+        Args:
+            datetime (datetime): collection time
+            adaptive (bool): let the quota-aware scheduler decide whether this
+                invocation polls at all (see odds_poll_scheduler)
+            window_hours (float, optional): only fetch games kicking off within
+                this many hours; None fetches every upcoming game
+            full_sweep_hours (float): in window mode, still fetch every upcoming
+                game when the last full sweep is older than this
+        """
+        scheduler = None
+        if adaptive:
+            scheduler = odds_poll_scheduler.OddsPollScheduler(self.s3c, self.bucket)
+            should_poll, interval = scheduler.should_poll(datetime)
+            if not should_poll:
+                logger.info(f"Skipping odds poll, next poll due after {interval:.2f}h interval")
+                return None
+
+        full_sweep = self._full_sweep_due(datetime, window_hours, full_sweep_hours)
+        if full_sweep:
+            logger.info("getting odds")
+            odds_df = get_odds.get_upcoming_nfl_odds()
+        else:
+            window_start = pd.Timestamp(datetime)
+            window_end = window_start + pd.Timedelta(hours=window_hours)
+            logger.info(f"getting odds for games starting before {window_end}")
+            odds_df = get_odds.get_upcoming_nfl_odds(
+                commence_time_from=window_start, commence_time_to=window_end
+            )
 
         # Add collection timestamp to the data
         odds_df['timestamp'] = datetime
+        odds_df = teams.add_team_ids(odds_df, teams.ODDS_ID_COLUMNS, source="odds")
+
+        if not odds_df.empty:
+            self._append_to_partition(odds_df, datetime)
+        latest_df = self._merge_latest(odds_df, datetime, full_sweep)
+        if full_sweep and window_hours is not None:
+            self.s3c.push_json_to_s3(
+                {"last_full_sweep": pd.Timestamp(datetime).isoformat()},
+                bucket_name=self.bucket,
+                s3_key=SWEEP_STATE_KEY,
+            )
 
+        if scheduler is not None:
+            scheduler.record_poll(datetime, latest_df, get_odds.get_quota_usage())
+
+    def _full_sweep_due(self, datetime, window_hours, full_sweep_hours):
+        if window_hours is None:
+            return True
+        state = self.s3c.read_json_from_s3(
+            bucket_name=self.bucket, s3_key=SWEEP_STATE_KEY
+        )
+        if not state or "last_full_sweep" not in state:
+            return True
+        elapsed = pd.Timestamp(datetime) - pd.Timestamp(state["last_full_sweep"])
+        return elapsed >= pd.Timedelta(hours=full_sweep_hours)
+
+    def _append_to_partition(self, odds_df, datetime):
         # Use year/month partitioning
         s3_key = f"data/raw/odds/year={datetime.year}/month={datetime.month:02d}/data.parquet"
 
-        # Read existing monthly data if it exists, then append
-        try:
-            existing_df = self.s3c.read_dataframe_from_s3(
-                bucket_name=self.bucket, s3_key=s3_key
-            )
-            if existing_df is not None:
-                # Append new data to existing, keeping ALL historical timestamps
-                # This preserves odds from before games are played
-                combined_df = pd.concat([existing_df, odds_df], ignore_index=True)
+        # Append to the monthly data; exact duplicates share the run's
+        # timestamp, so a partition too large for memory is merged run by run
+        upsert.upsert_partition(
+            self.s3c,
+            self.bucket,
+            s3_key,
+            odds_df,
+            merge=self._merge,
+            slice_column="timestamp",
+            guard=MemoryGuard("odds_data_collector"),
+        )
 
-                # Only remove exact duplicates (same game, book, market, price, point, timestamp)
-                # This prevents double-writing if the job runs twice at the same time
-                combined_df = combined_df.drop_duplicates(keep='last')
+    @staticmethod
+    def _merge(existing_df, odds_df):
+        # Append new data to existing, keeping ALL historical timestamps
+        # This preserves odds from before games are played
+        # rows written before team ids existed get them too
+        existing_df = teams.backfill_team_ids(existing_df, teams.ODDS_ID_COLUMNS)
+        combined_df = pd.concat([existing_df, odds_df], ignore_index=True)
 
-                odds_df = combined_df
-                logger.info(f"Appended {len(odds_df) - len(existing_df)} new odds rows to existing {len(existing_df)} rows")
-        except Exception as e:
-            logger.info(f"No existing file found or error reading: {e}. Creating new file.")
+        # Only remove exact duplicates (same game, book, market, price, point, timestamp)
+        # This prevents double-writing if the job runs twice at the same time
+        combined_df = combined_df.drop_duplicates(keep='last')
+        logger.info(f"Appended {len(combined_df) - len(existing_df)} new odds rows to existing {len(existing_df)} rows")
+        return combined_df
 
+    def _merge_latest(self, odds_df, datetime, full_sweep):
+        """
+        Merge a (possibly partial) snapshot into the latest known lines of every
+        upcoming game. Games in the snapshot replace their previous rows, games
+        outside the fetch window keep the lines from earlier runs, and games
+        that have kicked off are dropped.
+        """
+        latest_df = odds_df
+        if not full_sweep:
+            previous_df = self.s3c.read_dataframe_from_s3(
+                bucket_name=self.bucket, s3_key=LATEST_KEY
+            )
+            if previous_df is not None:
+                now = pd.Timestamp(datetime)
+                now = now.tz_localize("UTC") if now.tzinfo is None else now
+                # stored timestamps are epoch nanoseconds, the run's are
+                # US/Central datetimes: both sides as UTC before the concat
+                previous_df = partitions.utc_timestamps(previous_df, TIME_COLUMNS)
+                upcoming = previous_df["game_time"] > now
+                replaced = previous_df["game_id"].isin(odds_df["game_id"])
+                latest_df = pd.concat(
+                    [
+                        previous_df[upcoming & ~replaced],
+                        partitions.utc_timestamps(odds_df, TIME_COLUMNS),
+                    ],
+                    ignore_index=True,
+                )
         self.s3c.push_dataframe_to_s3(
-            df=odds_df, bucket_name=self.bucket, s3_key=s3_key
+            df=latest_df, bucket_name=self.bucket, s3_key=LATEST_KEY
         )
+        return latest_df
 
 
 if __name__ == "__main__":
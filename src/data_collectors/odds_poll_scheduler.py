@@ -0,0 +1,266 @@
+"""
+Quota-aware polling schedule for the odds collector.
+
+The collector is invoked on a fixed cadence; in adaptive mode the scheduler
+decides on each invocation whether a poll is worth spending quota on. The
+decision weighs the time until the nearest kickoff, how much the consensus
+lines have been moving, and how much of the monthly odds api quota is left.
+State is a small JSON document in S3 so it survives between invocations.
+"""
+
+import math
+
+import pandas as pd
+from loguru import logger
+
+STATE_KEY = "state/odds_poll_scheduler.json"
+
+# (max hours until kickoff, base polling interval in hours), first match wins
+POLL_INTERVALS = [
+    (3, 0.25),
+    (12, 0.5),
+    (24, 1.0),
+    (72, 4.0),
+    (168, 12.0),
+]
+IDLE_POLL_INTERVAL_HOURS = 24.0
+MIN_POLL_INTERVAL_HOURS = 0.25
+
+# 3 markets x 1 region per request, one request each for us and us2
+DEFAULT_POLL_COST = 6
+DEFAULT_MONTHLY_QUOTA = 500
+
+# hours before kickoff in which polling may outpace the even monthly budget
+BURST_WINDOW_HOURS = 6
+
+
+def _to_utc(dt):
+    ts = pd.Timestamp(dt)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.tz_convert("UTC")
+
+
+def _hours_left_in_month(now):
+    next_month = (now.replace(day=1) + pd.Timedelta(days=32)).replace(day=1)
+    next_month = next_month.normalize()
+    return max((next_month - now).total_seconds() / 3600.0, 1.0)
+
+
+def _consensus_lines(odds_df):
+    """median price/point across books per (game_id, market, outcome)"""
+    if odds_df is None or odds_df.empty:
+        return {}
+    medians = odds_df.groupby(["game_id", "market", "outcome"])[
+        ["price", "point"]
+    ].median()
+    return {
+        "|".join(key): [float(price), float(point)]
+        for key, (price, point) in zip(medians.index, medians.to_numpy())
+    }
+
+
+def line_movement(previous_lines, current_lines):
+    """
+    Mean absolute movement of consensus lines between two snapshots.
+
+    Parameters
+    ----------
+    previous_lines : dict
+        "game_id|market|outcome" -> [price, point] from the previous poll.
+    current_lines : dict
+        Same mapping for the current poll.
+
+    Returns
+    -------
+    float
+        Mean of ``|delta point| + |delta price| / 100`` over the lines present
+        in both snapshots, 0.0 when nothing overlaps.
+    """
+    common = previous_lines.keys() & current_lines.keys()
+    if not common:
+        return 0.0
+    total = 0.0
+    for key in common:
+        prev_price, prev_point = previous_lines[key]
+        price, point = current_lines[key]
+        total += abs(point - prev_point) + abs(price - prev_price) / 100.0
+    return total / len(common)
+
+
+class OddsPollScheduler:
+    def __init__(
+        self,
+        s3c,
+        bucket,
+        state_key=STATE_KEY,
+        monthly_quota=DEFAULT_MONTHLY_QUOTA,
+        volatility_weight=1.0,
+        volatility_alpha=0.5,
+        kickoff_burst=4.0,
+    ):
+        """
+        Parameters
+        ----------
+        s3c : S3Client
+            Client used to persist the scheduler state.
+        bucket : str
+            Bucket holding the state document.
+        state_key : str, optional
+            Key of the state document.
+        monthly_quota : int, optional
+            Credits available per month, assumed after a month rollover until
+            the api reports the real figure.
+        volatility_weight : float, optional
+            How strongly recent line movement shortens the polling interval.
+        volatility_alpha : float, optional
+            Smoothing factor of the exponentially weighted volatility.
+        kickoff_burst : float, optional
+            Multiple of the even monthly pace allowed within
+            ``BURST_WINDOW_HOURS`` of kickoff.
+        """
+        self.s3c = s3c
+        self.bucket = bucket
+        self.state_key = state_key
+        self.monthly_quota = monthly_quota
+        self.volatility_weight = volatility_weight
+        self.volatility_alpha = volatility_alpha
+        self.kickoff_burst = kickoff_burst
+        self.state = self._load_state()
+
+    def _load_state(self):
+        state = self.s3c.read_json_from_s3(
+            bucket_name=self.bucket, s3_key=self.state_key
+        )
+        return state or {}
+
+    def save_state(self):
+        self.s3c.push_json_to_s3(
+            self.state, bucket_name=self.bucket, s3_key=self.state_key
+        )
+
+    def hours_until_kickoff(self, now):
+        """hours until the nearest known kickoff after ``now``, None if unknown"""
+        now = _to_utc(now)
+        game_times = pd.to_datetime(self.state.get("game_times", []), utc=True)
+        upcoming = game_times[game_times > now]
+        if upcoming.empty:
+            return None
+        return (upcoming.min() - now).total_seconds() / 3600.0
+
+    def requests_remaining(self, now):
+        now = _to_utc(now)
+        if self.state.get("quota_month") != now.strftime("%Y-%m"):
+            return self.monthly_quota
+        return self.state.get("requests_remaining", self.monthly_quota)
+
+    def poll_interval_hours(self, now):
+        """
+        Minimum number of hours between polls at ``now``.
+
+        The base interval comes from ``POLL_INTERVALS`` and shrinks with line
+        volatility. It is then stretched so that, at the current remaining
+        quota, polling never outpaces an even spend over the rest of the month
+        (``kickoff_burst`` times that pace close to kickoff). Because the pace
+        is recomputed from the remaining quota on every call, bursts are paid
+        back automatically and the quota is not exhausted before month end.
+
+        Returns
+        -------
+        float
+            Interval in hours, ``math.inf`` when the quota cannot cover a poll.
+        """
+        now = _to_utc(now)
+        hours_to_kickoff = self.hours_until_kickoff(now)
+        base = IDLE_POLL_INTERVAL_HOURS
+        if hours_to_kickoff is not None:
+            for max_hours, interval in POLL_INTERVALS:
+                if hours_to_kickoff <= max_hours:
+                    base = interval
+                    break
+        volatility = self.state.get("volatility", 0.0)
+        interval = base / (1.0 + self.volatility_weight * volatility)
+        interval = max(interval, MIN_POLL_INTERVAL_HOURS)
+
+        cost = self.state.get("poll_cost", DEFAULT_POLL_COST)
+        remaining = self.requests_remaining(now)
+        if remaining < cost:
+            return math.inf
+        paced = _hours_left_in_month(now) * cost / remaining
+        if hours_to_kickoff is not None and hours_to_kickoff <= BURST_WINDOW_HOURS:
+            paced /= self.kickoff_burst
+        return max(interval, paced)
+
+    def should_poll(self, now):
+        """
+        Decide whether the collector should poll the odds api at ``now``.
+
+        Returns
+        -------
+        tuple(bool, float)
+            Whether to poll and the interval (hours) the decision was based on.
+        """
+        interval = self.poll_interval_hours(now)
+        last_poll = self.state.get("last_poll")
+        if last_poll is None:
+            return not math.isinf(interval), interval
+        elapsed = (_to_utc(now) - _to_utc(last_poll)).total_seconds() / 3600.0
+        return elapsed >= interval, interval
+
+    def record_poll(self, now, odds_df, quota_usage):
+        """
+        Update and persist the state after a poll.
+
+        Parameters
+        ----------
+        now : datetime
+            Time of the poll.
+        odds_df : pd.DataFrame
+            Snapshot returned by ``get_odds.get_upcoming_nfl_odds``.
+        quota_usage : dict
+            Output of ``get_odds.get_quota_usage``; empty when the poll made
+            no odds request, which is recorded as a ``last_poll_cost`` of 0.
+            ``poll_cost``, the pacing estimate, only changes on polls that
+            spent credits.
+        """
+        now = _to_utc(now)
+        state = self.state
+        lines = _consensus_lines(odds_df)
+        last_poll = state.get("last_poll")
+        if last_poll is not None and state.get("lines"):
+            hours = (now - _to_utc(last_poll)).total_seconds() / 3600.0
+            rate = line_movement(state["lines"], lines) / max(
+                hours, MIN_POLL_INTERVAL_HOURS
+            )
+            state["volatility"] = self.volatility_alpha * rate + (
+                1 - self.volatility_alpha
+            ) * state.get("volatility", 0.0)
+        state["lines"] = lines
+
+        if odds_df is not None and not odds_df.empty:
+            game_times = pd.to_datetime(odds_df["game_time"].unique(), utc=True)
+            state["game_times"] = sorted(
+                t.isoformat() for t in game_times[game_times > now]
+            )
+
+        month = now.strftime("%Y-%m")
+        requests_used = quota_usage.get("requests_used")
+        # no odds request, no credits spent; unknown on the first paid poll
+        # of a month
+        cost = 0 if requests_used is None else None
+        if requests_used is not None:
+            if state.get("quota_month") == month and "requests_used" in state:
+                cost = max(requests_used - state["requests_used"], 0)
+                if cost > 0:
+                    state["poll_cost"] = cost
+            state["requests_used"] = requests_used
+        state["last_poll_cost"] = cost
+        if "requests_remaining" in quota_usage:
+            state["requests_remaining"] = quota_usage["requests_remaining"]
+        state["quota_month"] = month
+        state["last_poll"] = now.isoformat()
+        logger.info(
+            f"odds poll recorded: volatility={state.get('volatility', 0.0):.3f}, "
+            f"cost={cost}, requests_remaining={state.get('requests_remaining')}"
+        )
+        self.save_state()
@@ -0,0 +1,40 @@
+import os
+from datetime import datetime
+
+import dotenv
+from loguru import logger
+
+from data_collectors import data_collector
+from features import feature_store
+from s3_io import s3_client
+
+dotenv.load_dotenv()
+
+
+class SpreadFeaturesDataCollector(data_collector.DataCollector):
+    def __init__(self, s3c=None):
+        self.s3c = s3c or s3_client.S3Client()
+        self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
+        self.store = feature_store.SpreadFeatureStore(self.s3c, self.bucket)
+
+    def collect(self, datetime, months=None):
+        """
+        Rebuild the spread feature months whose raw odds or rankings
+        partitions changed since they were built.
+
+        Args:
+            datetime (datetime): time of the run (unused; staleness comes from
+                the raw partitions' ETags)
+            months (list of str, optional): "YYYY-MM" months to rebuild
+                regardless of the manifest
+        """
+        logger.info("refreshing spread features")
+        if months is not None:
+            months = [tuple(int(part) for part in m.split("-")) for m in months]
+        return self.store.refresh(months=months)
+
+
+if __name__ == "__main__":
+    sfdc = SpreadFeaturesDataCollector()
+    dt = datetime.now()
+    sfdc.collect(dt)
@@ -7,47 +7,99 @@ from loguru import logger
 
 from data_clients.team_rankings import team_rankings_scraper
 from data_collectors import data_collector
-from s3_io import s3_client
+from deadline import Deadline
+from memory_guard import MemoryGuard
+from reference import teams
+from s3_io import s3_client, upsert
 
 dotenv.load_dotenv()
 
+# left for merging and uploading the snapshot after the scrape
+UPLOAD_RESERVE_SECONDS = 60
+
+# report status of a snapshot with every table, and of one with tables left out
+COMPLETE = "complete"
+PARTIAL = "partial"
+
 
 class TeamRankingsDataCollector(data_collector.DataCollector):
-    def __init__(self):
-        self.s3c = s3_client.S3Client()
+    def __init__(self, s3c=None):
+        self.s3c = s3c or s3_client.S3Client()
         self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
         self.trs = team_rankings_scraper.TeamRankingsScraper()
 
-    def collect(self, datetime):
+    def collect(self, datetime, deadline=None):
+        """
+        Scrape every team rankings table for a date and upsert the snapshot.
+
+        Args:
+            datetime (datetime): snapshot date
+            deadline (Deadline, optional): invocation deadline; scraping stops
+                early enough to leave UPLOAD_RESERVE_SECONDS for the upload,
+                and the tables fetched so far are written as a partial
+                snapshot
+
+        Returns:
+            dict: ``status`` (COMPLETE, or PARTIAL when any table is left
+                unfinished), rows written, the unfinished tables and the
+                upsert mode ("new", "memory" or "chunked", see s3_io.upsert)
+        """
+        guard = MemoryGuard("team_rankings_data_collector")
         logger.info("getting stats")
-        df = self.trs.get_all_tables_for_date(datetime)
+        scrape_deadline = None
+        if deadline is not None:
+            scrape_deadline = Deadline(deadline.remaining() - UPLOAD_RESERVE_SECONDS)
+        df = self.trs.get_all_tables_for_date(datetime, deadline=scrape_deadline)
+        unfinished = self.trs.unfinished_tables
+        status = PARTIAL if unfinished else COMPLETE
+        if unfinished:
+            logger.warning(
+                f"writing a partial snapshot, {len(unfinished)} tables unfinished: "
+                f"{unfinished}"
+            )
+        if df.empty:
+            return {"status": status, "rows": 0, "unfinished_tables": unfinished}
+        rows = len(df)
 
         # Clean data: replace empty strings with NaN for proper Parquet conversion
         df = df.replace('', pd.NA)
 
         # Add collection timestamp to the data
         df['timestamp'] = datetime
+        df = teams.add_team_ids(df, teams.RANKINGS_ID_COLUMNS, source="team rankings")
 
         # Use year/month partitioning
         s3_key = f"data/raw/team_rankings/year={datetime.year}/month={datetime.month:02d}/data.parquet"
 
-        # Read existing monthly data if it exists, then upsert
-        try:
-            existing_df = self.s3c.read_dataframe_from_s3(
-                bucket_name=self.bucket, s3_key=s3_key
-            )
-            if existing_df is not None:
-                # Combine and remove duplicates (keep latest)
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                combined_df = combined_df.drop_duplicates(
-                    subset=[col for col in combined_df.columns if col != 'timestamp'],
-                    keep='last'
-                )
-                df = combined_df
-        except Exception as e:
-            logger.info(f"No existing file found or error reading: {e}. Creating new file.")
-
-        self.s3c.push_dataframe_to_s3(df=df, bucket_name=self.bucket, s3_key=s3_key)
+        guard.check("scraped")
+
+        # Upsert into the monthly data; only rows of the same date can be
+        # replaced, so a partition too large for memory is merged date by date
+        result = upsert.upsert_partition(
+            self.s3c,
+            self.bucket,
+            s3_key,
+            df,
+            merge=self._merge,
+            slice_column="date",
+            guard=guard,
+        )
+        return {
+            "status": status,
+            "rows": rows,
+            "unfinished_tables": unfinished,
+            "upsert": result["mode"],
+        }
+
+    @staticmethod
+    def _merge(existing_df, df):
+        # Combine and remove duplicates (keep latest)
+        existing_df = teams.backfill_team_ids(existing_df, teams.RANKINGS_ID_COLUMNS)
+        combined_df = pd.concat([existing_df, df], ignore_index=True)
+        return combined_df.drop_duplicates(
+            subset=[col for col in combined_df.columns if col != 'timestamp'],
+            keep='last'
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,254 @@
+import os
+import time
+from datetime import datetime
+
+import dotenv
+import pandas as pd
+from loguru import logger
+
+from data_clients.weather import weather_cache, weather_client, weather_store
+from data_collectors import data_collector
+from features.weather_features import ARCHIVE_LAG_DAYS
+from reference import stadiums
+from s3_io import s3_client
+
+dotenv.load_dotenv()
+
+# (venue -> stored date ranges) of the weather dataset
+COVERAGE_KEY = "state/weather_coverage.json"
+
+# first date backfilled when no start is given
+BACKFILL_START_DATE = "2018-08-01"
+
+# longest date range fetched (and held in memory) per request
+MAX_SPAN_DAYS = 366
+
+# missing ranges closer than this are fetched as one, re-fetching the days in between
+MERGE_GAP_DAYS = 7
+
+# stop issuing requests after this long, well inside the 15 minute lambda timeout;
+# the remaining gaps are picked up by the next invocation
+TIME_BUDGET_SECONDS = 600
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+def _to_day(value):
+    """naive UTC midnight of a date, datetime or 'YYYY-MM-DD' string"""
+    value = pd.Timestamp(value)
+    if value.tz is not None:
+        value = value.tz_convert("UTC").tz_localize(None)
+    return value.normalize()
+
+
+def merge_spans(spans, gap_days=0):
+    """
+    Merge overlapping or adjacent date spans.
+
+    Args:
+        spans (list of tuple): (first day, last day) pairs, both inclusive
+        gap_days (int): also merge spans separated by at most this many days
+
+    Returns:
+        list of tuple: sorted, non-overlapping spans
+    """
+    merged = []
+    for first, last in sorted(spans):
+        if merged and first <= merged[-1][1] + ONE_DAY * (gap_days + 1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def missing_spans(covered, start, end):
+    """
+    Parts of ``[start, end]`` not covered by any of the ``covered`` spans.
+
+    Args:
+        covered (list of tuple): stored (first day, last day) spans
+        start (pd.Timestamp): first day needed
+        end (pd.Timestamp): last day needed
+
+    Returns:
+        list of tuple: missing (first day, last day) spans
+    """
+    missing = []
+    cursor = start
+    for first, last in merge_spans(covered):
+        if last < cursor:
+            continue
+        if first > end:
+            break
+        if first > cursor:
+            missing.append((cursor, first - ONE_DAY))
+        cursor = last + ONE_DAY
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def plan_requests(
+    coverage,
+    venues,
+    start,
+    end,
+    merge_gap_days=MERGE_GAP_DAYS,
+    max_span_days=MAX_SPAN_DAYS,
+):
+    """
+    Group the missing (venue, date) spans into as few requests as possible.
+
+    Every venue's missing spans are merged across short gaps; venues missing
+    the same span share one multi-location request, and spans longer than
+    ``max_span_days`` are split. Newest spans come first, so the daily
+    increment is never starved by an unfinished backfill.
+
+    Args:
+        coverage (dict): venue id -> stored (first day, last day) spans
+        venues (list of str): venue ids needed
+        start (pd.Timestamp): first day needed
+        end (pd.Timestamp): last day needed
+        merge_gap_days (int): see ``merge_spans``
+        max_span_days (int): longest span per request
+
+    Returns:
+        list of tuple: (first day, last day, venue ids) per request
+    """
+    by_span = {}
+    for venue in venues:
+        gaps = missing_spans(coverage.get(venue, []), start, end)
+        for span in merge_spans(gaps, gap_days=merge_gap_days):
+            by_span.setdefault(span, []).append(venue)
+
+    requests = []
+    for (first, last), span_venues in by_span.items():
+        chunk_end = last
+        while chunk_end >= first:
+            chunk_start = max(first, chunk_end - ONE_DAY * (max_span_days - 1))
+            requests.append((chunk_start, chunk_end, span_venues))
+            chunk_end = chunk_start - ONE_DAY
+    return sorted(requests, key=lambda request: request[1], reverse=True)
+
+
+def _load_coverage(state):
+    venues = (state or {}).get("venues", {})
+    return {
+        venue: [(pd.Timestamp(first), pd.Timestamp(last)) for first, last in spans]
+        for venue, spans in venues.items()
+    }
+
+
+def _dump_coverage(coverage):
+    return {
+        "venues": {
+            venue: [
+                [first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")]
+                for first, last in spans
+            ]
+            for venue, spans in coverage.items()
+        }
+    }
+
+
+class WeatherDataCollector(data_collector.DataCollector):
+    def __init__(self, s3c=None):
+        self.s3c = s3c or s3_client.S3Client()
+        self.bucket = os.environ.get("AWS_BUCKET_NAME", "")
+        # the response cache is restored from and persisted to the bucket, so
+        # archive responses survive cold starts
+        self.wc = weather_client.WeatherClient(
+            cache_policy=weather_cache.WeatherCachePolicy(
+                s3c=self.s3c, bucket=self.bucket
+            )
+        )
+        self.store = weather_store.WeatherStore(self.s3c, self.bucket)
+
+    def collect(
+        self,
+        datetime,
+        start=None,
+        time_budget_seconds=TIME_BUDGET_SECONDS,
+        max_span_days=MAX_SPAN_DAYS,
+        deadline=None,
+    ):
+        """
+        Fetch the archive weather of every outdoor venue that is not stored
+        yet, from ``start`` up to the newest day the archive covers.
+
+        The stored ranges are tracked per venue in ``COVERAGE_KEY``, so an
+        interrupted backfill resumes where it stopped and the daily run only
+        requests the new day(s).
+
+        Args:
+            datetime (datetime): collection time
+            start (str, optional): first date to backfill from, defaults to
+                BACKFILL_START_DATE
+            time_budget_seconds (float): stop issuing requests after this long
+            max_span_days (int): longest date range per request
+            deadline (Deadline, optional): invocation deadline; no request
+                starts unless the slowest one so far still fits before it
+
+        Returns:
+            dict: requests made, rows written, requests left for later runs
+                and the response cache's hit/miss counts
+        """
+        if deadline is not None:
+            time_budget_seconds = min(time_budget_seconds, deadline.remaining())
+        stop_at = time.monotonic() + time_budget_seconds
+        start = _to_day(start or BACKFILL_START_DATE)
+        end = _to_day(datetime) - pd.Timedelta(days=ARCHIVE_LAG_DAYS)
+        venues = stadiums.venue_catalog(include_domes=False)
+
+        coverage = _load_coverage(
+            self.s3c.read_json_from_s3(bucket_name=self.bucket, s3_key=COVERAGE_KEY)
+        )
+        plan = plan_requests(
+            coverage, venues["venue"], start, end, max_span_days=max_span_days
+        )
+        logger.info(f"{len(plan)} weather requests needed between {start} and {end}")
+
+        done = rows = 0
+        slowest = 0.0
+        try:
+            for first, last, span_venues in plan:
+                if time.monotonic() + slowest >= stop_at:
+                    logger.info(f"time budget used, {len(plan) - done} requests left")
+                    break
+                started = time.monotonic()
+                hourly = self.wc.get_historical_weather_batch(
+                    start_date=first.strftime("%Y-%m-%d"),
+                    end_date=last.strftime("%Y-%m-%d"),
+                    venues=venues[venues["venue"].isin(span_venues)],
+                )
+                self.store.write(hourly)
+                for venue in span_venues:
+                    coverage[venue] = merge_spans(
+                        coverage.get(venue, []) + [(first, last)]
+                    )
+                # checkpoint after every request so a timeout loses at most one
+                self.s3c.push_json_to_s3(
+                    _dump_coverage(coverage),
+                    bucket_name=self.bucket,
+                    s3_key=COVERAGE_KEY,
+                )
+                done += 1
+                rows += len(hourly)
+                slowest = max(slowest, time.monotonic() - started)
+        finally:
+            # logs the hit/miss counts and keeps the responses fetched so far,
+            # even when a request failed
+            cache = self.wc.cache_policy.persist()
+
+        return {
+            "requests": done,
+            "rows": rows,
+            "remaining": len(plan) - done,
+            "cache": cache,
+        }
+
+
+if __name__ == "__main__":
+    wdc = WeatherDataCollector()
+    dt = datetime.now()
+    wdc.collect(dt)
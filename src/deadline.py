@@ -0,0 +1,50 @@
+"""
+Invocation deadlines from the Lambda context.
+
+Collectors that loop over many requests take a ``Deadline`` and stop starting
+new work once the slowest unit so far would not finish in time.
+"""
+
+import time
+
+# Lambda timeout of the collector function, used when there is no context
+DEFAULT_BUDGET_SECONDS = 900
+
+
+class Deadline:
+    def __init__(self, seconds):
+        """
+        Point in time (monotonic clock) by which an invocation must be done.
+
+        Args:
+            seconds (float): time left from now
+        """
+        self.expires = time.monotonic() + seconds
+
+    @classmethod
+    def from_context(cls, context, reserve_seconds=0):
+        """
+        Deadline of a Lambda invocation.
+
+        Args:
+            context (LambdaContext or None): Lambda context; without one
+                (local runs) the budget is DEFAULT_BUDGET_SECONDS
+            reserve_seconds (float): kept free at the end, e.g. to write
+                results and return
+
+        Returns:
+            Deadline
+        """
+        if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+            budget = context.get_remaining_time_in_millis() / 1000
+        else:
+            budget = DEFAULT_BUDGET_SECONDS
+        return cls(budget - reserve_seconds)
+
+    def remaining(self):
+        """seconds left, negative once expired"""
+        return self.expires - time.monotonic()
+
+    def fits(self, seconds):
+        """whether work projected to take ``seconds`` finishes in time"""
+        return self.remaining() >= seconds
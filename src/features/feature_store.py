@@ -0,0 +1,350 @@
+"""
+Materialized spread model features.
+
+``SpreadFeatureStore`` keeps one row per game (keys, snapshot times and
+``config.SPREAD_MODEL_TRAINING_COLUMNS``) under
+``data/features/spread/year=YYYY/month=MM/data.parquet``, partitioned by
+kickoff month (US/Central). A manifest in ``MANIFEST_KEY`` records, for every
+feature month, the ETag of each raw partition it was built from.
+
+A feature month depends on the odds partitions that can hold its games (the
+month and the one before) and on the rankings partitions its weighted team
+features read: the month itself plus ``DECAY_WINDOW_DAYS`` of history so the
+first game of the month sees a full ``config.GAME_SAMPLE`` window, plus the
+as-of lookback. A refresh lists the current ETags of both raw datasets (one
+listing call per dataset) and rebuilds only the months whose dependencies
+changed, so a new rankings month also rebuilds the later months whose decay
+windows reach back into it, and nothing else.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+import config
+from features import point_in_time, travel_features
+from features.matchup_matrix import TRAVEL_COLUMN, MatchupMatrixBuilder
+from features.team_features import TeamFeatureEngine
+from reference import teams
+from s3_io import partitions
+
+DATASET = "spread"
+FEATURES_PREFIX = "data/features"
+MANIFEST_KEY = "state/features/spread.json"
+
+SOURCE_DATASETS = ("odds", "team_rankings")
+ODDS_COLUMNS = ["game_id", "game_time", "home_team", "away_team"]
+
+# feature months are kickoff months in this timezone
+KICKOFF_TIMEZONE = "US/Central"
+
+# rankings history read before a month; assumes snapshots at least weekly
+DECAY_WINDOW_DAYS = config.GAME_SAMPLE * 7
+
+# games are listed by the odds feed within four weeks of kickoff
+ODDS_LOOKBACK_DAYS = 28
+
+# raw partitions kept in memory between consecutive months of a refresh
+CACHE_PARTITIONS = 8
+
+# configured stats a month may lack (left NaN) before its build fails, e.g. a
+# table the scraper did not finish
+MAX_MISSING_STATS = 3
+
+
+def _month_label(year, month):
+    return f"{year}-{month:02d}"
+
+
+def _month_bounds(year, month):
+    start = pd.Timestamp(year=year, month=month, day=1, tz=KICKOFF_TIMEZONE)
+    return start, start + pd.offsets.MonthBegin(1) - pd.Timedelta(microseconds=1)
+
+
+def source_months(year, month, lookback_days=point_in_time.LOOKBACK_DAYS):
+    """
+    Raw partitions a feature month is built from.
+
+    Parameters
+    ----------
+    year : int
+    month : int
+    lookback_days : int, optional
+        Oldest rankings snapshot the as-of join accepts.
+
+    Returns
+    -------
+    dict
+        Dataset name -> list of (year, month).
+    """
+    start, end = _month_bounds(year, month)
+    rankings_start = start - pd.Timedelta(days=DECAY_WINDOW_DAYS + lookback_days)
+    return {
+        "odds": partitions.months_between(
+            start - pd.Timedelta(days=ODDS_LOOKBACK_DAYS), end
+        ),
+        "team_rankings": partitions.months_between(rankings_start, end),
+    }
+
+
+def feature_months(odds_months):
+    """
+    Kickoff months that can have games: every odds month and the month after
+    it (lines are posted before kickoff).
+    """
+    months = set()
+    for year, month in odds_months:
+        months.add((year, month))
+        months.add((year + month // 12, month % 12 + 1))
+    return sorted(months)
+
+
+class SpreadFeatureStore:
+    def __init__(
+        self,
+        s3c,
+        bucket,
+        engine=None,
+        builder=None,
+        joiner=None,
+    ):
+        """
+        Parameters
+        ----------
+        s3c : S3Client
+        bucket : str
+        engine : TeamFeatureEngine, optional
+        builder : MatchupMatrixBuilder, optional
+        joiner : RankingsAsOfJoin, optional
+        """
+        self.s3c = s3c
+        self.bucket = bucket
+        self.engine = engine or TeamFeatureEngine()
+        self.builder = builder or MatchupMatrixBuilder()
+        self.joiner = joiner or point_in_time.RankingsAsOfJoin(s3c, bucket)
+        self.lookback_days = int(self.joiner.lookback.days)
+        self._cache = OrderedDict()
+
+    def source_etags(self):
+        """Current ETag of every raw partition, keyed by S3 key"""
+        etags = {}
+        for dataset in SOURCE_DATASETS:
+            prefix = f"{partitions.RAW_PREFIX}/{dataset}/"
+            etags.update(self.s3c.list_etags(bucket_name=self.bucket, prefix=prefix))
+        return etags
+
+    def dependencies(self, year, month, etags):
+        """
+        Existing raw partitions of a feature month and their ETags.
+
+        Parameters
+        ----------
+        year : int
+        month : int
+        etags : dict
+            Output of ``source_etags``.
+
+        Returns
+        -------
+        dict
+            S3 key -> ETag.
+        """
+        sources = {}
+        for dataset, months in source_months(year, month, self.lookback_days).items():
+            for y, m in months:
+                key = partitions.partition_key(dataset, y, m)
+                if key in etags:
+                    sources[key] = etags[key]
+        return sources
+
+    def stale_months(self, etags, manifest):
+        """
+        Feature months whose raw dependencies changed since they were built.
+
+        Returns
+        -------
+        list of tuple(int, int)
+            Oldest first.
+        """
+        odds_prefix = f"{partitions.RAW_PREFIX}/odds/"
+        odds_months = [
+            partitions.parse_partition_key(key)
+            for key in etags
+            if key.startswith(odds_prefix)
+        ]
+        built = manifest.get("months", {})
+        stale = []
+        for year, month in feature_months(m for m in odds_months if m is not None):
+            entry = built.get(_month_label(year, month), {})
+            if entry.get("sources") != self.dependencies(year, month, etags):
+                stale.append((year, month))
+        return stale
+
+    def refresh(self, months=None):
+        """
+        Rebuild the stale feature months (or ``months``) and record what they
+        were built from. The manifest is written after every month, so an
+        interrupted refresh resumes where it stopped.
+
+        Parameters
+        ----------
+        months : list of tuple(int, int), optional
+            Months to rebuild regardless of the manifest.
+
+        Returns
+        -------
+        list of tuple(int, int)
+            Months rebuilt.
+        """
+        manifest = self._load_manifest()
+        etags = self.source_etags()
+        if months is None:
+            months = self.stale_months(etags, manifest)
+        logger.info(f"rebuilding {len(months)} {DATASET} feature months")
+        for year, month in sorted(months):
+            features = self.build_month(year, month)
+            if len(features):
+                self.s3c.push_dataframe_to_s3(
+                    df=features,
+                    bucket_name=self.bucket,
+                    s3_key=partitions.partition_key(
+                        DATASET, year, month, prefix=FEATURES_PREFIX
+                    ),
+                )
+            manifest.setdefault("months", {})[_month_label(year, month)] = {
+                "sources": self.dependencies(year, month, etags),
+                "rows": len(features),
+                "built_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self.s3c.push_json_to_s3(
+                manifest, bucket_name=self.bucket, s3_key=MANIFEST_KEY
+            )
+        self._cache.clear()
+        return sorted(months)
+
+    def build_month(self, year, month):
+        """
+        Feature rows of the games kicking off in a month.
+
+        Returns
+        -------
+        pd.DataFrame
+            ``game_id``, ``game_time``, ``home_team``, ``away_team``,
+            ``home_snapshot_time``, ``road_snapshot_time`` and the builder's
+            columns; empty when the month has no games.
+        """
+        sources = source_months(year, month, self.lookback_days)
+        odds = self._read("odds", sources["odds"], columns=ODDS_COLUMNS)
+        if odds.empty:
+            return pd.DataFrame(columns=ODDS_COLUMNS)
+        games = point_in_time.games_from_odds(odds)
+        start, end = _month_bounds(year, month)
+        games = games[(games["game_time"] >= start) & (games["game_time"] <= end)]
+        games = games.reset_index(drop=True)
+        if games.empty:
+            return pd.DataFrame(columns=ODDS_COLUMNS)
+        games[TRAVEL_COLUMN] = travel_features.schedule_features(games)[TRAVEL_COLUMN]
+
+        rankings = self._read("team_rankings", sources["team_rankings"])
+        snapshots = self._team_features(rankings)
+        # odds and rankings teams are matched on registry ids
+        games = teams.add_team_ids(games, teams.ODDS_ID_COLUMNS, source="odds")
+        snapshots, rows = self.joiner.join(
+            games,
+            snapshots=snapshots,
+            home_col="home_team_id",
+            road_col="away_team_id",
+        )
+        matrix = self.builder.build_frame(
+            games,
+            snapshots,
+            home_rows=rows["home_row"].to_numpy(),
+            road_rows=rows["road_row"].to_numpy(),
+        )
+        logger.info(f"built {len(games)} {DATASET} feature rows for {year}-{month:02d}")
+        return pd.concat(
+            [games[ODDS_COLUMNS], rows[["home_snapshot_time", "road_snapshot_time"]]]
+            + [matrix],
+            axis=1,
+        )
+
+    def _team_features(self, rankings):
+        """
+        Weighted team features of the builder's stat columns.
+
+        Raises
+        ------
+        ValueError
+            If the rankings lack more than ``MAX_MISSING_STATS`` of them.
+        """
+        stats = list(self.builder.stat_columns.values())
+        if rankings.empty:
+            return pd.DataFrame(columns=["team", "date"] + stats)
+        rankings = teams.backfill_team_ids(
+            rankings, teams.RANKINGS_ID_COLUMNS, source="team rankings"
+        )
+        rankings = rankings.assign(team=rankings["team_id"])
+        present = [stat for stat in stats if stat in rankings.columns]
+        missing = [stat for stat in stats if stat not in rankings.columns]
+        if len(missing) > MAX_MISSING_STATS:
+            raise ValueError(
+                f"rankings lack {len(missing)} of {len(stats)} stats: {missing}"
+            )
+        if missing:
+            logger.warning(
+                f"rankings lack {len(missing)} of {len(stats)} stats, "
+                f"leaving them NaN: {missing}"
+            )
+        features = self.engine.transform(rankings, stat_columns=present)
+        return features.assign(**dict.fromkeys(missing, np.float32(np.nan)))
+
+    def _read(self, dataset, months, columns=None):
+        frames = []
+        for year, month in months:
+            key = partitions.partition_key(dataset, year, month)
+            if key not in self._cache:
+                self._cache[key] = self.s3c.read_dataframe_from_s3(
+                    bucket_name=self.bucket, s3_key=key, columns=columns
+                )
+                if len(self._cache) > CACHE_PARTITIONS:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            if self._cache[key] is not None:
+                frames.append(self._cache[key])
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def _load_manifest(self):
+        manifest = self.s3c.read_json_from_s3(
+            bucket_name=self.bucket, s3_key=MANIFEST_KEY
+        )
+        return manifest or {"months": {}}
+
+    def read(self, start, end, columns=None):
+        """
+        Read the materialized features of games kicking off in ``[start, end]``.
+        """
+        df = partitions.read_partitions(
+            self.s3c,
+            self.bucket,
+            DATASET,
+            start,
+            end,
+            columns=columns,
+            prefix=FEATURES_PREFIX,
+        )
+        if df.empty or "game_time" not in df.columns:
+            return df
+        kickoffs = pd.to_datetime(df["game_time"], utc=True)
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        if start.tz is None:
+            start = start.tz_localize(KICKOFF_TIMEZONE)
+        if end.tz is None:
+            end = end.tz_localize(KICKOFF_TIMEZONE)
+        return df[(kickoffs >= start) & (kickoffs <= end)].reset_index(drop=True)
@@ -0,0 +1,173 @@
+"""
+Spread model feature matrix from team snapshots.
+
+``config.SPREAD_MODEL_TRAINING_COLUMNS`` is compiled once into integer column
+plans: ``home_<stat>`` and ``road_<stat>`` gather a snapshot stat of the home
+or road team, ``<stat>_matchup_differential`` is home minus road, and
+``travel_delta`` comes from the games frame. Stats are read from the snapshot
+column the team rankings scraper writes them to (``stat_columns``). Building the matrix is then two
+row gathers by integer team row, one column gather per side and a single
+array subtraction for every differential, written into one C-contiguous
+float32 array.
+"""
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+import config
+
+HOME_PREFIX = "home_"
+ROAD_PREFIX = "road_"
+DIFFERENTIAL_SUFFIX = "_matchup_differential"
+TRAVEL_COLUMN = "travel_delta"
+
+# the scraper renames a stat table's current season column to ``this_yr``;
+# the ``rankings_*`` rating tables have no season columns, so their stats
+# are the scraped columns themselves, e.g. ``rankings_home_rating``
+RATINGS_PREFIX = "rankings_"
+SEASON_SUFFIX = "_this_yr"
+
+
+def scraped_column(stat):
+    """
+    Team rankings snapshot column holding ``stat``.
+
+    Examples
+    --------
+    >>> scraped_column("defense_passing_ypa")
+    'defense_passing_ypa_this_yr'
+    >>> scraped_column("rankings_home_rating")
+    'rankings_home_rating'
+    """
+    return stat if stat.startswith(RATINGS_PREFIX) else stat + SEASON_SUFFIX
+
+
+class MatchupMatrixBuilder:
+    def __init__(self, columns=config.SPREAD_MODEL_TRAINING_COLUMNS, stat_columns=None):
+        """
+        Parameters
+        ----------
+        columns : list of str, optional
+            Output columns, ``config.SPREAD_MODEL_TRAINING_COLUMNS`` by default.
+        stat_columns : dict, optional
+            Snapshot column of a stat, ``scraped_column(stat)`` for the others.
+
+        Raises
+        ------
+        ValueError
+            If a column is not a home/road stat, a differential or
+            ``travel_delta``.
+        """
+        self.columns = list(columns)
+        stats = {}
+        plans = {"home": [], "road": [], "differential": []}
+        self.travel_positions = []
+        for position, column in enumerate(self.columns):
+            if column == TRAVEL_COLUMN:
+                self.travel_positions.append(position)
+                continue
+            if column.endswith(DIFFERENTIAL_SUFFIX):
+                kind, stat = "differential", column[: -len(DIFFERENTIAL_SUFFIX)]
+            elif column.startswith(HOME_PREFIX):
+                kind, stat = "home", column[len(HOME_PREFIX) :]
+            elif column.startswith(ROAD_PREFIX):
+                kind, stat = "road", column[len(ROAD_PREFIX) :]
+            else:
+                raise ValueError(f"cannot derive training column {column!r}")
+            plans[kind].append((position, stats.setdefault(stat, len(stats))))
+
+        # every stat needed by any column, in first-use order
+        self.stats = list(stats)
+        stat_columns = stat_columns or {}
+        self.stat_columns = {
+            stat: stat_columns.get(stat, scraped_column(stat)) for stat in self.stats
+        }
+        self.plans = {
+            kind: np.array(plan, dtype=np.intp).reshape(-1, 2)
+            for kind, plan in plans.items()
+        }
+
+    def team_rows(self, snapshots, teams, team_col="team"):
+        """
+        Row of every team in ``snapshots`` (one row per team), -1 if missing.
+        """
+        return pd.Index(snapshots[team_col]).get_indexer(teams)
+
+    def build(
+        self,
+        games,
+        snapshots,
+        home_rows=None,
+        road_rows=None,
+        home_col="home_team",
+        road_col="away_team",
+        team_col="team",
+    ):
+        """
+        Feature matrix of every game.
+
+        Parameters
+        ----------
+        games : pd.DataFrame
+            One row per game; ``travel_delta`` is read from it when present.
+        snapshots : pd.DataFrame
+            Team stats in ``stat_columns``. Without ``home_rows``/``road_rows`` it holds one row
+            per team, matched on ``team_col``.
+        home_rows, road_rows : np.ndarray, optional
+            Integer row of each game's home and road team in ``snapshots``
+            (e.g. from an as-of join), -1 for none.
+        home_col, road_col, team_col : str, optional
+
+        Returns
+        -------
+        np.ndarray
+            C-contiguous float32 (games x columns); NaN where a team has no
+            snapshot.
+
+        Raises
+        ------
+        ValueError
+            If ``snapshots`` lacks stats the columns need.
+        """
+        columns = list(self.stat_columns.values())
+        missing = [column for column in columns if column not in snapshots.columns]
+        if missing:
+            raise ValueError(f"snapshots are missing stats: {missing}")
+        if home_rows is None:
+            home_rows = self.team_rows(snapshots, games[home_col], team_col)
+        if road_rows is None:
+            road_rows = self.team_rows(snapshots, games[road_col], team_col)
+
+        # a trailing NaN row stands in for teams without a snapshot
+        stats = np.full((len(snapshots) + 1, len(self.stats)), np.nan, np.float32)
+        stats[:-1] = snapshots[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+        home = stats[np.asarray(home_rows)]
+        road = stats[np.asarray(road_rows)]
+
+        matrix = np.empty((len(games), len(self.columns)), dtype=np.float32)
+        for kind, side in [("home", home), ("road", road)]:
+            positions, indices = self.plans[kind].T
+            matrix[:, positions] = side[:, indices]
+        positions, indices = self.plans["differential"].T
+        matrix[:, positions] = home[:, indices] - road[:, indices]
+
+        if self.travel_positions:
+            if TRAVEL_COLUMN in games.columns:
+                travel = games[TRAVEL_COLUMN].to_numpy(
+                    dtype=np.float32, na_value=np.nan
+                )
+            else:
+                logger.warning(f"games have no {TRAVEL_COLUMN} column, leaving it NaN")
+                travel = np.nan
+            matrix[:, self.travel_positions] = np.asarray(travel)[..., None]
+        return matrix
+
+    def build_frame(self, games, snapshots, **kwargs):
+        """``build`` as a DataFrame indexed like ``games``, sharing the matrix"""
+        return pd.DataFrame(
+            self.build(games, snapshots, **kwargs),
+            index=games.index,
+            columns=self.columns,
+            copy=False,
+        )
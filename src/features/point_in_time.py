@@ -0,0 +1,218 @@
+"""
+Point-in-time join of team rankings snapshots to games.
+
+Every game side (home, road) is matched to the team's latest rankings
+snapshot taken strictly before kickoff, so training rows never see stats
+scraped after the game started. Snapshots are sorted once by
+(team, snapshot time) under a composite int64 key and every side of every
+game is located with a single ``np.searchsorted``; only the monthly rankings
+partitions between the earliest kickoff (minus ``LOOKBACK_DAYS``) and the
+latest kickoff are read.
+"""
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from odds_analytics.line_history import MISSING_SECONDS, to_epoch_seconds
+from s3_io import partitions
+
+DATASET = "team_rankings"
+
+# snapshots older than this at kickoff are treated as missing
+LOOKBACK_DAYS = 14
+
+# rankings ``date`` values are US/Central calendar days
+SNAPSHOT_TIMEZONE = "US/Central"
+
+
+def snapshot_times(snapshots, time_col="timestamp"):
+    """
+    Epoch seconds at which every snapshot was available: ``time_col`` when
+    set, else midnight (US/Central) of its ``date``.
+    """
+    dates = pd.to_datetime(snapshots["date"]).dt.tz_localize(SNAPSHOT_TIMEZONE)
+    if time_col in snapshots.columns:
+        times = pd.to_datetime(snapshots[time_col], utc=True)
+        dates = times.fillna(dates.dt.tz_convert("UTC"))
+    return to_epoch_seconds(dates)
+
+
+def asof_rows(snapshot_teams, snapshot_seconds, teams, seconds, max_age_seconds=None):
+    """
+    Row of the latest snapshot of each team strictly before each time.
+
+    Parameters
+    ----------
+    snapshot_teams : array-like
+        Team of every snapshot row.
+    snapshot_seconds : np.ndarray
+        Epoch seconds of every snapshot row.
+    teams : array-like
+        Team of every query.
+    seconds : np.ndarray
+        Epoch seconds of every query (e.g. kickoffs).
+    max_age_seconds : int, optional
+        Ignore snapshots older than this at the query time.
+
+    Returns
+    -------
+    np.ndarray
+        Snapshot row per query, -1 where there is none.
+    """
+    codes, uniques = pd.factorize(np.asarray(snapshot_teams), use_na_sentinel=True)
+    valid = (codes >= 0) & (snapshot_seconds != MISSING_SECONDS)
+    rows = np.flatnonzero(valid)
+    codes = codes[valid]
+    times = snapshot_seconds[valid]
+    order = np.lexsort((times, codes))
+    rows, codes, times = rows[order], codes[order], times[order]
+
+    seconds = np.asarray(seconds, dtype=np.int64)
+    query_codes = pd.Index(uniques).get_indexer(np.asarray(teams))
+    query_codes[seconds == MISSING_SECONDS] = -1
+    result = np.full(len(query_codes), -1, dtype=np.int64)
+    queried = seconds[query_codes >= 0]
+    if not len(rows) or not len(queried):
+        return result
+
+    t0 = min(int(times.min()), int(queried.min()))
+    span = max(int(times.max()), int(queried.max())) - t0 + 2
+    sort_keys = codes.astype(np.int64) * span + (times - t0)
+    safe_codes = np.maximum(query_codes, 0).astype(np.int64)
+    # side="left" finds the first snapshot at or after the query; the one
+    # before it is the latest strictly earlier snapshot
+    offsets = np.clip(seconds - t0, 0, span - 1)
+    found = np.searchsorted(sort_keys, safe_codes * span + offsets, "left") - 1
+    safe_found = np.maximum(found, 0)
+    ok = (query_codes >= 0) & (found >= 0) & (codes[safe_found] == query_codes)
+    if max_age_seconds is not None:
+        ok &= seconds - times[safe_found] <= max_age_seconds
+    result[ok] = rows[safe_found[ok]]
+    return result
+
+
+class RankingsAsOfJoin:
+    def __init__(self, s3c, bucket, lookback_days=LOOKBACK_DAYS, time_col="timestamp"):
+        """
+        Parameters
+        ----------
+        s3c : S3Client
+        bucket : str
+        lookback_days : int, optional
+            Oldest snapshot accepted for a game, and how far before the first
+            kickoff partitions are read.
+        time_col : str, optional
+            Snapshot availability time column; rows without one fall back to
+            their ``date``.
+        """
+        self.s3c = s3c
+        self.bucket = bucket
+        self.lookback = pd.Timedelta(days=lookback_days)
+        self.time_col = time_col
+
+    def load(self, kickoffs, columns=None):
+        """
+        Read the rankings partitions that can hold snapshots for ``kickoffs``.
+
+        Parameters
+        ----------
+        kickoffs : pd.Series
+            Kickoff times of the games.
+        columns : list of str, optional
+            Stat columns to load (``team``, ``date`` and the time column are
+            always loaded), all by default.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        kickoffs = pd.to_datetime(kickoffs, utc=True).dt.tz_convert(SNAPSHOT_TIMEZONE)
+        if columns is not None:
+            columns = list(dict.fromkeys(["team", "date", self.time_col] + columns))
+        return partitions.read_partitions(
+            self.s3c,
+            self.bucket,
+            DATASET,
+            kickoffs.min() - self.lookback,
+            kickoffs.max(),
+            columns=columns,
+        )
+
+    def join(
+        self,
+        games,
+        snapshots=None,
+        home_col="home_team",
+        road_col="away_team",
+        kickoff_col="game_time",
+        team_map=None,
+        columns=None,
+    ):
+        """
+        Latest snapshot strictly before kickoff for both teams of every game.
+
+        Parameters
+        ----------
+        games : pd.DataFrame
+            One row per game with team and kickoff columns.
+        snapshots : pd.DataFrame, optional
+            Rankings rows; read with ``load`` when None.
+        home_col, road_col, kickoff_col : str, optional
+        team_map : dict or callable, optional
+            Maps game team names to rankings team names.
+        columns : list of str, optional
+            Stat columns to load when reading snapshots.
+
+        Returns
+        -------
+        tuple(pd.DataFrame, pd.DataFrame)
+            The snapshots, and a frame indexed like ``games`` with
+            ``home_row``/``road_row`` (positional rows of the snapshots, -1
+            when none) and ``home_snapshot_time``/``road_snapshot_time``.
+        """
+        if snapshots is None:
+            snapshots = self.load(games[kickoff_col], columns=columns)
+        snapshots = snapshots.reset_index(drop=True)
+        if len(snapshots):
+            seconds = snapshot_times(snapshots, self.time_col)
+        else:
+            seconds = np.empty(0, dtype=np.int64)
+        kickoffs = to_epoch_seconds(games[kickoff_col])
+        max_age = int(self.lookback.total_seconds())
+
+        result = pd.DataFrame(index=games.index)
+        for side, col in [("home", home_col), ("road", road_col)]:
+            teams = games[col]
+            if team_map is not None:
+                teams = teams.map(team_map)
+            rows = asof_rows(
+                snapshots.get("team", pd.Series(dtype=object)),
+                seconds,
+                teams,
+                kickoffs,
+                max_age_seconds=max_age,
+            )
+            found = np.flatnonzero(rows >= 0)
+            snapshot_time = pd.Series(
+                pd.NaT, index=games.index, dtype="datetime64[ns, UTC]"
+            )
+            snapshot_time.iloc[found] = pd.to_datetime(
+                seconds[rows[found]], unit="s", utc=True
+            )
+            result[f"{side}_row"] = rows
+            result[f"{side}_snapshot_time"] = snapshot_time
+        matched = (result[["home_row", "road_row"]] >= 0).all(axis=1).sum()
+        logger.info(f"matched rankings snapshots for {matched} of {len(games)} games")
+        return snapshots, result
+
+
+def games_from_odds(odds_df):
+    """
+    One row per game (``game_id``, ``game_time``, ``home_team``,
+    ``away_team``) from odds dataset rows.
+    """
+    columns = ["game_id", "game_time", "home_team", "away_team"]
+    games = odds_df[columns].drop_duplicates("game_id", keep="last")
+    games = games.assign(game_time=pd.to_datetime(games["game_time"], utc=True))
+    return games.sort_values("game_time", ignore_index=True)
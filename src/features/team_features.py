@@ -0,0 +1,166 @@
+"""
+Exponentially weighted team features from team rankings snapshots.
+
+Every numeric stat of a team is summarized over the team's last
+``config.GAME_SAMPLE`` snapshots with weights ``config.DECAY_FACTOR ** lag``
+(lag 0 is the snapshot itself). Snapshots are scattered into a
+(team x entry x stat) float32 panel, and the weighted means of every team,
+entry and stat come out of ``GAME_SAMPLE`` shifted array additions, instead of
+a rolling window per team or per column. Missing values are skipped and the
+remaining weights renormalized.
+"""
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+import config
+from s3_io import partitions
+
+DATASET = "team_rankings"
+KEY_COLUMNS = ["team", "date"]
+
+# stats processed per panel; bounds memory for the ~1500 column rankings
+CHUNK_COLUMNS = 256
+
+AGGREGATIONS = ("exp_weighted_mean", "mean")
+
+
+def lag_weights(game_sample=config.GAME_SAMPLE, decay_factor=config.DECAY_FACTOR):
+    """weight of lags 0 .. game_sample - 1, most recent first"""
+    return decay_factor ** np.arange(game_sample, dtype=np.float64)
+
+
+def weighted_panel_mean(panel, weights):
+    """
+    Weighted mean over the trailing entries of a (team x entry x stat) panel.
+
+    Parameters
+    ----------
+    panel : np.ndarray
+        float32 (teams, entries, stats), entries in time order, NaN where a
+        value (or the whole entry) is missing.
+    weights : np.ndarray
+        Weight of lags 0, 1, ...; its length is the window.
+
+    Returns
+    -------
+    np.ndarray
+        float32 array shaped like ``panel``: for every entry, the weighted mean
+        of that entry and the ``len(weights) - 1`` before it, NaN where all of
+        them are missing.
+    """
+    total = np.zeros(panel.shape, dtype=np.float32)
+    weight_sum = np.zeros(panel.shape, dtype=np.float32)
+    present = ~np.isnan(panel)
+    values = np.where(present, panel, np.float32(0))
+    n_entries = panel.shape[1]
+    for lag, weight in enumerate(weights[:n_entries]):
+        weight = np.float32(weight)
+        total[:, lag:] += weight * values[:, : n_entries - lag]
+        weight_sum[:, lag:] += weight * present[:, : n_entries - lag]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return total / weight_sum
+
+
+class TeamFeatureEngine:
+    def __init__(
+        self,
+        game_sample=config.GAME_SAMPLE,
+        decay_factor=config.DECAY_FACTOR,
+        method=config.AGGREGATION_METHOD,
+        chunk_columns=CHUNK_COLUMNS,
+    ):
+        """
+        Parameters
+        ----------
+        game_sample : int, optional
+            Snapshots per window, ``config.GAME_SAMPLE`` by default.
+        decay_factor : float, optional
+            Weight decay per lag, ``config.DECAY_FACTOR`` by default.
+        method : str, optional
+            "exp_weighted_mean" or "mean" (equal weights),
+            ``config.AGGREGATION_METHOD`` by default.
+        chunk_columns : int, optional
+            Stats per panel.
+
+        Raises
+        ------
+        ValueError
+            If ``method`` is not one of ``AGGREGATIONS``.
+        """
+        if method not in AGGREGATIONS:
+            raise ValueError(f"unknown aggregation method {method!r}")
+        decay = decay_factor if method == "exp_weighted_mean" else 1.0
+        self.weights = lag_weights(game_sample, decay)
+        self.chunk_columns = chunk_columns
+
+    def load(self, s3c, bucket, start, end):
+        """
+        Read the team rankings snapshots of ``[start, end]``.
+
+        To get full windows at ``start``, start at least ``game_sample``
+        snapshots earlier.
+        """
+        snapshots = partitions.read_partitions(s3c, bucket, DATASET, start, end)
+        if snapshots.empty:
+            return snapshots
+        dates = pd.to_datetime(snapshots["date"])
+        keep = (dates >= pd.Timestamp(start).tz_localize(None).normalize()) & (
+            dates <= pd.Timestamp(end).tz_localize(None)
+        )
+        return snapshots[keep]
+
+    def transform(self, snapshots, stat_columns=None):
+        """
+        Weighted means of every stat for every (team, snapshot date).
+
+        Parameters
+        ----------
+        snapshots : pd.DataFrame
+            Team rankings rows with ``team``, ``date`` and stat columns; the
+            last row of a (team, date) wins.
+        stat_columns : list of str, optional
+            Stats to aggregate, every numeric column by default.
+
+        Returns
+        -------
+        pd.DataFrame
+            ``team``, ``date`` (datetime), the snapshot's ``timestamp`` when
+            the rows have one, and one float32 column per stat, sorted by team
+            then date.
+        """
+        df = snapshots.drop_duplicates(KEY_COLUMNS, keep="last")
+        if stat_columns is None:
+            stat_columns = (
+                df.drop(columns=KEY_COLUMNS).select_dtypes("number").columns.tolist()
+            )
+        dates = pd.to_datetime(df["date"])
+        team_codes, teams = pd.factorize(df["team"], sort=True)
+        order = np.lexsort((dates.to_numpy(), team_codes))
+        team_codes = team_codes[order]
+
+        # position of every row within its team's history
+        counts = np.bincount(team_codes, minlength=len(teams))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        entries = np.arange(len(order)) - starts[team_codes]
+        shape = (len(teams), int(counts.max()) if len(counts) else 0)
+
+        result = np.empty((len(order), len(stat_columns)), dtype=np.float32)
+        for lo in range(0, len(stat_columns), self.chunk_columns):
+            columns = stat_columns[lo : lo + self.chunk_columns]
+            values = df[columns].to_numpy(dtype=np.float32, na_value=np.nan)[order]
+            panel = np.full(shape + (len(columns),), np.nan, dtype=np.float32)
+            panel[team_codes, entries] = values
+            means = weighted_panel_mean(panel, self.weights)
+            result[:, lo : lo + len(columns)] = means[team_codes, entries]
+        logger.info(
+            f"aggregated {len(stat_columns)} stats over {len(order)} team snapshots"
+        )
+
+        features = pd.DataFrame(result, columns=stat_columns, copy=False)
+        if "timestamp" in df.columns:
+            features.insert(0, "timestamp", df["timestamp"].to_numpy()[order])
+        features.insert(0, "date", dates.to_numpy()[order])
+        features.insert(0, "team", teams[team_codes])
+        return features
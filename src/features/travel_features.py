@@ -0,0 +1,213 @@
+"""
+Travel and rest features from the stadium catalog.
+
+``TravelMatrix`` precomputes, once per process, the great-circle distance
+between every pair of venues in ``reference.stadiums`` and the timezone of
+every venue. A schedule is then turned into per-team travel distance, rest
+days and timezone shift with integer gathers: team name -> ``team_id`` (from
+the ``reference.teams`` registry) -> home venue code, game
+-> venue code, and one lookup into the (venue x venue) distance matrix per
+side. UTC offsets are taken per timezone at kickoff (one vectorized
+conversion per zone), so Arizona and overseas games are right on both sides
+of daylight saving changes.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from reference import stadiums, teams
+
+EARTH_RADIUS_MILES = 3958.8
+
+# rest is counted in US/Eastern calendar days between kickoffs
+REST_TIMEZONE = "US/Eastern"
+
+# longer gaps are season starts, not rest
+MAX_REST_DAYS = 21
+
+SIDES = ("home", "road")
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles; inputs in degrees, broadcast"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+class TravelMatrix:
+    def __init__(self, catalog=None):
+        """
+        Parameters
+        ----------
+        catalog : pd.DataFrame, optional
+            Stadium catalog (``stadiums.COLUMNS``), the built-in one by
+            default.
+        """
+        if catalog is None:
+            catalog = stadiums.stadium_catalog()
+        venues = catalog.drop_duplicates("venue", ignore_index=True)
+        self.venues = pd.Index(venues["venue"])
+
+        # a trailing NaN row and column stand in for unknown venues
+        n = len(venues)
+        self.distance = np.full((n + 1, n + 1), np.nan, dtype=np.float32)
+        lat = venues["latitude"].to_numpy(dtype=np.float64)
+        lon = venues["longitude"].to_numpy(dtype=np.float64)
+        self.distance[:n, :n] = haversine_miles(
+            lat[:, None], lon[:, None], lat[None, :], lon[None, :]
+        )
+
+        zone_codes, zones = pd.factorize(venues["timezone"])
+        self.zones = list(zones)
+        self.venue_zone = zone_codes.astype(np.intp)
+
+        home = catalog[catalog["team_id"].notna()]
+        home_ids = home["team_id"].to_numpy(dtype=np.intp)
+        # home venue code by team_id, -1 (the NaN row) for teams without one
+        size = max(len(teams.team_table()), home_ids.max(initial=0)) + 1
+        self.team_venue = np.full(size, -1, dtype=np.intp)
+        self.team_venue[home_ids] = self.venues.get_indexer(home["venue"])
+
+    @staticmethod
+    def team_codes(names):
+        """``team_id`` of every name, abbreviation or alias, -1 if unknown"""
+        return teams.team_ids(names, source="schedule").astype(np.intp)
+
+    def venue_codes(self, venues):
+        """Venue row of every venue id, -1 if unknown"""
+        return self.venues.get_indexer(np.asarray(venues, dtype=object))
+
+    def zone_offsets(self, kickoffs):
+        """
+        UTC offset in hours of every timezone at every kickoff.
+
+        Returns
+        -------
+        np.ndarray
+            float32 (kickoffs, zones).
+        """
+        kickoffs = pd.DatetimeIndex(pd.to_datetime(kickoffs, utc=True))
+        naive = kickoffs.tz_localize(None)
+        offsets = np.empty((len(kickoffs), len(self.zones)), dtype=np.float32)
+        for z, zone in enumerate(self.zones):
+            local = kickoffs.tz_convert(zone).tz_localize(None)
+            offsets[:, z] = (local - naive).total_seconds() / 3600
+        return offsets
+
+    def schedule_features(
+        self,
+        schedule,
+        home_col="home_team",
+        road_col="away_team",
+        kickoff_col="game_time",
+        venue_col="venue",
+    ):
+        """
+        Travel, rest and timezone features of both teams of every game.
+
+        Parameters
+        ----------
+        schedule : pd.DataFrame
+            One row per game, e.g. a whole season. Teams are any name,
+            abbreviation or alias in ``reference.teams``; games without a
+            ``venue_col`` value are played at the home team's stadium.
+        home_col, road_col, kickoff_col, venue_col : str, optional
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed like ``schedule``: ``home_``/``road_`` ``travel_miles``
+            (home stadium to venue), ``rest_days`` (since the team's previous
+            game in ``schedule``, NaN for season starts) and ``tz_shift``
+            (venue minus home UTC offset, hours), plus ``travel_delta`` (home
+            minus road travel miles). NaN wherever a team or venue is unknown.
+        """
+        n = len(schedule)
+        home_teams = self.team_codes(schedule[home_col])
+        road_teams = self.team_codes(schedule[road_col])
+        home_venues = np.where(home_teams >= 0, self.team_venue[home_teams], -1)
+        road_venues = np.where(road_teams >= 0, self.team_venue[road_teams], -1)
+        game_venues = home_venues
+        if venue_col in schedule.columns:
+            listed = schedule[venue_col].notna().to_numpy()
+            game_venues = np.where(
+                listed, self.venue_codes(schedule[venue_col]), home_venues
+            )
+
+        kickoffs = pd.to_datetime(schedule[kickoff_col], utc=True)
+        offsets = np.column_stack(
+            [self.zone_offsets(kickoffs), np.full(n, np.nan, dtype=np.float32)]
+        )
+        # the NaN column stands in for unknown venues
+        venue_zone = np.append(self.venue_zone, len(self.zones))
+        rows = np.arange(n)
+        game_offset = offsets[rows, venue_zone[game_venues]]
+
+        local_days = (
+            kickoffs.dt.tz_convert(REST_TIMEZONE)
+            .dt.tz_localize(None)
+            .to_numpy()
+            .astype("datetime64[D]")
+            .astype(np.int64)
+        )
+        rest = self.rest_days(
+            np.concatenate([home_teams, road_teams]), np.tile(local_days, 2)
+        )
+
+        result = pd.DataFrame(index=schedule.index)
+        for i, (side, team_venues) in enumerate(zip(SIDES, [home_venues, road_venues])):
+            result[f"{side}_travel_miles"] = self.distance[team_venues, game_venues]
+            result[f"{side}_rest_days"] = rest[i * n : (i + 1) * n]
+            result[f"{side}_tz_shift"] = (
+                game_offset - offsets[rows, venue_zone[team_venues]]
+            )
+        result["travel_delta"] = (
+            result["home_travel_miles"] - result["road_travel_miles"]
+        )
+        return result
+
+    @staticmethod
+    def rest_days(teams, days):
+        """
+        Days since each team's previous game.
+
+        Parameters
+        ----------
+        teams : np.ndarray
+            Team code of every appearance, -1 if unknown.
+        days : np.ndarray
+            int64 calendar day of every appearance.
+
+        Returns
+        -------
+        np.ndarray
+            float32, NaN for a team's first game, gaps over ``MAX_REST_DAYS``
+            and unknown teams.
+        """
+        order = np.lexsort((days, teams))
+        sorted_teams, sorted_days = teams[order], days[order]
+        gaps = np.full(len(order), np.nan, dtype=np.float32)
+        if len(order) > 1:
+            same = (sorted_teams[1:] == sorted_teams[:-1]) & (sorted_teams[1:] >= 0)
+            gap = (sorted_days[1:] - sorted_days[:-1]).astype(np.float32)
+            gaps[1:] = np.where(same & (gap <= MAX_REST_DAYS), gap, np.nan)
+        rest = np.empty_like(gaps)
+        rest[order] = gaps
+        return rest
+
+
+@lru_cache(maxsize=1)
+def travel_matrix():
+    """``TravelMatrix`` of the built-in stadium catalog, built once"""
+    return TravelMatrix()
+
+
+def schedule_features(schedule, **kwargs):
+    """``TravelMatrix.schedule_features`` on the built-in catalog"""
+    return travel_matrix().schedule_features(schedule, **kwargs)
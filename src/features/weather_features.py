@@ -0,0 +1,277 @@
+"""
+Kickoff-aligned game weather features.
+
+Hourly weather (the long frames returned by ``WeatherClient``'s batch
+methods) is sorted once by (venue, hour); every game's window
+``[kickoff hour, kickoff hour + window_hours)`` is then located with a single
+``np.searchsorted`` and summarized with NumPy reductions over a
+(games x window_hours) gather, instead of filtering a DataFrame per game.
+
+Archive weather does not change, so ``VenueDayCache`` keeps the hourly rows
+per (venue, UTC date) and ``WeatherFeatureBuilder`` only requests the days a
+season re-run has not seen yet.
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from reference import stadiums
+
+DEFAULT_WINDOW_HOURS = 4
+
+# the archive api lags real time by a few days; newer hours come from forecasts
+ARCHIVE_LAG_DAYS = 5
+
+# output column -> (hourly parameter, reduction)
+FEATURES = {
+    "temperature_mean": ("temperature_2m", "mean"),
+    "apparent_temperature_mean": ("apparent_temperature", "mean"),
+    "relative_humidity_mean": ("relative_humidity_2m", "mean"),
+    "cloud_cover_mean": ("cloud_cover", "mean"),
+    "wind_speed_mean": ("wind_speed_10m", "mean"),
+    "wind_gusts_max": ("wind_gusts_10m", "max"),
+    "precipitation_total": ("precipitation", "sum"),
+    "rain_total": ("rain", "sum"),
+    "snowfall_total": ("snowfall", "sum"),
+}
+
+
+def _nansum(window, axis):
+    """``np.nansum``, but NaN where every value is NaN (pandas' ``min_count=1``)"""
+    total = np.nansum(window, axis=axis)
+    total[np.isnan(window).all(axis=axis)] = np.nan
+    return total
+
+
+_REDUCTIONS = {"mean": np.nanmean, "max": np.nanmax, "sum": _nansum}
+
+
+def _epoch_hours(values):
+    index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    return index.as_unit("s").asi8 // 3600
+
+
+def game_window_features(
+    games,
+    hourly,
+    window_hours=DEFAULT_WINDOW_HOURS,
+    kickoff_col="kickoff",
+    venue_col="venue",
+    features=FEATURES,
+):
+    """
+    Summarize hourly weather over every game's window.
+
+    Parameters
+    ----------
+    games : pd.DataFrame
+        One row per game with a kickoff datetime and a venue id.
+    hourly : pd.DataFrame
+        Long hourly frame with ``venue``, ``time`` and parameter columns.
+    window_hours : int, optional
+        Hours summarized from the kickoff hour on, 4 by default.
+    kickoff_col : str, optional
+    venue_col : str, optional
+    features : dict, optional
+        Output column -> (hourly parameter, "mean" | "max" | "sum"). Features
+        whose parameter is not in ``hourly`` are skipped, and a reduction
+        over hours that are all NaN is NaN.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed like ``games``: ``weather_hours`` (hours found in the window)
+        and one float32 column per feature, NaN when no hours were found
+        (e.g. dome venues, which are never fetched).
+    """
+    hourly = hourly.dropna(subset=["venue", "time"]).drop_duplicates(
+        ["venue", "time"], keep="last"
+    )
+    venue_codes, venue_names = pd.factorize(hourly["venue"])
+    hours = _epoch_hours(hourly["time"])
+    order = np.lexsort((hours, venue_codes))
+    n_rows = len(order)
+
+    h0 = int(hours.min()) if n_rows else 0
+    span = int(hours.max()) - h0 + 2 if n_rows else 2
+    sort_keys = venue_codes[order].astype(np.int64) * span + (hours[order] - h0)
+
+    game_venues = pd.Index(venue_names).get_indexer(games[venue_col])
+    found = game_venues >= 0
+    safe_venues = np.where(found, game_venues, 0).astype(np.int64)
+    start = _epoch_hours(games[kickoff_col]) - h0
+
+    def bound(offsets):
+        keys = safe_venues * span + np.clip(offsets, 0, span - 1)
+        return np.searchsorted(sort_keys, keys, side="left")
+
+    lo = np.where(found, bound(start), 0)
+    hi = np.where(found, bound(start + window_hours), 0)
+
+    rows = lo[:, None] + np.arange(window_hours)
+    valid = rows < hi[:, None]
+    rows = order[np.minimum(rows, max(n_rows - 1, 0))] if n_rows else rows
+    n_hours = valid.sum(axis=1)
+
+    result = pd.DataFrame({"weather_hours": n_hours.astype(np.int8)}, index=games.index)
+    for name, (param, how) in features.items():
+        if param not in hourly.columns:
+            continue
+        values = hourly[param].to_numpy(dtype=np.float64, na_value=np.nan)
+        window = values[rows] if n_rows else np.full(rows.shape, np.nan)
+        window[~valid] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            reduced = _REDUCTIONS[how](window, axis=1)
+        reduced[n_hours == 0] = np.nan
+        result[name] = reduced.astype(np.float32)
+    return result
+
+
+class VenueDayCache:
+    def __init__(self, path=None):
+        """
+        Hourly weather cached per (venue, UTC date).
+
+        Parameters
+        ----------
+        path : str, optional
+            Parquet file the cache is loaded from and saved to; in-memory only
+            when None.
+        """
+        self.path = path
+        self.hourly = pd.DataFrame(columns=["venue", "time"])
+        if path and os.path.exists(path):
+            self.hourly = pd.read_parquet(path)
+            logger.info(f"loaded {len(self.hourly)} cached weather hours from {path}")
+
+    def _venue_days(self, hourly):
+        days = pd.to_datetime(hourly["time"], utc=True).dt.strftime("%Y-%m-%d")
+        return pd.MultiIndex.from_arrays([hourly["venue"], days])
+
+    def missing(self, venue_days):
+        """
+        Parameters
+        ----------
+        venue_days : pd.DataFrame
+            ``venue`` and ``date`` ("YYYY-MM-DD") pairs needed.
+
+        Returns
+        -------
+        pd.DataFrame
+            The pairs not in the cache.
+        """
+        needed = pd.MultiIndex.from_frame(venue_days[["venue", "date"]])
+        cached = self._venue_days(self.hourly).unique()
+        missing = needed.unique().difference(cached)
+        return missing.to_frame(index=False, name=["venue", "date"])
+
+    def add(self, hourly):
+        if hourly.empty:
+            return
+        frames = [df for df in [self.hourly, hourly] if not df.empty]
+        combined = pd.concat(frames, ignore_index=True)
+        self.hourly = combined.drop_duplicates(["venue", "time"], keep="last")
+
+    def get(self, venues):
+        return self.hourly[self.hourly["venue"].isin(venues)]
+
+    def save(self):
+        if self.path:
+            self.hourly.to_parquet(self.path, index=False)
+
+
+class WeatherFeatureBuilder:
+    def __init__(self, weather_client, cache=None, window_hours=DEFAULT_WINDOW_HOURS):
+        """
+        Parameters
+        ----------
+        weather_client : WeatherClient
+            Client used for the batch archive and forecast requests.
+        cache : VenueDayCache, optional
+            Archive cache, a fresh in-memory one by default.
+        window_hours : int, optional
+            Hours summarized from kickoff.
+        """
+        self.weather_client = weather_client
+        self.cache = cache if cache is not None else VenueDayCache()
+        self.window_hours = window_hours
+
+    def _needed_venue_days(self, games, kickoff_col, venue_col):
+        kickoff = pd.to_datetime(games[kickoff_col], utc=True).dt.floor("h")
+        end = kickoff + pd.Timedelta(hours=self.window_hours - 1)
+        needed = pd.concat(
+            [
+                pd.DataFrame({"venue": games[venue_col], "date": kickoff}),
+                pd.DataFrame({"venue": games[venue_col], "date": end}),
+            ]
+        )
+        needed["date"] = needed["date"].dt.strftime("%Y-%m-%d")
+        return needed.drop_duplicates(ignore_index=True)
+
+    def build(self, games, now=None, kickoff_col="kickoff", venue_col="venue"):
+        """
+        Game-window weather features for every game.
+
+        Missing archive days are fetched with one batch request covering the
+        missing venues and date span and are added to the cache. Days too
+        recent for the archive are read from one forecast request and are not
+        cached.
+
+        Parameters
+        ----------
+        games : pd.DataFrame
+            One row per game with a kickoff datetime and a venue id.
+        now : datetime, optional
+            Current time, defaults to now (UTC).
+
+        Returns
+        -------
+        pd.DataFrame
+            Output of ``game_window_features``, indexed like ``games``.
+        """
+        now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+        archive_end = (now - pd.Timedelta(days=ARCHIVE_LAG_DAYS)).strftime("%Y-%m-%d")
+        venues = stadiums.venue_catalog(include_domes=False)
+        venues = venues[venues["venue"].isin(games[venue_col])]
+        needed = self._needed_venue_days(games, kickoff_col, venue_col)
+        needed = needed[needed["venue"].isin(venues["venue"])]
+
+        recent = needed["date"] > archive_end
+        missing = self.cache.missing(needed[~recent])
+        if not missing.empty:
+            logger.info(f"fetching {len(missing)} uncached venue days of weather")
+            hourly = self.weather_client.get_historical_weather_batch(
+                start_date=missing["date"].min(),
+                end_date=missing["date"].max(),
+                venues=venues[venues["venue"].isin(missing["venue"])],
+            )
+            self.cache.add(hourly)
+            self.cache.save()
+
+        frames = [self.cache.get(venues["venue"])]
+        if recent.any():
+            frames.append(
+                self.weather_client.get_weather_forecast_batch(
+                    venues=venues[venues["venue"].isin(needed.loc[recent, "venue"])],
+                    forecast_days=16,
+                    past_days=ARCHIVE_LAG_DAYS + 1,
+                )
+            )
+        frames = [df for df in frames if not df.empty]
+        hourly = (
+            pd.concat(frames, ignore_index=True)
+            if frames
+            else pd.DataFrame(columns=["venue", "time"])
+        )
+        return game_window_features(
+            games,
+            hourly,
+            window_hours=self.window_hours,
+            kickoff_col=kickoff_col,
+            venue_col=venue_col,
+        )
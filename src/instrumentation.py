@@ -0,0 +1,258 @@
+"""
+Per-stage timing and throughput of a handler invocation.
+
+Pipeline stages (HTTP fetch, parse, postprocess, merge, type conversion, S3
+read and write) are wrapped in ``stage`` or decorated with ``timed``. Every
+run records its duration and, where known, the rows, columns and bytes it
+handled, under the collector running in the current context. Worker
+threads start with an empty context, so pools inside a collector submit
+``propagate``-wrapped functions to keep their stages attributed. The handler
+calls ``reset`` at the start of an invocation and ``emit`` at the end, which
+prints one CloudWatch embedded metric format (EMF) record: per-stage totals
+as metrics, and the per-collector breakdown as a ``stages`` property for Logs
+Insights.
+
+    with instrumentation.stage("http_fetch") as s:
+        html = response.read()
+        s.record(nbytes=len(html))
+"""
+
+import contextvars
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+NAMESPACE = "NFLDataEngineering"
+
+STAGES = (
+    "http_fetch",
+    "parse",
+    "postprocess",
+    "merge",
+    "type_conversion",
+    "s3_read",
+    "s3_write",
+)
+
+# stage runs outside any collector, e.g. in the handler itself
+UNATTRIBUTED = "handler"
+
+_collector = contextvars.ContextVar("collector", default=UNATTRIBUTED)
+_lock = threading.Lock()
+_totals = {}
+
+
+class Stage:
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self.columns = None
+        self.bytes = None
+
+    def record(self, df=None, nbytes=None):
+        """
+        Size of the data a stage handled.
+
+        Parameters
+        ----------
+        df : pd.DataFrame, optional
+            Rows and columns are taken from its shape.
+        nbytes : int, optional
+        """
+        shape = getattr(df, "shape", None)
+        if shape is not None and len(shape) == 2:
+            self.rows, self.columns = shape
+        if nbytes is not None:
+            self.bytes = nbytes
+
+
+def current_collector():
+    """collector whose stages the current context records"""
+    return _collector.get()
+
+
+@contextmanager
+def collector(name):
+    """attribute stages run in this context to collector ``name``"""
+    token = _collector.set(name)
+    try:
+        yield
+    finally:
+        _collector.reset(token)
+
+
+def propagate(func):
+    """
+    ``func`` wrapped to run in a copy of the caller's context, for worker
+    threads whose stages belong to the calling collector.
+
+        executor.map(instrumentation.propagate(fetch), urls)
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # a context can only be entered by one thread at a time
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a pipeline stage.
+
+    Parameters
+    ----------
+    name : str
+        One of ``STAGES``.
+
+    Yields
+    ------
+    Stage
+        ``record`` the rows, columns or bytes handled. The run is recorded
+        even when the stage raises.
+    """
+    run = Stage(name)
+    started = time.perf_counter()
+    try:
+        yield run
+    finally:
+        _add(current_collector(), run, time.perf_counter() - started)
+
+
+def timed(name):
+    """
+    Decorator timing every call of a function as stage ``name``; a returned
+    DataFrame's shape is recorded.
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name) as run:
+                result = func(*args, **kwargs)
+                run.record(df=result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def _add(collector_name, run, seconds):
+    with _lock:
+        totals = _totals.setdefault(
+            (collector_name, run.name),
+            {"count": 0, "seconds": 0.0, "rows": 0, "columns": 0, "bytes": 0},
+        )
+        totals["count"] += 1
+        totals["seconds"] += seconds
+        totals["rows"] += run.rows or 0
+        totals["columns"] = max(totals["columns"], run.columns or 0)
+        totals["bytes"] += run.bytes or 0
+
+
+def reset():
+    """drop everything recorded, at the start of an invocation"""
+    with _lock:
+        _totals.clear()
+
+
+def summary():
+    """
+    Everything recorded since ``reset``.
+
+    Returns
+    -------
+    list of dict
+        One entry per (collector, stage): ``count``, total ``seconds``,
+        ``rows`` and ``bytes``, widest ``columns`` and ``rows_per_second``.
+    """
+    with _lock:
+        items = sorted(_totals.items())
+    entries = []
+    for (collector_name, name), totals in items:
+        seconds = totals["seconds"]
+        entries.append(
+            {
+                "collector": collector_name,
+                "stage": name,
+                **totals,
+                "seconds": round(seconds, 4),
+                "rows_per_second": (
+                    round(totals["rows"] / seconds, 1) if seconds else None
+                ),
+            }
+        )
+    return entries
+
+
+def emf_record(dimensions=None, timestamp=None):
+    """
+    One CloudWatch EMF record of the invocation.
+
+    Parameters
+    ----------
+    dimensions : dict, optional
+        Dimension name -> value, e.g. ``{"mode": "daily"}``.
+    timestamp : float, optional
+        Epoch seconds, now by default.
+
+    Returns
+    -------
+    dict
+        ``<stage>_seconds``, ``<stage>_rows`` and ``<stage>_bytes`` metrics
+        summed over collectors, plus the ``stages`` breakdown.
+    """
+    dimensions = dimensions or {}
+    entries = summary()
+    metrics = {}
+    for entry in entries:
+        for field, unit in (
+            ("seconds", "Seconds"),
+            ("rows", "Count"),
+            ("bytes", "Bytes"),
+        ):
+            metric = f"{entry['stage']}_{field}"
+            value, _ = metrics.get(metric, (0, unit))
+            metrics[metric] = (value + entry[field], unit)
+    record = {
+        "_aws": {
+            "Timestamp": int((timestamp or time.time()) * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": NAMESPACE,
+                    "Dimensions": [sorted(dimensions)],
+                    "Metrics": [
+                        {"Name": metric, "Unit": unit}
+                        for metric, (_, unit) in sorted(metrics.items())
+                    ],
+                }
+            ],
+        },
+        **dimensions,
+        **{metric: round(value, 4) for metric, (value, _) in metrics.items()},
+        "stages": entries,
+    }
+    return record
+
+
+def emit(dimensions=None):
+    """
+    Print the invocation's EMF record as one line; Lambda forwards stdout to
+    CloudWatch Logs, which extracts the metrics.
+
+    Returns
+    -------
+    dict
+        The record.
+    """
+    record = emf_record(dimensions)
+    sys.stdout.write(json.dumps(record, default=str) + "\n")
+    sys.stdout.flush()
+    return record
@@ -1,43 +1,163 @@
+import importlib
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-import pandas as pd
 import pytz
+from loguru import logger
 
-from data_collectors import odds_data_collector, team_rankings_data_collector
+import instrumentation
+from deadline import Deadline
 
+# collectors run at once; each mostly waits on HTTP or S3
+MAX_WORKERS = 4
 
-def run_odds_dc(datetime):
-    odc = odds_data_collector.OddsDataCollector()
-    odc.collect(datetime)
+# kept free at the end of an invocation to log and return the results
+RESERVE_SECONDS = 10
 
+# collector name -> "module:class"; a module is imported only when its
+# collector runs, so an odds-only invocation never loads the scraper, weather
+# or box score stacks
+collector_map = {
+    "odds_data_collector": "data_collectors.odds_data_collector:OddsDataCollector",
+    "team_rankings_data_collector": (
+        "data_collectors.team_rankings_data_collector:TeamRankingsDataCollector"
+    ),
+    "closing_lines_data_collector": (
+        "data_collectors.closing_lines_data_collector:ClosingLinesDataCollector"
+    ),
+    "weather_data_collector": (
+        "data_collectors.weather_data_collector:WeatherDataCollector"
+    ),
+    "box_score_data_collector": (
+        "data_collectors.box_score_data_collector:BoxScoreDataCollector"
+    ),
+    "spread_features_data_collector": (
+        "data_collectors.spread_features_data_collector:SpreadFeaturesDataCollector"
+    ),
+}
 
-def run_tr_dc(datetime):
-    trdc = team_rankings_data_collector.TeamRankingsDataCollector()
-    trdc.collect(datetime)
 
+def load_collector(collector):
+    """Import a collector's module and return its class"""
+    module_name, class_name = collector_map[collector].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
 
-collector_map = {
-    "odds_data_collector": run_odds_dc,
-    "team_rankings_data_collector": run_tr_dc,
-}
+
+def run_collector(collector, dt_central, s3c, options, deadline=None):
+    """
+    Run one collector, isolating its failure from the others.
+
+    Collectors whose ``collect`` takes a ``deadline`` get the invocation's.
+
+    Returns:
+        dict: ``collector``, ``status`` ("ok" or "error"), ``duration_seconds``,
+            the collector's report when it returns a dict and, on failure,
+            ``error``
+    """
+    started = time.monotonic()
+    result = {"collector": collector, "status": "ok"}
+    with instrumentation.collector(collector):
+        try:
+            instance = load_collector(collector)(s3c=s3c)
+            if deadline is not None and (
+                "deadline" in inspect.signature(instance.collect).parameters
+            ):
+                options = dict(options, deadline=deadline)
+            report = instance.collect(dt_central, **options)
+            if isinstance(report, dict):
+                result["report"] = report
+        except Exception as e:
+            logger.exception(f"{collector} failed")
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["duration_seconds"] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"{collector} finished with status {result['status']} "
+        f"in {result['duration_seconds']}s"
+    )
+    return result
 
 
 def handler(event, context):
-    collectors_to_run = event.get("collectors_to_run")
+    instrumentation.reset()
+    collectors_to_run = event.get("collectors_to_run") or []
+    # optional per-collector keyword arguments, e.g.
+    # {"odds_data_collector": {"adaptive": true}}
+    collector_options = event.get("collector_options", {})
+
+    collectors = list(dict.fromkeys(collectors_to_run))
+    unknown = [c for c in collectors if c not in collector_map]
+    if unknown:
+        logger.warning(f"ignoring unknown collectors: {unknown}")
+    collectors = [c for c in collectors if c in collector_map]
+
+    if event.get("start_date"):
+        # {"start_date": "2024-09-01", "end_date": "2025-01-31", "step": "weekly"}
+        import backfill
+        from s3_io import s3_client
+
+        result = backfill.run_backfill(
+            event,
+            context,
+            collectors,
+            run_collector,
+            s3_client.S3Client(),
+            os.environ.get("AWS_BUCKET_NAME", ""),
+            event.get("max_workers", MAX_WORKERS),
+        )
+        result["unknown"] = unknown
+        result["s3_client"] = s3_client.client_stats()
+        result["stages"] = instrumentation.emit({"mode": "backfill"})["stages"]
+        return result
+
     date = event.get("date", None)
     if date:
         # When date is explicitly provided, use it as-is in Central timezone
         # to preserve the actual date (don't shift to previous day)
-        dt = pd.to_datetime(date)
-        dt_central = dt.tz_localize(pytz.timezone("US/Central"))
+        dt = datetime.fromisoformat(date)
+        dt_central = pytz.timezone("US/Central").localize(dt)
     else:
         dt_utc = datetime.now(pytz.utc)
         dt_central = dt_utc.astimezone(pytz.timezone("US/Central"))
 
-    eligible_collectors = collector_map.keys()
-    for collector in collectors_to_run:
-        if collector in eligible_collectors:
-            collector_map.get(collector)(dt_central)
+    # boto3 and pandas load on the first invocation, not at import (cold start)
+    from s3_io import s3_client
+
+    results = []
+    if collectors:
+        # one client (and connection pool) shared by every collector thread
+        s3c = s3_client.S3Client()
+        deadline = Deadline.from_context(context, reserve_seconds=RESERVE_SECONDS)
+        max_workers = min(event.get("max_workers", MAX_WORKERS), len(collectors))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda c: run_collector(
+                        c, dt_central, s3c, collector_options.get(c, {}), deadline
+                    ),
+                    collectors,
+                )
+            )
+    results += [{"collector": c, "status": "unknown"} for c in unknown]
+
+    failed = [r["collector"] for r in results if r["status"] == "error"]
+    # "reused" grows across warm invocations of the same container
+    stats = s3_client.client_stats()
+    logger.info(
+        f"boto3 S3 clients created {stats['created']}, reused {stats['reused']}"
+    )
+    # one EMF record per invocation: where the time budget went, per stage
+    record = instrumentation.emit({"mode": "daily"})
+    return {
+        "date": dt_central.isoformat(),
+        "status": "error" if failed else "ok",
+        "failed": failed,
+        "results": results,
+        "s3_client": stats,
+        "stages": record["stages"],
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+"""
+Resident memory of the Lambda process against its memory limit.
+
+``MemoryGuard.check`` logs the resident set size and the headroom left at a
+pipeline stage, and ``fits`` tells whether work projected to need some more
+bytes stays under ``threshold`` of the limit, so large upserts can switch to
+chunked processing before the function runs out of memory.
+"""
+
+import os
+import resource
+import sys
+
+from loguru import logger
+
+# --memory-size of the function in deploy-lambda.yml, used outside Lambda
+DEFAULT_LIMIT_MB = 512
+
+# share of the limit in-memory processing may reach
+THRESHOLD = 0.7
+
+
+def rss_bytes():
+    """resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # the peak rather than the current size where /proc is missing
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def limit_bytes():
+    """memory limit of the function, from the Lambda environment"""
+    limit_mb = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE") or DEFAULT_LIMIT_MB
+    return int(limit_mb) * 2**20
+
+
+class MemoryGuard:
+    def __init__(self, name, limit=None, threshold=THRESHOLD):
+        """
+        Parameters
+        ----------
+        name : str
+            Prefix of the log lines, e.g. the collector.
+        limit : int, optional
+            Memory limit in bytes, ``limit_bytes()`` by default.
+        threshold : float, optional
+            Share of ``limit`` that ``fits`` allows.
+        """
+        self.name = name
+        self.limit = limit or limit_bytes()
+        self.threshold = threshold
+        self.peak = 0
+
+    def check(self, stage):
+        """
+        Log the resident set size and headroom after ``stage``.
+
+        Returns
+        -------
+        int
+            Resident set size in bytes.
+        """
+        rss = rss_bytes()
+        self.peak = max(self.peak, rss)
+        logger.info(
+            f"{self.name} {stage}: rss {rss / 2**20:.0f} MB, "
+            f"{(self.limit - rss) / 2**20:.0f} MB headroom of "
+            f"{self.limit / 2**20:.0f} MB"
+        )
+        return rss
+
+    def headroom(self):
+        """bytes left below the limit"""
+        return self.limit - rss_bytes()
+
+    def fits(self, nbytes):
+        """whether ``nbytes`` more stay under ``threshold`` of the limit"""
+        return rss_bytes() + nbytes <= self.threshold * self.limit
@@ -0,0 +1,283 @@
+"""
+Batch opening/closing/consensus line engine over the raw odds dataset.
+
+For every (game_id, market, outcome) the engine takes each book's first and
+last snapshot before kickoff, removes the vig per book from the American
+prices, and reduces across books to a median consensus. Everything runs as
+grouped NumPy operations over the whole frame, so multiple seasons are one
+pass. Results go to a derived dataset partitioned by kickoff month and are
+updated incrementally: only games with snapshots newer than the stored
+high-water mark are recomputed.
+"""
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from odds_analytics.line_history import KEY_COLUMNS, to_epoch_seconds
+from s3_io import partitions
+
+DATASET = "closing_lines"
+DERIVED_PREFIX = "data/derived"
+STATE_KEY = "state/closing_lines.json"
+
+# odds for a game are collected up to this long before its kickoff
+LOOKBACK_DAYS = 45
+
+GROUP_COLUMNS = ["game_id", "market", "outcome"]
+GAME_COLUMNS = ["game_time", "home_team", "away_team"]
+TIME_COLUMNS = ["game_time", "open_time", "close_time"]
+OPEN_COLUMNS = ["open_price", "open_point", "open_fair_prob", "open_time"]
+
+
+def american_to_implied(prices):
+    """
+    Raw implied probability (including vig) of American prices.
+
+    Parameters
+    ----------
+    prices : array-like
+        American odds, e.g. -110 or +150.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    magnitude = np.abs(prices)
+    return np.where(prices > 0, 100.0, magnitude) / (magnitude + 100.0)
+
+
+def grouped_median(codes, values, n_groups):
+    """
+    Median of ``values`` per group code, ignoring NaN.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Integer group code of every value, in ``[0, n_groups)``.
+    values : np.ndarray
+    n_groups : int
+
+    Returns
+    -------
+    np.ndarray
+        One median per group, NaN for groups without values.
+    """
+    valid = ~np.isnan(values)
+    codes = codes[valid]
+    values = values[valid]
+    order = np.lexsort((values, codes))
+    values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = np.full(n_groups, np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    medians[has] = (values[lo] + values[hi]) / 2.0
+    return medians
+
+
+def _fair_probabilities(book_codes, prices, n_books):
+    """vig-free probabilities: implied probability normalized per book market"""
+    implied = american_to_implied(prices)
+    totals = np.bincount(book_codes, weights=np.nan_to_num(implied), minlength=n_books)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return implied / totals[book_codes]
+
+
+def compute_lines(odds_df):
+    """
+    Opening, closing and consensus lines for every game/market/outcome.
+
+    Parameters
+    ----------
+    odds_df : pd.DataFrame
+        Rows of the odds dataset (``game_id``, ``game_time``, ``home_team``,
+        ``away_team``, ``book``, ``market``, ``outcome``, ``price``,
+        ``point``, ``timestamp``). Snapshots at or after kickoff are ignored.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (game_id, market, outcome) with ``n_books``,
+        ``open_price``, ``open_point``, ``open_fair_prob``, ``open_time``,
+        ``close_price``, ``close_point``, ``close_fair_prob``, ``close_time``
+        and the game columns. Prices, points and probabilities are float32
+        medians across books; the close of a game that has not started yet is
+        the current consensus.
+    """
+    df = odds_df.dropna(subset=KEY_COLUMNS + ["timestamp", "game_time"])
+    times = to_epoch_seconds(df["timestamp"])
+    kickoffs = to_epoch_seconds(df["game_time"])
+    pre_kickoff = times < kickoffs
+    df = df[pre_kickoff]
+    times = times[pre_kickoff]
+    if df.empty:
+        return pd.DataFrame()
+
+    series_codes, series = pd.MultiIndex.from_frame(
+        df[KEY_COLUMNS].astype(str)
+    ).factorize()
+    series = series.set_names(KEY_COLUMNS)
+    order = np.lexsort((times, series_codes))
+    sorted_codes = series_codes[order]
+    boundary = sorted_codes[1:] != sorted_codes[:-1]
+    open_rows = order[np.concatenate(([True], boundary))]
+    close_rows = order[np.concatenate((boundary, [True]))]
+
+    # group codes per series: consensus group and per-book market
+    group_codes, groups = series.droplevel("book").factorize()
+    groups = groups.set_names(GROUP_COLUMNS)
+    book_codes, book_markets = series.droplevel("outcome").factorize()
+    n_groups = len(groups)
+
+    prices = df["price"].to_numpy(dtype=np.float64, na_value=np.nan)
+    points = df["point"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    result = groups.to_frame(index=False)
+    result["n_books"] = np.bincount(group_codes, minlength=n_groups).astype(np.int16)
+    int64 = np.iinfo(np.int64)
+    for name, rows, reduce, initial in [
+        ("open", open_rows, np.minimum, int64.max),
+        ("close", close_rows, np.maximum, int64.min),
+    ]:
+        fair = _fair_probabilities(book_codes, prices[rows], len(book_markets))
+        result[f"{name}_price"] = grouped_median(group_codes, prices[rows], n_groups)
+        result[f"{name}_point"] = grouped_median(group_codes, points[rows], n_groups)
+        result[f"{name}_fair_prob"] = grouped_median(group_codes, fair, n_groups)
+        snapshot = np.full(n_groups, initial, dtype=np.int64)
+        reduce.at(snapshot, group_codes, times[rows])
+        result[f"{name}_time"] = pd.to_datetime(snapshot, unit="s", utc=True)
+
+    float_cols = result.select_dtypes("float64").columns
+    result[float_cols] = result[float_cols].astype(np.float32)
+
+    first_series_row = np.full(n_groups, -1)
+    first_series_row[group_codes[::-1]] = open_rows[::-1]
+    game_info = df[GAME_COLUMNS].iloc[first_series_row].reset_index(drop=True)
+    game_info["game_time"] = pd.to_datetime(game_info["game_time"], utc=True)
+    result = pd.concat([result, game_info], axis=1)
+    return result.sort_values(["game_time"] + GROUP_COLUMNS, ignore_index=True)
+
+
+def keep_earlier_opens(stored, lines):
+    """
+    ``lines`` with the stored opening line of every group that opened earlier.
+
+    An incremental update only reads ``lookback_days`` of raw history, so a
+    game whose lines were posted before that recomputes a later opener.
+
+    Parameters
+    ----------
+    stored : pd.DataFrame
+        Stored lines, ``open_time`` as tz-aware UTC.
+    lines : pd.DataFrame
+        Recomputed lines.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    previous = stored.set_index(GROUP_COLUMNS)[OPEN_COLUMNS].reindex(
+        pd.MultiIndex.from_frame(lines[GROUP_COLUMNS])
+    )
+    earlier = (previous["open_time"].to_numpy() < lines["open_time"].to_numpy()) & (
+        previous["open_time"].notna().to_numpy()
+    )
+    if not earlier.any():
+        return lines
+    lines = lines.copy()
+    for col in OPEN_COLUMNS:
+        lines.loc[earlier, col] = previous[col].to_numpy()[earlier]
+    return lines
+
+
+class ClosingLineEngine:
+    def __init__(self, s3c, bucket, lookback_days=LOOKBACK_DAYS):
+        """
+        Parameters
+        ----------
+        s3c : S3Client
+        bucket : str
+        lookback_days : int, optional
+            How long before a new snapshot the odds of the same game may have
+            been collected; bounds the raw partitions read per update.
+        """
+        self.s3c = s3c
+        self.bucket = bucket
+        self.lookback = pd.Timedelta(days=lookback_days)
+
+    def update(self, now, start=None):
+        """
+        Recompute the lines of every game with snapshots newer than the
+        stored high-water mark and upsert them into the derived dataset.
+
+        Parameters
+        ----------
+        now : datetime
+            End of the raw range to read.
+        start : datetime, optional
+            Rebuild every game with snapshots from ``start`` on, ignoring the
+            high-water mark (use for the initial multi-season build).
+
+        Returns
+        -------
+        pd.DataFrame
+            The recomputed lines.
+        """
+        now = pd.Timestamp(now)
+        state = self.s3c.read_json_from_s3(bucket_name=self.bucket, s3_key=STATE_KEY)
+        since = None
+        if start is not None:
+            read_start = pd.Timestamp(start)
+        elif state and state.get("high_water_mark"):
+            since = pd.Timestamp(state["high_water_mark"])
+            read_start = since.tz_convert(now.tz) - self.lookback
+        else:
+            read_start = now - self.lookback
+
+        raw = partitions.read_partitions(self.s3c, self.bucket, "odds", read_start, now)
+        if raw.empty:
+            logger.info("no odds snapshots to derive lines from")
+            return pd.DataFrame()
+        timestamps = pd.to_datetime(raw["timestamp"], utc=True)
+        if since is not None:
+            changed = raw.loc[timestamps > since, "game_id"].unique()
+            raw = raw[raw["game_id"].isin(changed)]
+        lines = compute_lines(raw)
+        if lines.empty:
+            logger.info("no new pre-kickoff snapshots, lines unchanged")
+            return lines
+        logger.info(f"recomputed lines for {lines['game_id'].nunique()} games")
+        self._upsert(lines)
+
+        state = {"high_water_mark": timestamps.max().isoformat()}
+        self.s3c.push_json_to_s3(state, bucket_name=self.bucket, s3_key=STATE_KEY)
+        return lines
+
+    def _upsert(self, lines):
+        """
+        replace the rows of the recomputed games in each kickoff-month
+        partition, keeping stored openers older than the recomputed ones
+        """
+        kickoff_local = lines["game_time"].dt.tz_convert("US/Central")
+        for (year, month), new in lines.groupby(
+            [kickoff_local.dt.year, kickoff_local.dt.month]
+        ):
+            s3_key = partitions.partition_key(
+                DATASET, year, month, prefix=DERIVED_PREFIX
+            )
+            existing = self.s3c.read_dataframe_from_s3(
+                bucket_name=self.bucket, s3_key=s3_key
+            )
+            if existing is not None:
+                existing = partitions.utc_timestamps(existing, TIME_COLUMNS)
+                new = keep_earlier_opens(existing, new)
+                existing = existing[~existing["game_id"].isin(new["game_id"])]
+                new = pd.concat([existing, new], ignore_index=True)
+            new = new.sort_values(["game_time"] + GROUP_COLUMNS, ignore_index=True)
+            self.s3c.push_dataframe_to_s3(
+                df=new, bucket_name=self.bucket, s3_key=s3_key
+            )
@@ -0,0 +1,203 @@
+"""
+Indexed line-movement store over the raw odds dataset.
+
+Every odds snapshot row belongs to a series keyed by
+``(game_id, book, market, outcome)``. ``LineHistory`` sorts all rows once by
+(series, snapshot time) and answers as-of questions for many
+(series, time) pairs with a single ``np.searchsorted`` call, instead of
+filtering whole monthly partitions per question.
+"""
+
+import numpy as np
+import pandas as pd
+
+from s3_io import partitions
+
+KEY_COLUMNS = ["game_id", "book", "market", "outcome"]
+VALUE_COLUMNS = ["price", "point"]
+ODDS_COLUMNS = KEY_COLUMNS + ["game_time", "timestamp"] + VALUE_COLUMNS
+
+# epoch seconds used for missing times; sorts before any real snapshot
+MISSING_SECONDS = -(2**62)
+
+
+def to_epoch_seconds(values):
+    """
+    Convert datetime-likes (naive values are taken as UTC) to int64 epoch
+    seconds, with ``MISSING_SECONDS`` for NaT.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    return np.where(index.isna(), MISSING_SECONDS, index.as_unit("s").asi8)
+
+
+class LineHistory:
+    def __init__(self, odds_df):
+        """
+        Build the sorted index.
+
+        Parameters
+        ----------
+        odds_df : pd.DataFrame
+            Rows of the odds dataset, at least ``ODDS_COLUMNS``. ``timestamp``
+            is the collection time, ``game_time`` the kickoff.
+        """
+        odds_df = odds_df.dropna(subset=KEY_COLUMNS + ["timestamp"])
+        codes, series = pd.MultiIndex.from_frame(
+            odds_df[KEY_COLUMNS].astype(str)
+        ).factorize()
+        times = to_epoch_seconds(odds_df["timestamp"])
+
+        # sort by (series, time); the last row wins for duplicate snapshots
+        order = np.lexsort((times, codes))
+        codes = codes[order]
+        times = times[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = (codes[1:] != codes[:-1]) | (times[1:] != times[:-1])
+        order = order[keep]
+        self.series_ids = codes[keep]
+        self.times = times[keep]
+        self.values = odds_df[VALUE_COLUMNS].to_numpy(
+            dtype=np.float32, na_value=np.nan
+        )[order]
+
+        n_series = len(series)
+        self.starts = np.searchsorted(self.series_ids, np.arange(n_series), "left")
+
+        # one composite int64 key per row: series * span + seconds since t0
+        self.t0 = int(self.times.min()) if len(self.times) else 0
+        self.span = int(self.times.max()) - self.t0 + 2 if len(self.times) else 2
+        self.sort_keys = self.series_ids.astype(np.int64) * self.span + (
+            self.times - self.t0
+        )
+
+        first_rows = odds_df.iloc[order[self.starts]] if n_series else odds_df
+        self.series = series.to_frame(index=False, name=KEY_COLUMNS)
+        self.series["series_id"] = np.arange(n_series)
+        self.series["game_time"] = pd.to_datetime(
+            first_rows["game_time"].to_numpy(), utc=True
+        )
+
+    @classmethod
+    def from_s3(cls, s3c, bucket, start, end):
+        """
+        Build a LineHistory from the odds partitions covering ``[start, end]``.
+
+        Only the columns needed for the index are read.
+        """
+        df = partitions.read_partitions(
+            s3c, bucket, "odds", start, end, columns=ODDS_COLUMNS
+        )
+        return cls(df)
+
+    def __len__(self):
+        return len(self.series_ids)
+
+    def _resolve_series(self, queries):
+        """
+        Expand queries to one row per matching series.
+
+        Key columns missing from ``queries`` act as wildcards, so a query with
+        only ``game_id`` returns every book/market/outcome of that game.
+        Unknown keys get ``series_id`` -1.
+        """
+        on = [col for col in KEY_COLUMNS if col in queries.columns]
+        if not on:
+            raise ValueError(f"queries need at least one of {KEY_COLUMNS}")
+        queries = queries.reset_index(drop=True)
+        keys = queries[on].astype(str)
+        resolved = keys.assign(query_row=np.arange(len(queries))).merge(
+            self.series, on=on, how="left"
+        )
+        resolved = resolved.sort_values("query_row", kind="stable")
+        series_ids = resolved["series_id"].fillna(-1).to_numpy(dtype=np.int64)
+        extra = [col for col in KEY_COLUMNS + ["game_time"] if col not in on]
+        result = queries.iloc[resolved["query_row"].to_numpy()].reset_index(drop=True)
+        for col in extra:
+            result[col] = resolved[col].to_numpy()
+        return result, series_ids
+
+    def _lookup(self, series_ids, times, strict):
+        """row positions of the last snapshot at (or strictly before) ``times``"""
+        found = series_ids >= 0
+        safe_ids = np.where(found, series_ids, 0)
+        offsets = np.clip(times - self.t0, -1, self.span - 1)
+        query_keys = safe_ids * self.span + offsets
+        side = "left" if strict else "right"
+        rows = np.searchsorted(self.sort_keys, query_keys, side=side) - 1
+        if len(self.starts):
+            found &= rows >= self.starts[safe_ids]
+        return np.where(found, rows, -1)
+
+    def _gather(self, result, rows):
+        hit = rows >= 0
+        safe_rows = np.where(hit, rows, 0)
+        if len(self):
+            values = self.values[safe_rows]
+            values[~hit] = np.nan
+            snapshot = self.times[safe_rows]
+        else:
+            values = np.full((len(rows), len(VALUE_COLUMNS)), np.nan, np.float32)
+            snapshot = np.zeros(len(rows), dtype=np.int64)
+        for i, col in enumerate(VALUE_COLUMNS):
+            result[col] = values[:, i]
+        result["snapshot_time"] = pd.to_datetime(snapshot, unit="s", utc=True).where(
+            hit
+        )
+        return result
+
+    def asof(self, queries, time_col="as_of", strict=False):
+        """
+        Line of each query series as of the query time.
+
+        Parameters
+        ----------
+        queries : pd.DataFrame
+            One or more of ``KEY_COLUMNS`` (missing ones are wildcards) and a
+            datetime column ``time_col``.
+        time_col : str, optional
+            Column holding the as-of time, "as_of" by default.
+        strict : bool, optional
+            Only use snapshots strictly before the as-of time.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per (query, matching series) with ``price``, ``point`` and
+            ``snapshot_time`` (NaN/NaT when no snapshot precedes the time).
+
+        Examples
+        --------
+        >>> lh = LineHistory.from_s3(s3c, bucket, "2024-09-01", "2025-01-31")
+        >>> lh.asof(pd.DataFrame({"game_id": ids, "book": "fanduel",
+        ...                       "market": "spreads", "as_of": times}))
+        """
+        result, series_ids = self._resolve_series(queries)
+        times = to_epoch_seconds(result[time_col])
+        rows = self._lookup(series_ids, times, strict)
+        return self._gather(result, rows)
+
+    def before_kickoff(self, queries, offset=pd.Timedelta(0)):
+        """
+        Line of each query series ``offset`` before its kickoff.
+
+        ``offset=pd.Timedelta(0)`` gives the closing line: the last snapshot
+        strictly before kickoff.
+        """
+        result, series_ids = self._resolve_series(queries)
+        kickoff = pd.to_datetime(result["game_time"], utc=True)
+        result["as_of"] = kickoff - pd.Timedelta(offset)
+        times = to_epoch_seconds(result["as_of"])
+        rows = self._lookup(series_ids, times, strict=True)
+        return self._gather(result, rows)
+
+    def opening(self, queries):
+        """first snapshot of each query series"""
+        result, series_ids = self._resolve_series(queries)
+        rows = np.full(len(series_ids), -1, dtype=np.int64)
+        found = series_ids >= 0
+        rows[found] = self.starts[series_ids[found]]
+        return self._gather(result, rows)
+
+    def closing(self, queries):
+        """last snapshot strictly before kickoff of each query series"""
+        return self.before_kickoff(queries)
@@ -0,0 +1,131 @@
+"""
+Stadium catalog: where every team plays, plus regular neutral-site venues.
+
+Coordinates are the stadium itself (used for weather and travel distances),
+``timezone`` is the IANA zone of the venue and ``roof`` is one of
+``ROOF_OPEN``, ``ROOF_RETRACTABLE`` or ``ROOF_DOME``. Teams sharing a stadium
+share a ``venue`` id. Teams are keyed by their ``team_id`` in
+``reference.teams``, which owns team names and abbreviations.
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+from reference import teams
+
+ROOF_OPEN = "open"
+ROOF_RETRACTABLE = "retractable"
+ROOF_DOME = "dome"
+
+COLUMNS = [
+    "team_id",
+    "venue",
+    "stadium",
+    "latitude",
+    "longitude",
+    "timezone",
+    "roof",
+]
+
+# fmt: off
+_TEAM_STADIUMS = [
+    (1, "state_farm_stadium", "State Farm Stadium", 33.5276, -112.2626, "America/Phoenix", ROOF_RETRACTABLE),
+    (2, "mercedes_benz_stadium", "Mercedes-Benz Stadium", 33.7554, -84.4008, "America/New_York", ROOF_RETRACTABLE),
+    (3, "mt_bank_stadium", "M&T Bank Stadium", 39.2780, -76.6227, "America/New_York", ROOF_OPEN),
+    (4, "highmark_stadium", "Highmark Stadium", 42.7738, -78.7870, "America/New_York", ROOF_OPEN),
+    (5, "bank_of_america_stadium", "Bank of America Stadium", 35.2258, -80.8528, "America/New_York", ROOF_OPEN),
+    (6, "soldier_field", "Soldier Field", 41.8623, -87.6167, "America/Chicago", ROOF_OPEN),
+    (7, "paycor_stadium", "Paycor Stadium", 39.0955, -84.5161, "America/New_York", ROOF_OPEN),
+    (8, "huntington_bank_field", "Huntington Bank Field", 41.5061, -81.6995, "America/New_York", ROOF_OPEN),
+    (9, "att_stadium", "AT&T Stadium", 32.7473, -97.0945, "America/Chicago", ROOF_RETRACTABLE),
+    (10, "empower_field", "Empower Field at Mile High", 39.7439, -105.0201, "America/Denver", ROOF_OPEN),
+    (11, "ford_field", "Ford Field", 42.3400, -83.0456, "America/Detroit", ROOF_DOME),
+    (12, "lambeau_field", "Lambeau Field", 44.5013, -88.0622, "America/Chicago", ROOF_OPEN),
+    (13, "nrg_stadium", "NRG Stadium", 29.6847, -95.4107, "America/Chicago", ROOF_RETRACTABLE),
+    (14, "lucas_oil_stadium", "Lucas Oil Stadium", 39.7601, -86.1639, "America/Indiana/Indianapolis", ROOF_RETRACTABLE),
+    (15, "everbank_stadium", "EverBank Stadium", 30.3239, -81.6373, "America/New_York", ROOF_OPEN),
+    (16, "arrowhead_stadium", "GEHA Field at Arrowhead Stadium", 39.0489, -94.4839, "America/Chicago", ROOF_OPEN),
+    (17, "allegiant_stadium", "Allegiant Stadium", 36.0909, -115.1833, "America/Los_Angeles", ROOF_DOME),
+    (18, "sofi_stadium", "SoFi Stadium", 33.9535, -118.3392, "America/Los_Angeles", ROOF_DOME),
+    (19, "sofi_stadium", "SoFi Stadium", 33.9535, -118.3392, "America/Los_Angeles", ROOF_DOME),
+    (20, "hard_rock_stadium", "Hard Rock Stadium", 25.9580, -80.2389, "America/New_York", ROOF_OPEN),
+    (21, "us_bank_stadium", "U.S. Bank Stadium", 44.9736, -93.2575, "America/Chicago", ROOF_DOME),
+    (22, "gillette_stadium", "Gillette Stadium", 42.0909, -71.2643, "America/New_York", ROOF_OPEN),
+    (23, "caesars_superdome", "Caesars Superdome", 29.9511, -90.0812, "America/Chicago", ROOF_DOME),
+    (24, "metlife_stadium", "MetLife Stadium", 40.8135, -74.0745, "America/New_York", ROOF_OPEN),
+    (25, "metlife_stadium", "MetLife Stadium", 40.8135, -74.0745, "America/New_York", ROOF_OPEN),
+    (26, "lincoln_financial_field", "Lincoln Financial Field", 39.9008, -75.1675, "America/New_York", ROOF_OPEN),
+    (27, "acrisure_stadium", "Acrisure Stadium", 40.4468, -80.0158, "America/New_York", ROOF_OPEN),
+    (28, "levis_stadium", "Levi's Stadium", 37.4030, -121.9700, "America/Los_Angeles", ROOF_OPEN),
+    (29, "lumen_field", "Lumen Field", 47.5952, -122.3316, "America/Los_Angeles", ROOF_OPEN),
+    (30, "raymond_james_stadium", "Raymond James Stadium", 27.9759, -82.5033, "America/New_York", ROOF_OPEN),
+    (31, "nissan_stadium", "Nissan Stadium", 36.1665, -86.7713, "America/Chicago", ROOF_OPEN),
+    (32, "northwest_stadium", "Northwest Stadium", 38.9078, -76.8645, "America/New_York", ROOF_OPEN),
+]
+
+_NEUTRAL_VENUES = [
+    (None, "wembley_stadium", "Wembley Stadium", 51.5560, -0.2795, "Europe/London", ROOF_OPEN),
+    (None, "tottenham_hotspur_stadium", "Tottenham Hotspur Stadium", 51.6043, -0.0664, "Europe/London", ROOF_OPEN),
+    (None, "allianz_arena", "Allianz Arena", 48.2188, 11.6247, "Europe/Berlin", ROOF_OPEN),
+    (None, "deutsche_bank_park", "Deutsche Bank Park", 50.0686, 8.6455, "Europe/Berlin", ROOF_RETRACTABLE),
+    (None, "estadio_azteca", "Estadio Azteca", 19.3029, -99.1505, "America/Mexico_City", ROOF_OPEN),
+    (None, "neo_quimica_arena", "Neo Quimica Arena", -23.5453, -46.4742, "America/Sao_Paulo", ROOF_OPEN),
+    (None, "santiago_bernabeu", "Santiago Bernabeu", 40.4531, -3.6883, "Europe/Madrid", ROOF_RETRACTABLE),
+]
+# fmt: on
+
+
+@lru_cache(maxsize=1)
+def _catalog():
+    catalog = pd.DataFrame(_TEAM_STADIUMS + _NEUTRAL_VENUES, columns=COLUMNS)
+    catalog["team_id"] = catalog["team_id"].astype("Int8")
+    return catalog
+
+
+def stadium_catalog():
+    """
+    Full catalog, one row per team plus one per neutral-site venue.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``COLUMNS``; ``team_id`` is nullable and missing for neutral venues.
+    """
+    return _catalog().copy()
+
+
+def team_stadiums():
+    """
+    Home stadium of every team, indexed by ``team_id``.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    catalog = _catalog()
+    catalog = catalog[catalog["team_id"].notna()]
+    return catalog.astype({"team_id": teams.TEAM_ID_DTYPE}).set_index("team_id")
+
+
+def venue_catalog(include_domes=True):
+    """
+    One row per distinct venue.
+
+    Parameters
+    ----------
+    include_domes : bool, optional
+        Keep fixed-roof venues; weather never affects them, so weather
+        requests pass False.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``venue``, ``stadium``, ``latitude``, ``longitude``, ``timezone``
+        and ``roof``, indexed from 0.
+    """
+    catalog = _catalog().drop(columns="team_id")
+    venues = catalog.drop_duplicates("venue", ignore_index=True)
+    if not include_domes:
+        venues = venues[venues["roof"] != ROOF_DOME].reset_index(drop=True)
+    return venues
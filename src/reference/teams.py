@@ -0,0 +1,215 @@
+"""
+Canonical team registry.
+
+Every source spells teams its own way: the odds feed uses full names ("Kansas
+City Chiefs"), TeamRankings uses site names ("Kansas City", "NY Giants") with
+records stripped, ESPN box scores use abbreviations ("WSH") and the games
+archive mixes names and abbreviations. Every spelling, including relocated and
+renamed teams, maps here to one small integer ``team_id`` (int8) and one
+abbreviation. Collectors store the id next to the source names, so cross
+source joins are integer merges.
+
+Names are matched case-insensitively after stripping records ("(10-2)"),
+periods and extra whitespace. Unknown names get ``UNMAPPED`` and are logged.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+TEAM_ID_DTYPE = np.int8
+UNMAPPED = -1
+
+COLUMNS = ["team_id", "abbreviation", "team_name", "rankings_name"]
+
+# name column -> id column of every dataset
+ODDS_ID_COLUMNS = {"home_team": "home_team_id", "away_team": "away_team_id"}
+RANKINGS_ID_COLUMNS = {"team": "team_id"}
+BOX_SCORE_ID_COLUMNS = {
+    "home_abbreviation": "home_team_id",
+    "away_abbreviation": "away_team_id",
+}
+
+# fmt: off
+_TEAMS = [
+    (1, "ARI", "Arizona Cardinals", "Arizona", ["Phoenix Cardinals", "St. Louis Cardinals", "ARZ"]),
+    (2, "ATL", "Atlanta Falcons", "Atlanta", []),
+    (3, "BAL", "Baltimore Ravens", "Baltimore", ["BLT"]),
+    (4, "BUF", "Buffalo Bills", "Buffalo", []),
+    (5, "CAR", "Carolina Panthers", "Carolina", []),
+    (6, "CHI", "Chicago Bears", "Chicago", []),
+    (7, "CIN", "Cincinnati Bengals", "Cincinnati", []),
+    (8, "CLE", "Cleveland Browns", "Cleveland", ["CLV"]),
+    (9, "DAL", "Dallas Cowboys", "Dallas", []),
+    (10, "DEN", "Denver Broncos", "Denver", []),
+    (11, "DET", "Detroit Lions", "Detroit", []),
+    (12, "GB", "Green Bay Packers", "Green Bay", ["GNB"]),
+    (13, "HOU", "Houston Texans", "Houston", ["HST"]),
+    (14, "IND", "Indianapolis Colts", "Indianapolis", []),
+    (15, "JAX", "Jacksonville Jaguars", "Jacksonville", ["JAC"]),
+    (16, "KC", "Kansas City Chiefs", "Kansas City", ["KAN"]),
+    (17, "LV", "Las Vegas Raiders", "Las Vegas", ["Oakland Raiders", "Oakland", "OAK", "LVR"]),
+    (18, "LAC", "Los Angeles Chargers", "LA Chargers", ["San Diego Chargers", "San Diego", "SD", "SDG"]),
+    (19, "LAR", "Los Angeles Rams", "LA Rams", ["St. Louis Rams", "St. Louis", "STL", "LA", "RAM"]),
+    (20, "MIA", "Miami Dolphins", "Miami", []),
+    (21, "MIN", "Minnesota Vikings", "Minnesota", []),
+    (22, "NE", "New England Patriots", "New England", ["NWE"]),
+    (23, "NO", "New Orleans Saints", "New Orleans", ["NOR"]),
+    (24, "NYG", "New York Giants", "NY Giants", []),
+    (25, "NYJ", "New York Jets", "NY Jets", []),
+    (26, "PHI", "Philadelphia Eagles", "Philadelphia", []),
+    (27, "PIT", "Pittsburgh Steelers", "Pittsburgh", []),
+    (28, "SF", "San Francisco 49ers", "San Francisco", ["SFO"]),
+    (29, "SEA", "Seattle Seahawks", "Seattle", []),
+    (30, "TB", "Tampa Bay Buccaneers", "Tampa Bay", ["TAM"]),
+    (31, "TEN", "Tennessee Titans", "Tennessee", ["Tennessee Oilers", "Houston Oilers"]),
+    (32, "WAS", "Washington Commanders", "Washington", ["Washington Football Team", "Washington Redskins", "WSH"]),
+]
+# fmt: on
+
+_RECORD = re.compile(r"\s*\(.*\)")
+
+
+def normalize_names(names):
+    """
+    Matching form of team names: records, periods and extra whitespace
+    removed, case folded.
+
+    Parameters
+    ----------
+    names : array-like of str
+
+    Returns
+    -------
+    pd.Series
+    """
+    names = pd.Series(np.asarray(names, dtype=object), dtype="string")
+    return (
+        names.str.replace(_RECORD, "", regex=True)
+        .str.replace(".", "", regex=False)
+        .str.split()
+        .str.join(" ")
+        .str.casefold()
+    )
+
+
+@lru_cache(maxsize=1)
+def _registry():
+    table = pd.DataFrame([row[:4] for row in _TEAMS], columns=COLUMNS)
+    table["team_id"] = table["team_id"].astype(TEAM_ID_DTYPE)
+    aliases, ids = [], []
+    for team_id, abbreviation, team_name, rankings_name, others in _TEAMS:
+        for alias in [abbreviation, team_name, rankings_name] + others:
+            aliases.append(alias)
+            ids.append(team_id)
+    normalized = normalize_names(aliases)
+    if normalized.duplicated().any():
+        raise ValueError(
+            f"ambiguous team aliases: {normalized[normalized.duplicated()]}"
+        )
+    return table, pd.Index(normalized.to_numpy()), np.array(ids, dtype=TEAM_ID_DTYPE)
+
+
+def team_table():
+    """
+    One row per team.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``COLUMNS``, ``team_id`` from 1.
+    """
+    return _registry()[0].copy()
+
+
+def team_ids(names, source=None):
+    """
+    Team id of every name, abbreviation or alias.
+
+    Parameters
+    ----------
+    names : array-like of str
+    source : str, optional
+        Name of the data source, used when reporting unmapped names.
+
+    Returns
+    -------
+    np.ndarray
+        int8, ``UNMAPPED`` for unknown or missing names.
+    """
+    _, aliases, ids = _registry()
+    codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+    positions = aliases.get_indexer(normalize_names(uniques).to_numpy())
+    unique_ids = np.where(positions >= 0, ids[positions], UNMAPPED)
+    missing = sorted(map(str, uniques[positions < 0]))
+    if missing:
+        logger.warning(f"{len(missing)} unmapped {source or 'team'} names: {missing}")
+    result = np.full(len(codes), UNMAPPED, dtype=TEAM_ID_DTYPE)
+    found = codes >= 0
+    result[found] = unique_ids[codes[found]]
+    return result
+
+
+def unmapped_names(names):
+    """Distinct names in ``names`` that map to no team"""
+    _, aliases, _ = _registry()
+    uniques = pd.unique(pd.Series(names).dropna().astype(str))
+    positions = aliases.get_indexer(normalize_names(uniques).to_numpy())
+    return sorted(uniques[positions < 0])
+
+
+def _lookup(ids, column):
+    table = _registry()[0]
+    lookup = np.concatenate([[None], table[column].to_numpy(dtype=object)])
+    ids = np.asarray(ids, dtype=np.int64)
+    return lookup[np.where(ids > 0, ids, 0)]
+
+
+def abbreviations(ids):
+    """Abbreviation of every team id, None for ``UNMAPPED``"""
+    return _lookup(ids, "abbreviation")
+
+
+def team_names(ids):
+    """Full name of every team id, None for ``UNMAPPED``"""
+    return _lookup(ids, "team_name")
+
+
+def add_team_ids(df, columns, source=None):
+    """
+    Add integer team id columns next to team name columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    columns : dict
+        Name column -> id column, e.g. ``{"home_team": "home_team_id"}``.
+        Missing name columns are skipped.
+    source : str, optional
+        Data source name for the unmapped names report.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``df`` with int8 id columns (re)computed from the names.
+    """
+    ids = {
+        id_col: team_ids(df[name_col], source=source)
+        for name_col, id_col in columns.items()
+        if name_col in df.columns
+    }
+    return df.assign(**ids)
+
+
+def backfill_team_ids(df, columns, source=None):
+    """
+    ``add_team_ids`` for frames stored before id columns existed: only id
+    columns that are missing are computed.
+    """
+    missing = {
+        name_col: id_col for name_col, id_col in columns.items() if id_col not in df
+    }
+    return add_team_ids(df, missing, source=source) if missing else df
@@ -0,0 +1,135 @@
+"""
+Helpers for the year/month partitioned datasets in the bucket.
+
+Every collector writes ``{prefix}/{dataset}/year=YYYY/month=MM/data.parquet``;
+readers use these helpers to work out which monthly files cover a time range
+and to load only those.
+"""
+
+import re
+
+import pandas as pd
+from loguru import logger
+
+RAW_PREFIX = "data/raw"
+
+_PARTITION = re.compile(r"/year=(\d{4})/month=(\d{2})/data\.parquet$")
+
+
+def partition_key(dataset, year, month, prefix=RAW_PREFIX):
+    """
+    S3 key of a monthly partition.
+
+    Parameters
+    ----------
+    dataset : str
+        Dataset name, e.g. "odds" or "team_rankings".
+    year : int
+    month : int
+    prefix : str, optional
+        Key prefix, "data/raw" by default.
+
+    Returns
+    -------
+    str
+    """
+    return f"{prefix}/{dataset}/year={year}/month={month:02d}/data.parquet"
+
+
+def parse_partition_key(s3_key):
+    """
+    (year, month) of a partition key, None if ``s3_key`` is not a partition.
+    """
+    match = _PARTITION.search(s3_key)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def months_between(start, end):
+    """
+    (year, month) pairs of every month touched by the range ``[start, end]``.
+
+    Parameters
+    ----------
+    start : datetime-like
+    end : datetime-like
+
+    Returns
+    -------
+    list of tuple(int, int)
+    """
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    if end < start:
+        return []
+    periods = pd.period_range(
+        start=start.tz_localize(None).to_period("M"),
+        end=end.tz_localize(None).to_period("M"),
+        freq="M",
+    )
+    return [(p.year, p.month) for p in periods]
+
+
+def utc_timestamps(df, columns):
+    """
+    ``df`` with its datetime ``columns`` as tz-aware UTC.
+
+    Partitions store datetimes as int64 epoch nanoseconds (see
+    ``S3Client._convert_dataframe_types``), while fresh rows carry datetimes;
+    both sides of an upsert are brought to one dtype before they are
+    concatenated, or the column turns into mixed objects. Missing columns are
+    skipped.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    columns : list of str
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    converted = {
+        col: pd.to_datetime(df[col], utc=True) for col in columns if col in df.columns
+    }
+    return df.assign(**converted) if converted else df
+
+
+def read_partitions(s3c, bucket, dataset, start, end, columns=None, prefix=RAW_PREFIX):
+    """
+    Read and concatenate the monthly partitions covering ``[start, end]``.
+
+    Missing partitions are skipped, so a range reaching past the newest data
+    is fine. Rows are not filtered by time; callers filter on whichever time
+    column is relevant to them.
+
+    Parameters
+    ----------
+    s3c : S3Client
+    bucket : str
+    dataset : str
+    start : datetime-like
+    end : datetime-like
+    columns : list of str, optional
+        Columns to load, all by default.
+    prefix : str, optional
+
+    Returns
+    -------
+    pd.DataFrame
+        Concatenated partitions, empty if none exist.
+    """
+    frames = []
+    for year, month in months_between(start, end):
+        df = s3c.read_dataframe_from_s3(
+            bucket_name=bucket,
+            s3_key=partition_key(dataset, year, month, prefix=prefix),
+            columns=columns,
+        )
+        if df is not None:
+            frames.append(df)
+    logger.info(f"read {len(frames)} {dataset} partitions between {start} and {end}")
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
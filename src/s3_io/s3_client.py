@@ -1,14 +1,97 @@
 import io
+import json
 import os
+import threading
 
 import boto3
 import dotenv
 import numpy as np
 import pandas as pd
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
 
+import instrumentation
+
 dotenv.load_dotenv()
 
+# connections shared by all collector threads; the handler runs up to 4
+# collectors, each with up to MAX_CONCURRENCY parts in flight
+MAX_POOL_CONNECTIONS = 32
+
+# multipart transfers for large partitions (e.g. a season of odds snapshots)
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=8,
+)
+
+# in-memory size of one parquet row group; partitions written in bounded row
+# groups can be read one group at a time (see s3_io.upsert)
+ROW_GROUP_BYTES = 32 * 2**20
+
+# boto3 clients by (local credentials, region); created once per process and
+# reused by every S3Client, including across warm Lambda invocations
+_clients = {}
+_clients_lock = threading.Lock()
+_client_stats = {"created": 0, "reused": 0}
+
+
+def row_group_rows(df, group_bytes=None):
+    """
+    Rows of a DataFrame per parquet row group of about ``group_bytes``.
+
+    :param df: The DataFrame to be written (Pandas DataFrame).
+    :param group_bytes: In-memory size of a row group, ROW_GROUP_BYTES by default (int).
+    :return: Rows per row group, at least 1 (int).
+    """
+    group_bytes = group_bytes or ROW_GROUP_BYTES
+    row_bytes = df.memory_usage(deep=True).sum() / max(len(df), 1)
+    return max(1, int(group_bytes // max(row_bytes, 1)))
+
+
+def get_client(aws_access_key_id=None, aws_secret_access_key=None, region_name=None):
+    """
+    Process-wide boto3 S3 client for a set of credentials, created on first
+    use. Botocore clients are thread-safe, so collectors running in parallel
+    share one connection pool.
+
+    :param aws_access_key_id: Explicit access key, None for the default chain (string).
+    :param aws_secret_access_key: Explicit secret key (string).
+    :param region_name: Region of explicit credentials (string).
+    :return: A boto3 S3 client.
+    """
+    key = (aws_access_key_id, aws_secret_access_key, region_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _client_stats["reused"] += 1
+            return client
+        config = Config(max_pool_connections=MAX_POOL_CONNECTIONS)
+        if aws_access_key_id is not None:
+            client = boto3.client(
+                "s3",
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                region_name=region_name,
+                config=config,
+            )
+        else:
+            client = boto3.client("s3", config=config)
+        _clients[key] = client
+        _client_stats["created"] += 1
+        return client
+
+
+def client_stats():
+    """
+    How often the shared boto3 client was created versus reused.
+
+    :return: Counts under "created" and "reused" (dict).
+    """
+    with _clients_lock:
+        return dict(_client_stats)
+
 
 class S3Client:
     def __init__(self):
@@ -25,23 +108,23 @@ class S3Client:
 
     def initialize_session(self):
         """
-        Initialize the S3 session with provided credentials and region.
+        Attach the shared S3 client for the configured credentials and region.
         """
         try:
             if self.local_execution:
-                self.s3_client = boto3.client(
-                    "s3",
+                self.s3_client = get_client(
                     aws_access_key_id=self.aws_access_key_id,
                     aws_secret_access_key=self.aws_secret_access_key,
                     region_name=self.region_name,
                 )
             else:
-                self.s3_client = boto3.client("s3")
+                self.s3_client = get_client()
             print(f"Successfully initialized session for region: {self.region_name}")
         except (NoCredentialsError, PartialCredentialsError) as e:
             print(f"Error initializing session: {e}")
             raise
 
+    @instrumentation.timed("type_conversion")
     def _convert_dataframe_types(self, df):
         """
         Convert DataFrame column types to ensure Parquet compatibility.
@@ -53,6 +136,11 @@ class S3Client:
         df = df.copy()
 
         for col in df.columns:
+            # datetimes are stored as epoch nanoseconds whatever their unit,
+            # e.g. a Timestamp parsed from a string has second resolution
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.as_unit("ns")
+
             # Skip if already a proper numeric type
             if pd.api.types.is_numeric_dtype(df[col]) and df[col].dtype != object:
                 continue
@@ -103,6 +191,7 @@ class S3Client:
         """
         Upload a Pandas DataFrame directly to S3 as a Parquet file.
         This method avoids writing to the disk by using an in-memory buffer.
+        Row groups hold about ROW_GROUP_BYTES of the frame each.
 
         :param df: The Pandas DataFrame to upload (Pandas DataFrame).
         :param bucket_name: The name of the S3 bucket (string).
@@ -113,12 +202,20 @@ class S3Client:
             # Convert DataFrame types to ensure Parquet compatibility
             df = self._convert_dataframe_types(df)
 
-            buffer = io.BytesIO()
-            df.to_parquet(
-                buffer, engine="fastparquet", compression="snappy", index=False
-            )
-            buffer.seek(0)
-            self.s3_client.upload_fileobj(buffer, bucket_name, s3_key)
+            with instrumentation.stage("s3_write") as stage:
+                buffer = io.BytesIO()
+                df.to_parquet(
+                    buffer,
+                    engine="fastparquet",
+                    compression="snappy",
+                    index=False,
+                    row_group_offsets=row_group_rows(df),
+                )
+                buffer.seek(0)
+                self.s3_client.upload_fileobj(
+                    buffer, bucket_name, s3_key, Config=TRANSFER_CONFIG
+                )
+                stage.record(df=df, nbytes=buffer.getbuffer().nbytes)
             print(f"DataFrame uploaded successfully to s3://{bucket_name}/{s3_key}")
         except Exception as e:
             print(f"Error uploading DataFrame to S3: {e}")
@@ -134,16 +231,111 @@ class S3Client:
         :return: A Pandas DataFrame containing the selected data (Pandas DataFrame).
         """
         try:
-            buffer = io.BytesIO()
-            self.s3_client.download_fileobj(bucket_name, s3_key, buffer)
-            buffer.seek(0)  # Rewind the buffer to the start
-            df = pd.read_parquet(buffer, engine="fastparquet", columns=columns)
+            with instrumentation.stage("s3_read") as stage:
+                buffer = io.BytesIO()
+                self.s3_client.download_fileobj(
+                    bucket_name, s3_key, buffer, Config=TRANSFER_CONFIG
+                )
+                buffer.seek(0)  # Rewind the buffer to the start
+                df = pd.read_parquet(buffer, engine="fastparquet", columns=columns)
+                stage.record(df=df, nbytes=buffer.getbuffer().nbytes)
             print(f"DataFrame loaded successfully from s3://{bucket_name}/{s3_key}")
             return df
         except Exception as e:
             print(f"Error reading DataFrame from S3: {e}")
             return None
 
+    def push_json_to_s3(self, obj, bucket_name, s3_key):
+        """
+        Upload a JSON-serializable object to S3. Used for small state documents
+        (scheduler state, checkpoints) that are rewritten on every invocation.
+
+        :param obj: The object to serialize (dict or list).
+        :param bucket_name: The name of the S3 bucket (string).
+        :param s3_key: The S3 object key (path) where the JSON will be stored (string).
+        :return: None
+        """
+        try:
+            body = json.dumps(obj, default=str).encode("utf-8")
+            self.s3_client.put_object(
+                Bucket=bucket_name,
+                Key=s3_key,
+                Body=body,
+                ContentType="application/json",
+            )
+            print(f"JSON uploaded successfully to s3://{bucket_name}/{s3_key}")
+        except Exception as e:
+            print(f"Error uploading JSON to S3: {e}")
+            raise
+
+    def read_json_from_s3(self, bucket_name, s3_key):
+        """
+        Read a JSON object from S3.
+
+        :param bucket_name: The name of the S3 bucket (string).
+        :param s3_key: The S3 object key (path) of the JSON file (string).
+        :return: The deserialized object, or None if it does not exist or cannot be read.
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=s3_key)
+            return json.loads(response["Body"].read())
+        except Exception as e:
+            print(f"Error reading JSON from S3: {e}")
+            return None
+
+    def list_etags(self, bucket_name, prefix):
+        """
+        List the objects under a prefix with their ETags. The ETag changes
+        whenever an object is rewritten, so it identifies a version of a
+        partition without downloading it.
+
+        :param bucket_name: The name of the S3 bucket (string).
+        :param prefix: The S3 key prefix to list (string).
+        :return: Mapping of S3 key to ETag (dict).
+        """
+        etags = {}
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                etags[obj["Key"]] = obj["ETag"]
+        return etags
+
+    def push_file_to_s3(self, file_path, bucket_name, s3_key):
+        """
+        Upload a local file to S3.
+
+        :param file_path: Path of the local file (string).
+        :param bucket_name: The name of the S3 bucket (string).
+        :param s3_key: The S3 object key (path) to upload to (string).
+        :return: None
+        """
+        try:
+            self.s3_client.upload_file(
+                file_path, bucket_name, s3_key, Config=TRANSFER_CONFIG
+            )
+            print(f"File uploaded successfully to s3://{bucket_name}/{s3_key}")
+        except Exception as e:
+            print(f"Error uploading file to S3: {e}")
+            raise
+
+    def read_file_from_s3(self, bucket_name, s3_key, file_path):
+        """
+        Download an S3 object to a local file.
+
+        :param bucket_name: The name of the S3 bucket (string).
+        :param s3_key: The S3 object key (path) to download (string).
+        :param file_path: Path of the local file to write (string).
+        :return: True if the file was downloaded, False otherwise (bool).
+        """
+        try:
+            self.s3_client.download_file(
+                bucket_name, s3_key, file_path, Config=TRANSFER_CONFIG
+            )
+            return True
+        except Exception as e:
+            print(f"Error downloading file from S3: {e}")
+            return False
+
 
 if __name__ == "__main__":
     data = {
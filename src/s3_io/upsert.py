@@ -0,0 +1,150 @@
+"""
+Memory-bounded upserts of monthly partitions.
+
+A collector upserts a partition by reading it whole, concatenating the new
+rows, deduplicating and writing it back, so several copies of the month are
+in memory at once. ``upsert_partition`` downloads the partition to local disk
+first and projects that cost from its row count and the size of the new rows.
+When it would not fit under the ``MemoryGuard`` threshold, the partition is
+streamed one row group at a time instead: stored rows whose ``slice_column``
+value does not occur in the new rows cannot be replaced, so they are appended
+straight to a local parquet file, and only the matching slice is merged with
+the new rows in memory. The file is then uploaded from disk.
+"""
+
+import os
+import tempfile
+
+import fastparquet
+import pandas as pd
+from loguru import logger
+
+import instrumentation
+import memory_guard
+
+# copies of the month an in-memory upsert holds at once: the stored,
+# combined, deduplicated and type-converted frames
+UPSERT_COPIES = 4
+
+# in-memory size of one row group written by a chunked upsert
+CHUNK_BYTES = 32 * 2**20
+
+
+def upsert_partition(
+    s3c, bucket, s3_key, df, merge, slice_column, guard=None, tmp_dir=None
+):
+    """
+    Upsert ``df`` into a parquet partition, in chunks when memory is short.
+
+    Parameters
+    ----------
+    s3c : S3Client
+    bucket : str
+    s3_key : str
+    df : pd.DataFrame
+        New rows; converted to parquet types before they are merged.
+    merge : callable
+        ``merge(stored, df)`` returning the upserted rows, e.g. a concat and
+        ``drop_duplicates``. Applied to the whole partition in memory, or to
+        the stored rows sharing a ``slice_column`` value with ``df`` when
+        chunked.
+    slice_column : str
+        Column of ``df`` outside whose values no stored row can be replaced,
+        e.g. the snapshot date or collection timestamp.
+    guard : MemoryGuard, optional
+    tmp_dir : str, optional
+        Directory for the local copies, the system default by default.
+
+    Returns
+    -------
+    dict
+        ``rows`` written and ``mode``: "new", "memory" or "chunked".
+    """
+    guard = guard or memory_guard.MemoryGuard(s3_key)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        path = os.path.join(tmp, "stored.parquet")
+        with instrumentation.stage("s3_read") as stage:
+            found = s3c.read_file_from_s3(bucket, s3_key, path)
+            stage.record(nbytes=os.path.getsize(path) if found else 0)
+        if not found:
+            s3c.push_dataframe_to_s3(df=df, bucket_name=bucket, s3_key=s3_key)
+            return {"rows": len(df), "mode": "new"}
+
+        # new rows in stored types, so they compare equal to the stored ones
+        # (e.g. numeric strings, and timestamps stored as epoch nanoseconds)
+        df = s3c._convert_dataframe_types(df)
+        stored = fastparquet.ParquetFile(path)
+        row_bytes = df.memory_usage(deep=True).sum() / max(len(df), 1)
+        projected = int(UPSERT_COPIES * row_bytes * (stored.count() + len(df)))
+        guard.check(f"before upsert, {projected / 2**20:.0f} MB projected")
+        if not guard.fits(projected):
+            out_path = os.path.join(tmp, "upserted.parquet")
+            try:
+                rows = _chunked_upsert(
+                    s3c, stored, df, merge, slice_column, guard, out_path, row_bytes
+                )
+            except (ValueError, TypeError) as e:
+                # e.g. the new rows add columns, which a row group append can't
+                logger.warning(f"chunked upsert of {s3_key} not possible: {e}")
+            else:
+                with instrumentation.stage("s3_write") as stage:
+                    s3c.push_file_to_s3(out_path, bucket, s3_key)
+                    stage.record(nbytes=os.path.getsize(out_path))
+                guard.check("after chunked upsert")
+                return {"rows": rows, "mode": "chunked"}
+
+        upserted = merge(stored.to_pandas(), df)
+        guard.check("after merge")
+        s3c.push_dataframe_to_s3(df=upserted, bucket_name=bucket, s3_key=s3_key)
+        guard.check("after upload")
+        return {"rows": len(upserted), "mode": "memory"}
+
+
+def _chunked_upsert(s3c, stored, df, merge, slice_column, guard, out_path, row_bytes):
+    """
+    Write the upserted partition to ``out_path`` one row group at a time.
+
+    Returns
+    -------
+    int
+        Rows written.
+
+    Raises
+    ------
+    ValueError, TypeError
+        When the merged rows can't take the stored partition's schema.
+    """
+    rows_per_group = max(1, int(CHUNK_BYTES // max(row_bytes, 1)))
+    keys = df[slice_column].unique()
+    written = 0
+    matching = []
+
+    def append(part):
+        nonlocal written
+        fastparquet.write(
+            out_path,
+            part,
+            row_group_offsets=rows_per_group,
+            compression="snappy",
+            write_index=False,
+            append=written > 0,
+        )
+        written += len(part)
+
+    for i, part in enumerate(stored.iter_row_groups()):
+        replaceable = part[slice_column].isin(keys).to_numpy()
+        matching.append(part[replaceable])
+        if not replaceable.all():
+            append(part[~replaceable])
+        del part
+        guard.check(f"stored row group {i}")
+
+    stored_slice = pd.concat(matching, ignore_index=True) if matching else None
+    merged = merge(stored_slice, df) if stored_slice is not None else df
+    if set(merged.columns) != set(stored.columns):
+        raise ValueError(
+            f"columns differ from the stored partition: "
+            f"{sorted(set(merged.columns) ^ set(stored.columns))}"
+        )
+    append(merged[stored.columns].astype(stored.dtypes))
+    return written
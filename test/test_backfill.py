@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src import backfill
+from src.backfill import backfill_dates, checkpoint_key, plan_chunks, run_backfill
+
+
+class _JsonStore:
+    """S3Client stand-in keeping JSON objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def read_json_from_s3(self, bucket_name, s3_key):
+        return self.objects.get(s3_key)
+
+    def push_json_to_s3(self, obj, bucket_name, s3_key):
+        import json
+
+        self.objects[s3_key] = json.loads(json.dumps(obj))
+
+
+def _context(seconds):
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = seconds * 1000
+    return context
+
+
+class TestPlanning(unittest.TestCase):
+    """Tests for splitting a backfill range into chunks"""
+
+    def test_weekly_dates(self):
+        dates = backfill_dates("2024-09-01", "2024-09-30", "weekly")
+        self.assertEqual(
+            [d.strftime("%Y-%m-%d") for d in dates],
+            ["2024-09-01", "2024-09-08", "2024-09-15", "2024-09-22", "2024-09-29"],
+        )
+        self.assertEqual(str(dates[0].tz), "US/Central")
+
+    def test_chunks_never_share_a_partition(self):
+        dates = backfill_dates("2024-09-01", "2024-11-30", "weekly")
+        tasks = [
+            (c, d)
+            for c in ["odds_data_collector", "team_rankings_data_collector"]
+            for d in dates
+        ]
+        chunks = plan_chunks(tasks, max_workers=4)
+
+        self.assertEqual(sorted(t for chunk in chunks for t in chunk), sorted(tasks))
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 4)
+            partitions = [(c, d.year, d.month) for c, d in chunk]
+            self.assertEqual(len(partitions), len(set(partitions)))
+        # a month of weekly dates runs four or five at once
+        self.assertEqual(len(chunks[0]), 4)
+
+    def test_collectors_not_keyed_by_date_run_one_date_at_a_time(self):
+        dates = backfill_dates("2024-09-01", "2024-11-30", "weekly")
+        collectors = ["box_score_data_collector", "weather_data_collector"]
+        tasks = [(c, d) for c in collectors for d in dates]
+        chunks = plan_chunks(tasks, max_workers=4)
+
+        self.assertEqual(sorted(t for chunk in chunks for t in chunk), sorted(tasks))
+        self.assertEqual(len(chunks), len(dates))
+        for chunk in chunks:
+            names = [c for c, _ in chunk]
+            self.assertEqual(len(names), len(set(names)))
+
+
+class TestRunBackfill(unittest.TestCase):
+    """Tests for resumable backfill runs"""
+
+    def setUp(self):
+        self.s3c = _JsonStore()
+        self.runs = []
+        self.partial_days = set()
+
+    def _run(self, collector, dt, s3c, options, deadline):
+        day = dt.strftime("%Y-%m-%d")
+        self.runs.append((collector, day))
+        if day == "2024-09-15":
+            return {"collector": collector, "status": "error", "error": "boom"}
+        if day in self.partial_days:
+            report = {"status": "partial", "unfinished_tables": ["offense_points"]}
+            return {"collector": collector, "status": "ok", "report": report}
+        return {"collector": collector, "status": "ok"}
+
+    def _backfill(self, context=None):
+        event = {"start_date": "2024-09-01", "end_date": "2024-10-06", "step": "weekly"}
+        return run_backfill(
+            event, context, ["rankings"], self._run, self.s3c, "bucket", 2
+        )
+
+    def test_checkpoint_records_completed_dates_and_resumes(self):
+        result = self._backfill()
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["completed"], 5)
+        self.assertEqual(result["failed"], [("rankings", "2024-09-15")])
+
+        key = checkpoint_key(["rankings"], "2024-09-01", "2024-10-06", "weekly")
+        checkpoint = self.s3c.objects[key]
+        self.assertEqual(len(checkpoint["completed"]["rankings"]), 5)
+        self.assertEqual(checkpoint["failed"]["rankings"], {"2024-09-15": "boom"})
+
+        # only the failed date is retried
+        self.runs.clear()
+        self._backfill()
+        self.assertEqual(self.runs, [("rankings", "2024-09-15")])
+
+    def test_partial_days_stay_pending(self):
+        self.partial_days = {"2024-09-22"}
+        result = self._backfill()
+        self.assertEqual(result["status"], "incomplete")
+        self.assertEqual(result["completed"], 4)
+        self.assertEqual(result["partial"], [("rankings", "2024-09-22")])
+
+        key = checkpoint_key(["rankings"], "2024-09-01", "2024-10-06", "weekly")
+        checkpoint = self.s3c.objects[key]
+        self.assertNotIn("2024-09-22", checkpoint["completed"]["rankings"])
+        self.assertNotIn("2024-09-22", checkpoint["failed"]["rankings"])
+
+        # the partial date is retried along with the failed one
+        self.runs.clear()
+        self.partial_days.clear()
+        self._backfill()
+        self.assertEqual(
+            sorted(self.runs), [("rankings", "2024-09-15"), ("rankings", "2024-09-22")]
+        )
+
+    def test_stops_before_the_deadline(self):
+        result = self._backfill(context=_context(backfill.SAFETY_SECONDS - 1))
+        self.assertEqual(result["status"], "incomplete")
+        self.assertEqual(result["remaining"], 6)
+        self.assertEqual(self.runs, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
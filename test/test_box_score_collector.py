@@ -0,0 +1,217 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.data_clients.box_scores import box_score_cllector
+from src.data_collectors import box_score_data_collector
+from src.data_collectors.box_score_data_collector import (
+    BoxScoreDataCollector,
+    changed_games,
+    season_of,
+)
+from src.s3_io.s3_client import S3Client
+
+
+class _MemoryBoto:
+    """boto3 S3 client stand-in keeping objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        self.objects[key] = buffer.read()
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        buffer.write(self.objects[key])
+
+
+def _games(rows):
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "game_id",
+            "season",
+            "date",
+            "status_type_name",
+            "home_score",
+            "away_score",
+        ],
+    )
+
+
+class TestGameCollector(unittest.TestCase):
+    """Tests for the concurrent box score season fetch"""
+
+    def test_get_box_scores_fetches_every_year(self):
+        seasons = {
+            2023: _games([[1, 2023, "2023-09-10T17:00Z", "STATUS_FINAL", 20, 17]]),
+            2024: _games([[2, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 3, 10]]),
+            2025: pd.DataFrame(),
+        }
+        with patch(
+            "sportsdataverse.nfl.espn_nfl_schedule",
+            side_effect=lambda dates, return_as_pandas: seasons[dates],
+        ) as schedule:
+            df = box_score_cllector.GameCollector().get_box_scores([2023, 2024, 2025])
+
+        self.assertEqual(schedule.call_count, 3)
+        self.assertEqual(df["game_id"].tolist(), [1, 2])
+
+    def test_season_fetches_are_attributed_to_the_calling_collector(self):
+        instrumentation = box_score_cllector.instrumentation
+        instrumentation.reset()
+        self.addCleanup(instrumentation.reset)
+        with patch(
+            "sportsdataverse.nfl.espn_nfl_schedule",
+            return_value=_games(
+                [[1, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 20, 17]]
+            ),
+        ):
+            with instrumentation.collector("box_score_data_collector"):
+                box_score_cllector.GameCollector().get_box_scores([2023, 2024])
+
+        (entry,) = instrumentation.summary()
+        self.assertEqual(entry["collector"], "box_score_data_collector")
+        self.assertEqual((entry["stage"], entry["count"]), ("http_fetch", 2))
+
+    def test_get_dates_requests_one_date_range(self):
+        games = _games([[1, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 20, 17]])
+        with patch(
+            "sportsdataverse.nfl.espn_nfl_schedule", return_value=games
+        ) as schedule:
+            df = box_score_cllector.GameCollector().get_dates(
+                pd.Timestamp("2024-09-06"), pd.Timestamp("2024-09-16")
+            )
+
+        schedule.assert_called_once_with(
+            dates="20240906-20240916", return_as_pandas=True
+        )
+        self.assertEqual(df["game_id"].tolist(), [1])
+
+
+class TestBoxScoreDataCollector(unittest.TestCase):
+    """Tests for the incremental box score upsert"""
+
+    def setUp(self):
+        with patch.object(box_score_data_collector.s3_client, "S3Client"):
+            self.bsdc = BoxScoreDataCollector()
+        self.bsdc.gc = MagicMock()
+
+    def test_changed_games_compares_status_and_score(self):
+        df = _games(
+            [
+                [1, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 20, 17],
+                [2, 2024, "2024-09-08T20:25Z", "STATUS_IN_PROGRESS", 14, 7],
+                [3, 2024, "2024-09-09T00:20Z", "STATUS_SCHEDULED", 0, 0],
+            ]
+        )
+        state = {
+            "1": [2024, "STATUS_FINAL|20|17"],
+            "2": [2024, "STATUS_IN_PROGRESS|7|7"],
+        }
+        self.assertEqual(changed_games(df, state)["game_id"].tolist(), [2, 3])
+
+    def test_collect_upserts_only_changed_games(self):
+        self.bsdc.s3c.read_json_from_s3.return_value = {
+            "1": [2024, "STATUS_FINAL|20|17"]
+        }
+        self.bsdc.s3c.read_dataframe_from_s3.return_value = _games(
+            [
+                [1, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 20, 17],
+                [2, 2024, "2024-09-08T20:25Z", "STATUS_SCHEDULED", 0, 0],
+            ]
+        )
+        self.bsdc.gc.get_dates.return_value = _games(
+            [
+                [1, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 20, 17],
+                [2, 2024, "2024-09-08T20:25Z", "STATUS_FINAL", 24, 21],
+            ]
+        )
+
+        changed = self.bsdc.collect(pd.Timestamp("2024-09-09 08:00"))
+
+        self.assertEqual(changed["game_id"].tolist(), [2])
+        self.bsdc.gc.get_box_scores.assert_not_called()
+        self.bsdc.gc.get_dates.assert_called_once_with(
+            pd.Timestamp("2024-09-06 08:00"), pd.Timestamp("2024-09-16 08:00")
+        )
+        pushed = self.bsdc.s3c.push_dataframe_to_s3.call_args.kwargs
+        self.assertEqual(
+            pushed["s3_key"], "data/raw/box_scores/year=2024/month=09/data.parquet"
+        )
+        self.assertEqual(sorted(pushed["df"]["game_id"]), [1, 2])
+        self.assertEqual(pushed["df"].set_index("game_id").loc[2, "home_score"], 24)
+        state = self.bsdc.s3c.push_json_to_s3.call_args.args[0]
+        self.assertEqual(state["2"], [2024, "STATUS_FINAL|24|21"])
+
+    def test_collect_skips_years_that_are_final(self):
+        self.bsdc.s3c.read_json_from_s3.return_value = {
+            "1": [2022, "STATUS_FINAL|20|17"],
+            "2": [2023, "STATUS_SCHEDULED|0|0"],
+        }
+        self.bsdc.gc.get_box_scores.return_value = pd.DataFrame()
+
+        self.bsdc.collect(pd.Timestamp("2024-09-09"), years=[2022, 2023, 2024])
+
+        self.bsdc.gc.get_box_scores.assert_called_once_with([2023, 2024])
+
+    def test_playoff_games_belong_to_the_previous_season(self):
+        self.assertEqual(season_of(pd.Timestamp("2025-02-09")), 2024)
+        self.assertEqual(season_of(pd.Timestamp("2025-09-04")), 2025)
+        self.bsdc.s3c.read_json_from_s3.return_value = {
+            "1": [2023, "STATUS_FINAL|20|17"],
+            "2": [2024, "STATUS_FINAL|24|21"],
+        }
+        self.bsdc.gc.get_box_scores.return_value = pd.DataFrame()
+
+        self.bsdc.collect(pd.Timestamp("2025-01-12"), years=[2023, 2024])
+
+        self.bsdc.gc.get_box_scores.assert_called_once_with([2024])
+
+    def test_daily_run_during_the_playoffs_fetches_the_current_season(self):
+        self.assertEqual(
+            self.bsdc._years_to_fetch(pd.Timestamp("2025-01-12"), None, {}), [2024]
+        )
+        self.bsdc.s3c.read_json_from_s3.return_value = {}
+        self.bsdc.gc.get_dates.return_value = pd.DataFrame()
+
+        self.bsdc.collect(pd.Timestamp("2025-01-12"))
+
+        self.bsdc.gc.get_box_scores.assert_not_called()
+        start, end = self.bsdc.gc.get_dates.call_args.args
+        self.assertEqual(
+            (start.date(), end.date()),
+            (pd.Timestamp("2025-01-09").date(), pd.Timestamp("2025-01-19").date()),
+        )
+
+    def test_upsert_into_a_stored_month_keeps_timestamps(self):
+        self.bsdc.s3c = S3Client()
+        self.bsdc.s3c.s3_client = _MemoryBoto()
+        first = pd.Timestamp("2024-09-09 08:00", tz="US/Central")
+        games = _games(
+            [
+                [1, 2024, "2024-09-08T17:00Z", "STATUS_FINAL", 20, 17],
+                [2, 2024, "2024-09-08T20:25Z", "STATUS_IN_PROGRESS", 7, 7],
+            ]
+        )
+        self.bsdc._upsert(games.assign(timestamp=first))
+
+        second = pd.Timestamp("2024-09-09 09:00", tz="US/Central")
+        self.bsdc._upsert(
+            _games([[2, 2024, "2024-09-08T20:25Z", "STATUS_FINAL", 24, 21]]).assign(
+                timestamp=second
+            )
+        )
+
+        stored = self.bsdc.s3c.read_dataframe_from_s3(
+            "bucket", "data/raw/box_scores/year=2024/month=09/data.parquet"
+        )
+        self.assertEqual(stored["game_id"].tolist(), [1, 2])
+        self.assertEqual(
+            pd.to_datetime(stored["timestamp"], utc=True).tolist(), [first, second]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import io
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.odds_analytics.closing_lines import (
+    DATASET,
+    DERIVED_PREFIX,
+    ClosingLineEngine,
+    american_to_implied,
+    compute_lines,
+    grouped_median,
+)
+from src.s3_io import partitions
+from src.s3_io.s3_client import S3Client
+
+
+class _MemoryBoto:
+    """boto3 S3 client stand-in keeping objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        self.objects[key] = buffer.read()
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        buffer.write(self.objects[key])
+
+    def put_object(self, Body, Bucket, Key, ContentType=None):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def _snapshot(timestamp, book, home_point, home_price, away_price, game_id="g1"):
+    return [
+        {
+            "game_id": game_id,
+            "game_time": "2025-10-05T17:00:00Z",
+            "home_team": "Home",
+            "away_team": "Away",
+            "book": book,
+            "market": "spreads",
+            "outcome": outcome,
+            "price": price,
+            "point": point,
+            "timestamp": pd.Timestamp(timestamp),
+        }
+        for outcome, price, point in [
+            ("Home", home_price, home_point),
+            ("Away", away_price, -home_point),
+        ]
+    ]
+
+
+class TestClosingLines(unittest.TestCase):
+    """Tests for the vectorized opening/closing/consensus line engine"""
+
+    def test_american_to_implied(self):
+        np.testing.assert_allclose(
+            american_to_implied([-110, 100, 150, -200]),
+            [110 / 210, 0.5, 0.4, 200 / 300],
+        )
+
+    def test_grouped_median_ignores_nan(self):
+        codes = np.array([0, 0, 0, 1, 1, 2])
+        values = np.array([3.0, 1.0, 2.0, 4.0, 6.0, np.nan])
+        np.testing.assert_array_equal(
+            grouped_median(codes, values, 4), [2.0, 5.0, np.nan, np.nan]
+        )
+
+    def test_compute_lines_open_close_and_consensus(self):
+        rows = (
+            _snapshot("2025-10-01T12:00Z", "fanduel", -3.0, -110, -110)
+            + _snapshot("2025-10-01T13:00Z", "draftkings", -2.5, -110, -110)
+            + _snapshot("2025-10-01T14:00Z", "betmgm", -3.5, -110, -110)
+            + _snapshot("2025-10-05T16:00Z", "fanduel", -6.0, -120, 100)
+            + _snapshot("2025-10-05T16:30Z", "draftkings", -6.5, -120, 100)
+            # after kickoff, must be ignored
+            + _snapshot("2025-10-05T18:00Z", "fanduel", -20.0, -500, 400)
+        )
+        lines = compute_lines(pd.DataFrame(rows)).set_index("outcome")
+
+        self.assertEqual(lines.loc["Home", "n_books"], 3)
+        self.assertEqual(lines.loc["Home", "open_point"], -3.0)
+        # betmgm never moved, so its opening line is also its close
+        self.assertEqual(lines.loc["Home", "close_point"], -6.0)
+        self.assertEqual(lines.loc["Away", "close_point"], 6.0)
+        self.assertAlmostEqual(lines.loc["Home", "open_fair_prob"], 0.5, places=6)
+        self.assertGreater(lines.loc["Home", "close_fair_prob"], 0.5)
+        self.assertAlmostEqual(
+            lines.loc["Home", "close_fair_prob"] + lines.loc["Away", "close_fair_prob"],
+            1.0,
+            places=6,
+        )
+        self.assertEqual(
+            lines.loc["Home", "close_time"], pd.Timestamp("2025-10-05T16:30Z")
+        )
+        self.assertEqual(lines["open_price"].dtype, np.float32)
+
+
+RAW_KEY = partitions.partition_key("odds", 2025, 10)
+LINES_KEY = partitions.partition_key(DATASET, 2025, 10, prefix=DERIVED_PREFIX)
+
+
+class TestClosingLineEngine(unittest.TestCase):
+    """Tests for incremental updates of the derived closing lines dataset"""
+
+    def setUp(self):
+        self.s3c = S3Client()
+        self.s3c.s3_client = _MemoryBoto()
+        self.engine = ClosingLineEngine(self.s3c, "bucket")
+        self.rows = _snapshot("2025-10-01T12:00Z", "fanduel", -3.0, -110, -110)
+
+    def _collect(self, rows):
+        # stored like the odds collector stores it, timestamps as epoch ns
+        self.rows += rows
+        df = pd.DataFrame(self.rows)
+        df["game_time"] = pd.to_datetime(df["game_time"], utc=True)
+        self.s3c.push_dataframe_to_s3(df, "bucket", RAW_KEY)
+
+    def _stored(self):
+        return self.s3c.read_dataframe_from_s3("bucket", LINES_KEY)
+
+    def test_second_update_into_the_same_month(self):
+        self._collect(_snapshot("2025-10-01T13:00Z", "g2book", -2.5, -110, -110, "g2"))
+        self.engine.update(pd.Timestamp("2025-10-02T00:00Z"))
+        self._collect(_snapshot("2025-10-05T16:00Z", "fanduel", -6.0, -120, 100))
+
+        lines = self.engine.update(pd.Timestamp("2025-10-06T00:00Z"))
+
+        self.assertEqual(list(lines["game_id"].unique()), ["g1"])
+        stored = self._stored()
+        self.assertEqual(len(stored), 4)
+        stored = stored.set_index(["game_id", "outcome"])
+        self.assertEqual(stored.loc[("g1", "Home"), "close_point"], -6.0)
+        self.assertEqual(stored.loc[("g2", "Home"), "close_point"], -2.5)
+        state = json.loads(self.s3c.s3_client.objects["state/closing_lines.json"])
+        self.assertEqual(
+            pd.Timestamp(state["high_water_mark"]), pd.Timestamp("2025-10-05T16:00Z")
+        )
+
+    def test_opener_outside_the_lookback_is_kept(self):
+        engine = ClosingLineEngine(self.s3c, "bucket", lookback_days=2)
+        september = pd.DataFrame(
+            _snapshot("2025-09-20T12:00Z", "fanduel", -3.0, -110, -110)
+        )
+        september["game_time"] = pd.to_datetime(september["game_time"], utc=True)
+        self.s3c.push_dataframe_to_s3(
+            september, "bucket", partitions.partition_key("odds", 2025, 9)
+        )
+        self.rows = []
+        self._collect(_snapshot("2025-10-04T00:00Z", "fanduel", -4.0, -110, -110))
+        engine.update(
+            pd.Timestamp("2025-10-04T01:00Z"), start=pd.Timestamp("2025-09-01T00:00Z")
+        )
+        self._collect(_snapshot("2025-10-05T16:00Z", "fanduel", -6.0, -120, 100))
+
+        # reads October only, where the first snapshot is from October 4th
+        engine.update(pd.Timestamp("2025-10-06T00:00Z"))
+
+        stored = self._stored().set_index("outcome")
+        self.assertEqual(stored.loc["Home", "open_point"], -3.0)
+        self.assertEqual(
+            pd.to_datetime(stored.loc["Home", "open_time"], utc=True),
+            pd.Timestamp("2025-09-20T12:00Z"),
+        )
+        self.assertEqual(stored.loc["Home", "close_point"], -6.0)
+
+    def test_update_without_new_snapshots(self):
+        self._collect([])
+        self.engine.update(pd.Timestamp("2025-10-02T00:00Z"))
+        stored = self._stored()
+
+        lines = self.engine.update(pd.Timestamp("2025-10-03T00:00Z"))
+
+        self.assertTrue(lines.empty)
+        pd.testing.assert_frame_equal(self._stored(), stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.data_clients.team_rankings import team_rankings_scraper
+from src.data_collectors import team_rankings_data_collector
+from src.deadline import DEFAULT_BUDGET_SECONDS, Deadline
+
+
+class _Context:
+    def __init__(self, millis):
+        self.millis = millis
+
+    def get_remaining_time_in_millis(self):
+        return self.millis
+
+
+class TestDeadline(unittest.TestCase):
+    """Tests for invocation deadlines"""
+
+    def test_from_context_keeps_the_reserve_free(self):
+        deadline = Deadline.from_context(_Context(120_000), reserve_seconds=30)
+        self.assertAlmostEqual(deadline.remaining(), 90, delta=1)
+        self.assertTrue(deadline.fits(60))
+        self.assertFalse(deadline.fits(120))
+
+    def test_no_context_uses_the_default_budget(self):
+        deadline = Deadline.from_context(None)
+        self.assertAlmostEqual(deadline.remaining(), DEFAULT_BUDGET_SECONDS, delta=1)
+
+
+class TestPartialScrape(unittest.TestCase):
+    """Tests for stopping the team rankings scrape before the deadline"""
+
+    def setUp(self):
+        # skip __init__, which reads the url sheet relative to src/
+        self.trs = team_rankings_scraper.TeamRankingsScraper.__new__(
+            team_rankings_scraper.TeamRankingsScraper
+        )
+        self.trs.url_df = pd.DataFrame(
+            {
+                "category": ["rankings", "rankings", "offense"],
+                "table_name": ["predictive", "home", "points"],
+                "base_url": ["u1", "u2", "u3"],
+                "record_cols": ["", "", ""],
+            }
+        )
+        self.tables = []
+
+        def postprocess(df, record_cols, category, table_name):
+            self.tables.append(table_name)
+            return pd.DataFrame({"team": ["Dallas"], table_name: [1.0]})
+
+        patch.object(self.trs, "_get_table", return_value=None).start()
+        patch.object(self.trs, "_postprocess_df", side_effect=postprocess).start()
+        self.addCleanup(patch.stopall)
+
+    def test_stops_once_the_slowest_table_no_longer_fits(self):
+        deadline = Deadline(60)
+        with patch.object(deadline, "fits", side_effect=[True, False]):
+            df = self.trs.get_all_tables_for_date(
+                pd.Timestamp("2024-11-18"), deadline=deadline
+            )
+
+        self.assertEqual(self.tables, ["predictive"])
+        self.assertEqual(
+            self.trs.unfinished_tables, ["rankings_home", "offense_points"]
+        )
+        self.assertEqual(df["team"].tolist(), ["Dallas"])
+        self.assertIn("predictive", df.columns)
+
+    def test_expired_deadline_fetches_nothing(self):
+        df = self.trs.get_all_tables_for_date(
+            pd.Timestamp("2024-11-18"), deadline=Deadline(-1)
+        )
+
+        self.assertTrue(df.empty)
+        self.assertEqual(self.tables, [])
+        self.assertEqual(len(self.trs.unfinished_tables), 3)
+
+    def test_without_deadline_every_table_is_fetched(self):
+        self.trs.get_all_tables_for_date(pd.Timestamp("2024-11-18"))
+
+        self.assertEqual(self.tables, ["predictive", "home", "points"])
+        self.assertEqual(self.trs.unfinished_tables, [])
+
+
+class TestPartialSnapshot(unittest.TestCase):
+    """Tests for the team rankings collector's report of a partial snapshot"""
+
+    def setUp(self):
+        module = team_rankings_data_collector
+        with patch.object(module.team_rankings_scraper, "TeamRankingsScraper"):
+            self.trdc = module.TeamRankingsDataCollector(s3c=object())
+        patcher = patch.object(
+            module.upsert, "upsert_partition", return_value={"mode": "new"}
+        )
+        self.upsert = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _collect(self, df, unfinished):
+        self.trdc.trs.get_all_tables_for_date.return_value = df
+        self.trdc.trs.unfinished_tables = unfinished
+        return self.trdc.collect(pd.Timestamp("2024-11-18"), deadline=Deadline(120))
+
+    def test_unfinished_tables_make_the_snapshot_partial(self):
+        report = self._collect(
+            pd.DataFrame({"team": ["Dallas"], "date": ["2024-11-18"]}),
+            ["offense_points"],
+        )
+
+        self.assertEqual(report["status"], team_rankings_data_collector.PARTIAL)
+        self.assertEqual(report["unfinished_tables"], ["offense_points"])
+        self.upsert.assert_called_once()
+
+    def test_nothing_fetched_is_partial_and_writes_nothing(self):
+        report = self._collect(pd.DataFrame(), ["rankings_home"])
+
+        self.assertEqual(report["status"], team_rankings_data_collector.PARTIAL)
+        self.upsert.assert_not_called()
+
+    def test_every_table_fetched_is_complete(self):
+        report = self._collect(
+            pd.DataFrame({"team": ["Dallas"], "date": ["2024-11-18"]}), []
+        )
+
+        self.assertEqual(report["status"], team_rankings_data_collector.COMPLETE)
+
+
+if __name__ == "__main__":
+    unittest.main()
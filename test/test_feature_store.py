@@ -0,0 +1,200 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.feature_store import (
+    FEATURES_PREFIX,
+    MANIFEST_KEY,
+    MAX_MISSING_STATS,
+    SpreadFeatureStore,
+    feature_months,
+    source_months,
+)
+from src.features.matchup_matrix import MatchupMatrixBuilder
+from src.features.team_features import TeamFeatureEngine
+from src.s3_io import partitions
+
+
+class _MemoryS3:
+    """S3Client stand-in keeping frames and JSON in dicts, with ETags"""
+
+    def __init__(self):
+        self.objects = {}
+        self.versions = {}
+        self.reads = []
+
+    def _put(self, key, obj):
+        self.objects[key] = obj
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def push_dataframe_to_s3(self, df, bucket_name, s3_key):
+        self._put(s3_key, df.copy())
+
+    def read_dataframe_from_s3(self, bucket_name, s3_key, columns=None):
+        self.reads.append(s3_key)
+        df = self.objects.get(s3_key)
+        if df is None:
+            return None
+        return df[columns].copy() if columns else df.copy()
+
+    def push_json_to_s3(self, obj, bucket_name, s3_key):
+        self._put(s3_key, json.loads(json.dumps(obj)))
+
+    def read_json_from_s3(self, bucket_name, s3_key):
+        return self.objects.get(s3_key)
+
+    def list_etags(self, bucket_name, prefix):
+        return {
+            key: f'"{key}-{version}"'
+            for key, version in self.versions.items()
+            if key.startswith(prefix)
+        }
+
+
+def _odds(game_id, kickoff, home, away):
+    return pd.DataFrame(
+        {
+            "game_id": [game_id],
+            "game_time": [kickoff],
+            "home_team": [home],
+            "away_team": [away],
+            "book": ["draftkings"],
+        }
+    )
+
+
+def _rankings(date, ppg):
+    return pd.DataFrame(
+        {
+            "team": ["Buffalo", "Kansas City"],
+            "date": [date, date],
+            "timestamp": pd.Timestamp(f"{date} 06:00", tz="US/Central"),
+            "ppg_this_yr": ppg,
+        }
+    )
+
+
+class TestSourceMonths(unittest.TestCase):
+    """Tests for the raw partitions a feature month depends on"""
+
+    def test_decay_window_reaches_back_into_earlier_rankings(self):
+        sources = source_months(2024, 10, lookback_days=14)
+        self.assertEqual(sources["odds"], [(2024, 9), (2024, 10)])
+        # 16 weekly snapshots plus the as-of lookback
+        self.assertEqual(sources["team_rankings"][0], (2024, 5))
+        self.assertEqual(sources["team_rankings"][-1], (2024, 10))
+
+    def test_feature_months_include_the_month_after_odds(self):
+        self.assertEqual(
+            feature_months([(2024, 12), (2024, 9)]),
+            [(2024, 9), (2024, 10), (2024, 12), (2025, 1)],
+        )
+
+
+class TestSpreadFeatureStore(unittest.TestCase):
+    """Tests for incremental materialization of spread features"""
+
+    def setUp(self):
+        self.s3c = _MemoryS3()
+        self.store = SpreadFeatureStore(
+            self.s3c,
+            "bucket",
+            engine=TeamFeatureEngine(game_sample=2, decay_factor=0.5),
+            builder=MatchupMatrixBuilder(
+                ["home_ppg", "road_ppg", "ppg_matchup_differential"]
+            ),
+        )
+        self.s3c._put(
+            partitions.partition_key("odds", 2024, 9),
+            _odds(
+                "g1",
+                "2024-09-10T00:20:00Z",
+                "Kansas City Chiefs",
+                "Buffalo Bills",
+            ),
+        )
+        self.s3c._put(
+            partitions.partition_key("team_rankings", 2024, 9),
+            pd.concat(
+                [
+                    _rankings("2024-09-01", [20.0, 24.0]),
+                    _rankings("2024-09-08", [30.0, 27.0]),
+                ]
+            ),
+        )
+
+    def _features(self, year, month):
+        key = partitions.partition_key("spread", year, month, prefix=FEATURES_PREFIX)
+        return self.s3c.objects.get(key)
+
+    def test_refresh_builds_decayed_features_and_manifest(self):
+        rebuilt = self.store.refresh()
+        self.assertEqual(rebuilt, [(2024, 9), (2024, 10)])
+
+        df = self._features(2024, 9)
+        self.assertEqual(df["game_id"].tolist(), ["g1"])
+        # (0.5 * 24 + 27) / 1.5 and (0.5 * 20 + 30) / 1.5
+        np.testing.assert_allclose(df["home_ppg"], [26.0])
+        np.testing.assert_allclose(df["road_ppg"], [80.0 / 3], rtol=1e-6)
+        self.assertIsNone(self._features(2024, 10))
+
+        manifest = self.s3c.objects[MANIFEST_KEY]
+        sources = manifest["months"]["2024-09"]["sources"]
+        self.assertIn(partitions.partition_key("team_rankings", 2024, 9), sources)
+        self.assertEqual(manifest["months"]["2024-09"]["rows"], 1)
+        self.assertEqual(manifest["months"]["2024-10"]["rows"], 0)
+
+    def test_refresh_is_a_noop_without_new_data(self):
+        self.store.refresh()
+        self.s3c.reads.clear()
+        self.assertEqual(self.store.refresh(), [])
+        self.assertEqual(self.s3c.reads, [])
+
+    def test_new_rankings_rebuild_months_whose_window_reaches_them(self):
+        self.s3c._put(
+            partitions.partition_key("odds", 2024, 11),
+            _odds("g2", "2024-11-10T18:00:00Z", "Buffalo Bills", "Kansas City Chiefs"),
+        )
+        self.store.refresh()
+
+        # rewriting September's rankings changes every month whose decay
+        # window reads September, but not the months before it
+        self.s3c._put(
+            partitions.partition_key("team_rankings", 2024, 9),
+            _rankings("2024-09-08", [31.0, 28.0]),
+        )
+        self.assertEqual(
+            self.store.refresh(), [(2024, 9), (2024, 10), (2024, 11), (2024, 12)]
+        )
+
+        self.s3c._put(
+            partitions.partition_key("team_rankings", 2024, 12),
+            _rankings("2024-12-01", [10.0, 10.0]),
+        )
+        self.assertEqual(self.store.refresh(), [(2024, 12)])
+
+    def test_a_few_missing_stats_are_left_nan(self):
+        self.store.builder = MatchupMatrixBuilder(["home_ppg", "home_ypp"])
+        self.store.refresh()
+        df = self._features(2024, 9)
+        np.testing.assert_allclose(df["home_ppg"], [26.0])
+        self.assertTrue(df["home_ypp"].isna().all())
+
+    def test_too_many_missing_stats_fail_the_month(self):
+        missing = [f"home_stat_{i}" for i in range(MAX_MISSING_STATS + 1)]
+        self.store.builder = MatchupMatrixBuilder(["home_ppg"] + missing)
+        with self.assertRaises(ValueError):
+            self.store.refresh()
+        self.assertNotIn(MANIFEST_KEY, self.s3c.objects)
+
+    def test_read_filters_kickoffs(self):
+        self.store.refresh()
+        df = self.store.read("2024-09-01", "2024-09-30")
+        self.assertEqual(df["game_id"].tolist(), ["g1"])
+        self.assertTrue(self.store.read("2024-09-11", "2024-09-30").empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
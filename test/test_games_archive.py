@@ -0,0 +1,256 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.data_clients.games_archive import games_archive_parser
+from src.data_collectors import games_archive_importer
+from src.s3_io.s3_client import S3Client
+
+DOCS_PAGE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "docs", "Games Archive.html"
+)
+
+ARCHIVE_TABLE = """<html><body><div><table>
+<tr><th>Game</th><th>Kickoff</th><th>Season</th><th>Week</th><th>Score</th>
+<th>Over Under</th><th>Home Line</th></tr>
+<tr><td><b>KC</b> @ BAL</td><td>09/05/2024 8:20 PM</td><td>2024</td><td>1</td>
+<td>27-20</td><td>46.5</td><td>+3.0</td></tr>
+<tr><td>GB @ <b>PHI</b></td><td>09/06/2024 8:15 PM</td><td>2024</td><td>1</td>
+<td>29-34</td><td>48.5</td><td>-1.5</td></tr>
+</table></div></body></html>"""
+
+
+class _MemoryBoto:
+    """boto3 S3 client stand-in keeping objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        self.objects[key] = buffer.read()
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        buffer.write(self.objects[key])
+
+
+class TestGamesArchiveParser(unittest.TestCase):
+    """Tests for parsing saved games archive pages"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_html_table_rows_are_normalized(self):
+        games = games_archive_parser.parse_archive_file(
+            self._write("week1.html", ARCHIVE_TABLE)
+        )
+
+        self.assertEqual(len(games), 2)
+        first = games.iloc[0]
+        self.assertEqual(first["game_id"], "archive_20240905_KC_BAL")
+        self.assertEqual(first["home_team"], "Baltimore Ravens")
+        self.assertEqual(first["away_abbreviation"], "KC")
+        self.assertEqual((first["away_score"], first["home_score"]), (27, 20))
+        self.assertEqual(first["spread"], 3.0)
+        self.assertEqual(first["game_time"], pd.Timestamp("2024-09-06 00:20", tz="UTC"))
+
+    def test_json_feed_rows_are_normalized(self):
+        rows = [
+            {
+                "name": "Green Bay Packers @ Philadelphia Eagles",
+                "kickoff": "2024-09-06 20:15",
+                "season": "2024",
+                "week": "1",
+                "score": "29 - 34",
+                "game_over_under": '<span style="color:#1da561">48.5</span>',
+                "line": "-1.5",
+            }
+        ]
+        path = self._write("feed.json", json.dumps({"data": rows}))
+        games = games_archive_parser.parse_archive_file(path)
+
+        self.assertEqual(games.iloc[0]["game_id"], "archive_20240906_GB_PHI")
+        self.assertEqual(games.iloc[0]["total"], 48.5)
+
+    def test_historical_and_alternate_team_names_resolve(self):
+        rows = [
+            {
+                "name": f"{away} @ {home}",
+                "kickoff": "2015-09-13 13:00",
+                "score": "10 - 20",
+            }
+            for away, home in [
+                ("Oakland Raiders", "Washington Redskins"),
+                ("San Diego Chargers", "JAC"),
+                ("LA", "WSH"),
+                ("NY Giants", "Nowhere"),
+            ]
+        ]
+        games = games_archive_parser.parse_archive_file(
+            self._write("feed.json", json.dumps(rows))
+        )
+
+        self.assertEqual(
+            games["home_abbreviation"].tolist(), ["WAS", "JAX", "WAS", None]
+        )
+        self.assertEqual(
+            games["away_abbreviation"].tolist(), ["LV", "LAC", "LAR", "NYG"]
+        )
+        self.assertEqual(
+            games["home_team"].tolist(),
+            [
+                "Washington Commanders",
+                "Jacksonville Jaguars",
+                "Washington Commanders",
+                "Nowhere",
+            ],
+        )
+
+    def test_unrendered_page_has_no_games(self):
+        self.assertTrue(games_archive_parser.parse_archive_file(DOCS_PAGE).empty)
+
+    def test_odds_and_box_score_rows(self):
+        games = games_archive_parser.parse_archive_file(
+            self._write("week1.html", ARCHIVE_TABLE)
+        )
+        odds = games_archive_parser.to_odds_rows(games)
+        box_scores = games_archive_parser.to_box_score_rows(games)
+
+        self.assertEqual(len(odds), 8)
+        home_spread = odds[
+            (odds["game_id"] == "archive_20240905_KC_BAL")
+            & (odds["outcome"] == "Kansas City Chiefs")
+        ]
+        self.assertEqual(home_spread["point"].item(), -3.0)
+        self.assertTrue((odds["timestamp"] < pd.to_datetime(odds["game_time"])).all())
+        self.assertEqual(set(box_scores["status_type_name"]), {"STATUS_FINAL"})
+
+
+class TestGamesArchiveImporter(unittest.TestCase):
+    """Tests for writing parsed archive games into partitions"""
+
+    def test_import_skips_box_scores_already_collected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "week1.html"), "w") as f:
+                f.write(ARCHIVE_TABLE)
+            with patch.object(games_archive_importer.s3_client, "S3Client"):
+                importer = games_archive_importer.GamesArchiveImporter(max_workers=1)
+            espn_rows = pd.DataFrame(
+                {
+                    "game_id": ["401671789"],
+                    "date": ["2024-09-06T00:20Z"],
+                    "home_abbreviation": ["BAL"],
+                }
+            )
+            importer.s3c.read_dataframe_from_s3.side_effect = (
+                lambda bucket_name, s3_key: (
+                    espn_rows if "box_scores" in s3_key else None
+                )
+            )
+
+            result = importer.import_paths([tmp])
+
+        self.assertEqual(result, {"games": 2, "odds_rows": 8, "box_score_rows": 1})
+        pushed = {
+            call.kwargs["s3_key"]: call.kwargs["df"]
+            for call in importer.s3c.push_dataframe_to_s3.call_args_list
+        }
+        box_scores = pushed["data/raw/box_scores/year=2024/month=09/data.parquet"]
+        self.assertEqual(
+            box_scores["game_id"].tolist(), ["401671789", "archive_20240906_GB_PHI"]
+        )
+        self.assertIn("data/raw/odds/year=2024/month=09/data.parquet", pushed)
+
+    def test_import_matches_collected_box_scores_by_team_id(self):
+        rows = [
+            {
+                "name": "New York Giants @ Washington Commanders",
+                "kickoff": "2024-09-15 13:00",
+                "score": "18 - 21",
+            }
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "week2.json"), "w") as f:
+                json.dump(rows, f)
+            with patch.object(games_archive_importer.s3_client, "S3Client"):
+                importer = games_archive_importer.GamesArchiveImporter(max_workers=1)
+            # ESPN spells Washington "WSH", the registry "WAS"
+            espn_rows = pd.DataFrame(
+                {
+                    "game_id": ["401671700"],
+                    "date": ["2024-09-15T17:00Z"],
+                    "home_abbreviation": ["WSH"],
+                    "away_abbreviation": ["NYG"],
+                }
+            )
+            importer.s3c.read_dataframe_from_s3.side_effect = (
+                lambda bucket_name, s3_key: (
+                    espn_rows if "box_scores" in s3_key else None
+                )
+            )
+
+            result = importer.import_paths([tmp])
+
+        self.assertEqual(result["box_score_rows"], 0)
+        pushed_keys = [
+            call.kwargs["s3_key"]
+            for call in importer.s3c.push_dataframe_to_s3.call_args_list
+        ]
+        self.assertNotIn(
+            "data/raw/box_scores/year=2024/month=09/data.parquet", pushed_keys
+        )
+
+    def test_import_into_collected_odds_month(self):
+        odds_key = "data/raw/odds/year=2024/month=09/data.parquet"
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "week1.html"), "w") as f:
+                f.write(ARCHIVE_TABLE)
+            with patch.object(games_archive_importer.s3_client, "S3Client"):
+                importer = games_archive_importer.GamesArchiveImporter(max_workers=1)
+            importer.s3c = S3Client()
+            importer.s3c.s3_client = _MemoryBoto()
+            collected = pd.DataFrame(
+                {
+                    "game_id": ["abc123"],
+                    "game_time": ["2024-09-06T00:20:00Z"],
+                    "home_team": ["Baltimore Ravens"],
+                    "away_team": ["Kansas City Chiefs"],
+                    "book": ["fanduel"],
+                    "market": ["spreads"],
+                    "outcome": ["Baltimore Ravens"],
+                    "price": [-110.0],
+                    "point": [3.0],
+                    "timestamp": [pd.Timestamp("2024-09-05 10:00", tz="US/Central")],
+                }
+            )
+            importer.s3c.push_dataframe_to_s3(collected, "", odds_key)
+
+            importer.import_paths([tmp])
+
+        stored = importer.s3c.read_dataframe_from_s3("", odds_key)
+        self.assertEqual(len(stored), 9)
+        timestamps = pd.to_datetime(stored["timestamp"], utc=True)
+        self.assertFalse(timestamps.isna().any())
+        self.assertEqual(timestamps.iloc[0], pd.Timestamp("2024-09-05 15:00", tz="UTC"))
+        archive = stored["book"] == games_archive_parser.ARCHIVE_BOOK
+        self.assertTrue(
+            (
+                timestamps[archive]
+                == pd.to_datetime(stored.loc[archive, "game_time"], utc=True)
+                - games_archive_parser.CLOSING_OFFSET
+            ).all()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
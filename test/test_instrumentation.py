@@ -0,0 +1,112 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src import instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests for per-stage timing and the EMF record"""
+
+    def setUp(self):
+        instrumentation.reset()
+        self.addCleanup(instrumentation.reset)
+
+    def test_stage_records_duration_and_size(self):
+        df = pd.DataFrame({"team": ["Dallas", "Detroit"], "rating": [1.0, 2.0]})
+        with instrumentation.stage("http_fetch") as stage:
+            stage.record(nbytes=2048)
+        with instrumentation.stage("parse") as stage:
+            stage.record(df=df)
+        with instrumentation.stage("parse") as stage:
+            stage.record(df=df.iloc[:1])
+
+        entries = {e["stage"]: e for e in instrumentation.summary()}
+        self.assertEqual(entries["http_fetch"]["bytes"], 2048)
+        self.assertEqual(entries["parse"]["count"], 2)
+        self.assertEqual(entries["parse"]["rows"], 3)
+        self.assertEqual(entries["parse"]["columns"], 2)
+        self.assertEqual(entries["parse"]["collector"], instrumentation.UNATTRIBUTED)
+        self.assertGreaterEqual(entries["parse"]["seconds"], 0)
+
+    def test_failed_stage_is_still_recorded(self):
+        with self.assertRaises(ValueError):
+            with instrumentation.stage("s3_read"):
+                raise ValueError("no such key")
+
+        self.assertEqual(instrumentation.summary()[0]["count"], 1)
+
+    def test_timed_records_returned_frame(self):
+        @instrumentation.timed("postprocess")
+        def postprocess(n):
+            return pd.DataFrame({"a": range(n), "b": range(n), "c": range(n)})
+
+        self.assertEqual(len(postprocess(5)), 5)
+
+        (entry,) = instrumentation.summary()
+        self.assertEqual(
+            (entry["stage"], entry["rows"], entry["columns"]), ("postprocess", 5, 3)
+        )
+
+    def test_stages_are_attributed_to_the_thread_collector(self):
+        def run(name):
+            with instrumentation.collector(name):
+                with instrumentation.stage("merge"):
+                    pass
+
+        threads = [
+            threading.Thread(target=run, args=(n,)) for n in ("odds", "rankings")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        collectors = [e["collector"] for e in instrumentation.summary()]
+        self.assertEqual(collectors, ["odds", "rankings"])
+        self.assertEqual(
+            instrumentation.current_collector(), instrumentation.UNATTRIBUTED
+        )
+
+    def test_propagate_carries_the_collector_into_worker_threads(self):
+        def fetch():
+            with instrumentation.stage("http_fetch"):
+                pass
+
+        with instrumentation.collector("weather"):
+            threads = [
+                threading.Thread(target=fetch),
+                threading.Thread(target=instrumentation.propagate(fetch)),
+            ]
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+        collectors = [e["collector"] for e in instrumentation.summary()]
+        self.assertEqual(collectors, [instrumentation.UNATTRIBUTED, "weather"])
+
+    def test_emf_record_sums_stages_over_collectors(self):
+        for name, nbytes in (("odds", 100), ("rankings", 50)):
+            with instrumentation.collector(name):
+                with instrumentation.stage("s3_write") as stage:
+                    stage.record(nbytes=nbytes)
+
+        with patch("sys.stdout.write") as write:
+            record = instrumentation.emit({"mode": "daily"})
+
+        (line,) = write.call_args[0]
+        self.assertEqual(json.loads(line)["s3_write_bytes"], 150)
+        (directive,) = record["_aws"]["CloudWatchMetrics"]
+        self.assertEqual(directive["Namespace"], instrumentation.NAMESPACE)
+        self.assertEqual(directive["Dimensions"], [["mode"]])
+        names = {metric["Name"] for metric in directive["Metrics"]}
+        self.assertEqual(names, {"s3_write_seconds", "s3_write_rows", "s3_write_bytes"})
+        self.assertEqual(record["mode"], "daily")
+        self.assertEqual(len(record["stages"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
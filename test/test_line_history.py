@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.odds_analytics.line_history import LineHistory
+
+
+def _odds_rows():
+    rows = []
+    snapshots = pd.to_datetime(
+        ["2025-10-01T12:00Z", "2025-10-03T12:00Z", "2025-10-05T16:00Z"]
+    )
+    for game_id, game_time in [
+        ("g1", "2025-10-05T17:00:00Z"),
+        ("g2", "2025-10-06T00:20:00Z"),
+    ]:
+        for book in ["fanduel", "draftkings"]:
+            for i, ts in enumerate(snapshots):
+                for outcome, point in [("Home", -3.0 - i), ("Away", 3.0 + i)]:
+                    rows.append(
+                        {
+                            "game_id": game_id,
+                            "game_time": game_time,
+                            "book": book,
+                            "market": "spreads",
+                            "outcome": outcome,
+                            "price": -110 - i,
+                            "point": point,
+                            "timestamp": ts,
+                        }
+                    )
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=0)
+
+
+class TestLineHistory(unittest.TestCase):
+    """Tests for as-of lookups on the indexed line history"""
+
+    def setUp(self):
+        self.lh = LineHistory(_odds_rows())
+
+    def test_asof_picks_latest_snapshot_at_or_before_time(self):
+        queries = pd.DataFrame(
+            {
+                "game_id": ["g1", "g1", "g1", "g2"],
+                "book": ["fanduel"] * 4,
+                "market": ["spreads"] * 4,
+                "outcome": ["Home"] * 4,
+                "as_of": pd.to_datetime(
+                    [
+                        "2025-09-30T00:00Z",
+                        "2025-10-01T12:00Z",
+                        "2025-10-04T00:00Z",
+                        "2025-10-10T00:00Z",
+                    ]
+                ),
+            }
+        )
+        result = self.lh.asof(queries)
+        self.assertTrue(np.isnan(result.loc[0, "point"]))
+        self.assertTrue(pd.isna(result.loc[0, "snapshot_time"]))
+        np.testing.assert_array_equal(
+            result["point"].to_numpy()[1:], [-3.0, -4.0, -5.0]
+        )
+
+        strict = self.lh.asof(queries, strict=True)
+        self.assertTrue(np.isnan(strict.loc[1, "point"]))
+
+    def test_missing_key_columns_are_wildcards(self):
+        queries = pd.DataFrame(
+            {"game_id": ["g2"], "as_of": pd.to_datetime(["2025-10-04T00:00Z"])}
+        )
+        result = self.lh.asof(queries)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(set(result["book"]), {"fanduel", "draftkings"})
+
+    def test_unknown_game_returns_nan(self):
+        queries = pd.DataFrame(
+            {
+                "game_id": ["missing"],
+                "book": ["fanduel"],
+                "as_of": pd.to_datetime(["2025-10-04T00:00Z"]),
+            }
+        )
+        result = self.lh.asof(queries)
+        self.assertEqual(len(result), 1)
+        self.assertTrue(np.isnan(result.loc[0, "price"]))
+
+    def test_opening_and_closing_lines(self):
+        queries = pd.DataFrame({"game_id": ["g1"], "outcome": ["Home"]})
+        opening = self.lh.opening(queries)
+        closing = self.lh.closing(queries)
+        self.assertTrue((opening["point"] == -3.0).all())
+        self.assertTrue((closing["point"] == -5.0).all())
+
+        hour_before = self.lh.before_kickoff(queries, offset=pd.Timedelta(hours=2))
+        self.assertTrue((hour_before["point"] == -4.0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
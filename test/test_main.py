@@ -1,9 +1,177 @@
+import os
+import subprocess
+import sys
+import threading
 import unittest
+from unittest.mock import Mock, patch
 
+from src import main
 from src.main import handler
 
 
 class TestHandler(unittest.TestCase):
-    def test_handler(_):
-        val = handler({"message": "!dlroW olleH"}, None)
-        assert val == {"message": "!dlroW olleH", "configVar": "Hello World!"}
+    def test_handler(self):
+        val = handler({"date": "2024-11-18"}, None)
+        self.assertEqual(
+            set(val), {"date", "status", "failed", "results", "s3_client", "stages"}
+        )
+        self.assertEqual(val["date"], "2024-11-18T00:00:00-06:00")
+        self.assertEqual(val["status"], "ok")
+        self.assertEqual((val["failed"], val["results"], val["stages"]), ([], [], []))
+        self.assertEqual(set(val["s3_client"]), {"created", "reused"})
+
+
+class _BarrierCollector:
+    """collector that only finishes once another one runs at the same time"""
+
+    barrier = None
+    clients = []
+
+    def __init__(self, s3c=None):
+        self.s3c = s3c
+
+    def collect(self, datetime, **options):
+        _BarrierCollector.clients.append(self.s3c)
+        _BarrierCollector.barrier.wait()
+
+
+class _OkCollector:
+    calls = []
+
+    def __init__(self, s3c=None):
+        pass
+
+    def collect(self, datetime, **options):
+        _OkCollector.calls.append(options)
+
+
+class _DeadlineCollector:
+    def __init__(self, s3c=None):
+        pass
+
+    def collect(self, datetime, deadline=None):
+        return {"remaining": deadline.remaining()}
+
+
+class _StagedCollector:
+    def __init__(self, s3c=None):
+        pass
+
+    def collect(self, datetime):
+        with main.instrumentation.stage("http_fetch") as stage:
+            stage.record(nbytes=512)
+
+
+class _BrokenCollector:
+    def __init__(self, s3c=None):
+        pass
+
+    def collect(self, datetime):
+        raise RuntimeError("scraper timed out")
+
+
+def _path(cls):
+    return f"{__name__}:{cls.__name__}"
+
+
+class TestConcurrentHandler(unittest.TestCase):
+    """Tests for running collectors concurrently with isolated failures"""
+
+    def setUp(self):
+        patcher = patch("s3_io.s3_client.S3Client")
+        self.S3Client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_collectors_overlap_and_share_one_client(self):
+        _BarrierCollector.barrier = threading.Barrier(2, timeout=5)
+        _BarrierCollector.clients = []
+        collectors = {"a": _path(_BarrierCollector), "b": _path(_BarrierCollector)}
+        with patch.dict(main.collector_map, collectors):
+            result = handler({"collectors_to_run": ["a", "b"]}, None)
+
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual([r["status"] for r in result["results"]], ["ok", "ok"])
+        self.S3Client.assert_called_once()
+        clients = _BarrierCollector.clients
+        self.assertIs(clients[0], clients[1])
+
+    def test_failure_is_isolated_and_reported(self):
+        _OkCollector.calls = []
+        collectors = {
+            "odds": _path(_OkCollector),
+            "rankings": _path(_BrokenCollector),
+            "missing": "data_collectors.no_such_collector:NoSuchCollector",
+        }
+        with patch.dict(main.collector_map, collectors):
+            result = handler(
+                {
+                    "collectors_to_run": ["odds", "rankings", "missing", "nope"],
+                    "collector_options": {"odds": {"adaptive": True}},
+                    "date": "2024-11-18",
+                },
+                None,
+            )
+
+        self.assertEqual(_OkCollector.calls, [{"adaptive": True}])
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["failed"], ["rankings", "missing"])
+        statuses = {r["collector"]: r for r in result["results"]}
+        self.assertEqual(statuses["odds"]["status"], "ok")
+        self.assertIn("scraper timed out", statuses["rankings"]["error"])
+        self.assertIn("ModuleNotFoundError", statuses["missing"]["error"])
+        self.assertGreaterEqual(statuses["rankings"]["duration_seconds"], 0)
+        self.assertEqual(statuses["nope"]["status"], "unknown")
+
+    def test_deadline_reaches_collectors_that_take_one(self):
+        _OkCollector.calls = []
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 120_000
+        collectors = {
+            "odds": _path(_OkCollector),
+            "rankings": _path(_DeadlineCollector),
+        }
+        with patch.dict(main.collector_map, collectors):
+            result = handler({"collectors_to_run": ["odds", "rankings"]}, context)
+
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(_OkCollector.calls, [{}])
+        report = result["results"][1]["report"]
+        self.assertLessEqual(report["remaining"], 120 - main.RESERVE_SECONDS)
+        self.assertNotIn("report", result["results"][0])
+
+    def test_stages_are_reported_per_collector(self):
+        collectors = {"odds": _path(_StagedCollector)}
+        with patch.dict(main.collector_map, collectors):
+            result = handler({"collectors_to_run": ["odds"]}, None)
+
+        (entry,) = result["stages"]
+        self.assertEqual(entry["collector"], "odds")
+        self.assertEqual((entry["stage"], entry["bytes"]), ("http_fetch", 512))
+
+
+class TestLazyCollectors(unittest.TestCase):
+    """Tests for collectors registered by import path"""
+
+    def test_every_registered_collector_resolves(self):
+        for collector in main.collector_map:
+            cls = main.load_collector(collector)
+            self.assertTrue(hasattr(cls, "collect"), collector)
+
+    def test_importing_main_loads_no_collector(self):
+        code = (
+            "import sys, main; "
+            "print(any(m.split('.')[0] in "
+            "('data_collectors', 's3_io', 'pandas', 'boto3') for m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.join(os.path.dirname(__file__), "..", "src"),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
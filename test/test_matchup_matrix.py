@@ -0,0 +1,127 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src import config
+from src.data_clients.team_rankings.team_rankings_scraper import TeamRankingsScraper
+from src.features.matchup_matrix import MatchupMatrixBuilder
+
+COLUMNS = [
+    "home_offense_ypp",
+    "road_defense_ypp",
+    "offense_ypp_matchup_differential",
+    "travel_delta",
+    "road_offense_ypp",
+    "home_rankings_predictive_rating",
+]
+
+TEAMS = ["Buffalo (11-3)", "Kansas City (13-1)", "Detroit (12-2)"]
+
+
+def _stat_table(this_yr, last_yr):
+    # as read from a stat page, before postprocessing
+    return pd.DataFrame(
+        {
+            "Rank": [1, 2, 3],
+            "Team": TEAMS,
+            "2024": this_yr,
+            "Last 3": [7.0, 7.0, 7.0],
+            "Last 1": [8.0, 8.0, 8.0],
+            "Home": [9.0, 9.0, 9.0],
+            "Away": [3.0, 3.0, 3.0],
+            "2023": last_yr,
+        }
+    )
+
+
+def _snapshots():
+    """one snapshot in the scraper's column names"""
+    scraper = TeamRankingsScraper.__new__(TeamRankingsScraper)
+    ratings = pd.DataFrame(
+        {
+            "Rank": [1, 2, 3],
+            "Team": TEAMS,
+            "Rating": [7.5, 6.0, 8.0],
+            "v 1-5": ["2-1", "3-0", "1-1"],
+        }
+    )
+    tables = [
+        scraper._postprocess_df(
+            _stat_table([6.0, 5.5, 6.5], [1.0, 1.0, 1.0]), [], "offense", "ypp"
+        ),
+        scraper._postprocess_df(
+            _stat_table([5.0, 4.5, 5.2], [2.0, 2.0, 2.0]), [], "defense", "ypp"
+        ),
+        scraper._postprocess_df(ratings, ["v 1-5"], "rankings", "predictive"),
+    ]
+    snapshots = tables[0]
+    for table in tables[1:]:
+        snapshots = snapshots.merge(table, how="left", on="team")
+    return snapshots
+
+
+class TestMatchupMatrixBuilder(unittest.TestCase):
+    """Tests for the spread model feature matrix"""
+
+    def setUp(self):
+        self.snapshots = _snapshots()
+        self.games = pd.DataFrame(
+            {
+                "home_team": ["Kansas City", "Detroit", "Chicago"],
+                "away_team": ["Buffalo", "Kansas City", "Detroit"],
+                "travel_delta": [850.0, 640.0, 280.0],
+            }
+        )
+
+    def test_gathers_sides_and_differentials(self):
+        matrix = MatchupMatrixBuilder(COLUMNS).build(self.games, self.snapshots)
+
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertTrue(matrix.flags["C_CONTIGUOUS"])
+        np.testing.assert_allclose(matrix[0], [5.5, 5.0, -0.5, 850.0, 6.0, 6.0])
+        np.testing.assert_allclose(matrix[1], [6.5, 4.5, 1.0, 640.0, 5.5, 8.0])
+        # unknown home team
+        self.assertTrue(np.isnan(matrix[2, [0, 2, 5]]).all())
+        self.assertEqual(matrix[2, 4], 6.5)
+
+    def test_explicit_rows_and_frame(self):
+        frame = MatchupMatrixBuilder(COLUMNS).build_frame(
+            self.games.iloc[:1],
+            self.snapshots,
+            home_rows=np.array([2]),
+            road_rows=np.array([0]),
+        )
+        self.assertEqual(list(frame.columns), COLUMNS)
+        self.assertEqual(frame["offense_ypp_matchup_differential"].iloc[0], 0.5)
+
+    def test_explicit_stat_columns(self):
+        builder = MatchupMatrixBuilder(
+            ["home_ypp"], stat_columns={"ypp": "offense_ypp_last_yr"}
+        )
+        matrix = builder.build(self.games, self.snapshots)
+        np.testing.assert_allclose(matrix[:2, 0], [1.0, 1.0])
+
+    def test_missing_stats_raise(self):
+        builder = MatchupMatrixBuilder(COLUMNS + ["home_special_teams_fg_pcnt"])
+        with self.assertRaises(ValueError):
+            builder.build(self.games, self.snapshots)
+
+    def test_config_columns_compile(self):
+        builder = MatchupMatrixBuilder()
+        planned = sum(len(plan) for plan in builder.plans.values())
+        self.assertEqual(
+            planned + len(builder.travel_positions),
+            len(config.SPREAD_MODEL_TRAINING_COLUMNS),
+        )
+        self.assertIn("def_turnovers_fumbles", builder.stats)
+        self.assertEqual(
+            builder.stat_columns["defense_passing_ypa"], "defense_passing_ypa_this_yr"
+        )
+        self.assertEqual(
+            builder.stat_columns["rankings_home_rating"], "rankings_home_rating"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
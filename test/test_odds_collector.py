@@ -4,6 +4,31 @@ import pandas as pd
 import re
 
 from src.data_clients.odds import get_odds
+from src.data_collectors.odds_data_collector import LATEST_KEY, OddsDataCollector
+from src.s3_io.s3_client import S3Client
+
+
+class _MemoryBoto:
+    """boto3 S3 client stand-in keeping objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        self.objects[key] = buffer.read()
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        buffer.write(self.objects[key])
+
+
+def _lines(game_id, game_time, timestamp):
+    return pd.DataFrame({
+        'game_id': [game_id],
+        'game_time': [game_time],
+        'book': ['fanduel'],
+        'price': [-110],
+        'timestamp': [timestamp],
+    })
 
 
 class TestOddsCollector(unittest.TestCase):
@@ -181,6 +206,84 @@ class TestOddsCollector(unittest.TestCase):
             self.assertTrue({'Over', 'Under'}.issubset(outcomes),
                           "Totals market should have both Over and Under outcomes")
 
+    def test_commence_time_window_adds_params(self):
+        """Windowed fetches pass the commence time window to every request"""
+        with patch('src.data_clients.odds.get_odds.requests.request') as mock_request:
+            mock_response = MagicMock()
+            mock_response.json.return_value = [{
+                "id": "test",
+                "commence_time": "2025-10-30T20:00:00Z",
+                "home_team": "Team A",
+                "away_team": "Team B",
+                "bookmakers": []
+            }]
+            mock_response.headers.get.return_value = "0"
+            mock_request.return_value = mock_response
+
+            df = get_odds.get_upcoming_nfl_odds(
+                commence_time_from=pd.Timestamp("2025-10-30T12:00", tz="US/Central"),
+                commence_time_to=pd.Timestamp("2025-10-31T12:00", tz="US/Central"),
+            )
+
+            urls = [call_args[0][1] for call_args in mock_request.call_args_list]
+            self.assertEqual(len(urls), 3, "Should ask events, then us and us2 odds")
+            self.assertIn("/events/", urls[0])
+            for url in urls:
+                self.assertIn("commenceTimeFrom=2025-10-30T17:00:00Z", url)
+                self.assertIn("commenceTimeTo=2025-10-31T17:00:00Z", url)
+            self.assertTrue(df.empty)
+            self.assertIn("game_id", df.columns)
+
+    def test_empty_commence_time_window_skips_odds_requests(self):
+        """No quota is spent when no game starts inside the window"""
+        with patch('src.data_clients.odds.get_odds.requests.request') as mock_request:
+            mock_response = MagicMock()
+            mock_response.json.return_value = []
+            mock_response.headers = {"X-Requests-Used": "100"}
+            mock_request.return_value = mock_response
+            # a full sweep first leaves quota usage behind
+            get_odds.get_upcoming_nfl_odds()
+            mock_request.reset_mock()
+
+            df = get_odds.get_upcoming_nfl_odds(
+                commence_time_from=pd.Timestamp("2025-10-30T12:00Z"),
+                commence_time_to=pd.Timestamp("2025-10-30T18:00Z"),
+            )
+
+            self.assertEqual(mock_request.call_count, 1)
+            self.assertIn("/events/", mock_request.call_args[0][1])
+            self.assertTrue(df.empty)
+            self.assertEqual(get_odds.get_quota_usage(), {})
+
+
+class TestMergeLatest(unittest.TestCase):
+    """Tests for merging window runs into the latest lines"""
+
+    def test_carried_over_games_keep_their_times(self):
+        s3c = S3Client()
+        s3c.s3_client = _MemoryBoto()
+        collector = OddsDataCollector(s3c=s3c)
+        first = pd.Timestamp('2024-11-17 08:00', tz='US/Central')
+        collector._merge_latest(
+            pd.concat([
+                _lines('g1', '2024-11-17T18:00:00Z', first),
+                _lines('g2', '2024-11-18T01:20:00Z', first),
+            ], ignore_index=True),
+            first,
+            full_sweep=True,
+        )
+
+        second = pd.Timestamp('2024-11-17 09:00', tz='US/Central')
+        latest = collector._merge_latest(
+            _lines('g1', '2024-11-17T18:00:00Z', second), second, full_sweep=False
+        )
+
+        self.assertEqual(latest['game_id'].tolist(), ['g2', 'g1'])
+        self.assertFalse(latest[['game_time', 'timestamp']].isna().any().any())
+        self.assertEqual(latest['timestamp'].tolist(), [first, second])
+        stored = s3c.read_dataframe_from_s3('bucket', LATEST_KEY)
+        self.assertEqual(len(stored), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
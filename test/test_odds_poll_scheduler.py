@@ -0,0 +1,134 @@
+import math
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from src.data_collectors.odds_poll_scheduler import (
+    MIN_POLL_INTERVAL_HOURS,
+    OddsPollScheduler,
+    line_movement,
+)
+
+
+def _snapshot(game_time, point):
+    return pd.DataFrame(
+        {
+            "game_id": ["g1", "g1"],
+            "game_time": [game_time, game_time],
+            "book": ["fanduel", "draftkings"],
+            "market": ["spreads", "spreads"],
+            "outcome": ["Team A", "Team A"],
+            "price": [-110, -110],
+            "point": [point, point],
+        }
+    )
+
+
+class TestOddsPollScheduler(unittest.TestCase):
+    """Tests for the quota-aware odds polling decisions"""
+
+    def _scheduler(self, state=None):
+        s3c = Mock()
+        s3c.read_json_from_s3.return_value = state
+        return OddsPollScheduler(s3c, "test-bucket")
+
+    def test_first_invocation_polls(self):
+        scheduler = self._scheduler()
+        should_poll, _ = scheduler.should_poll(pd.Timestamp("2025-10-01T12:00Z"))
+        self.assertTrue(should_poll)
+
+    def test_interval_shrinks_towards_kickoff(self):
+        now = pd.Timestamp("2025-10-01T12:00Z")
+        far = self._scheduler({"game_times": ["2025-10-05T17:00:00+00:00"]})
+        near = self._scheduler({"game_times": ["2025-10-01T14:00:00+00:00"]})
+        self.assertLess(near.poll_interval_hours(now), far.poll_interval_hours(now))
+        self.assertGreaterEqual(near.poll_interval_hours(now), MIN_POLL_INTERVAL_HOURS)
+
+    def test_low_quota_stretches_interval(self):
+        now = pd.Timestamp("2025-10-01T12:00Z")
+        game_times = ["2025-10-01T14:00:00+00:00"]
+        plenty = self._scheduler(
+            {
+                "game_times": game_times,
+                "quota_month": "2025-10",
+                "requests_remaining": 500,
+            }
+        )
+        scarce = self._scheduler(
+            {
+                "game_times": game_times,
+                "quota_month": "2025-10",
+                "requests_remaining": 30,
+            }
+        )
+        exhausted = self._scheduler(
+            {
+                "game_times": game_times,
+                "quota_month": "2025-10",
+                "requests_remaining": 2,
+            }
+        )
+        self.assertGreater(
+            scarce.poll_interval_hours(now), plenty.poll_interval_hours(now)
+        )
+        self.assertTrue(math.isinf(exhausted.poll_interval_hours(now)))
+        self.assertFalse(exhausted.should_poll(now)[0])
+
+    def test_skips_until_interval_elapsed(self):
+        scheduler = self._scheduler(
+            {
+                "game_times": ["2025-10-05T17:00:00+00:00"],
+                "last_poll": "2025-10-01T11:00:00+00:00",
+            }
+        )
+        self.assertFalse(scheduler.should_poll(pd.Timestamp("2025-10-01T12:00Z"))[0])
+        self.assertTrue(scheduler.should_poll(pd.Timestamp("2025-10-02T12:00Z"))[0])
+
+    def test_record_poll_tracks_volatility_and_quota(self):
+        scheduler = self._scheduler()
+        game_time = "2025-10-05T17:00:00Z"
+        scheduler.record_poll(
+            pd.Timestamp("2025-10-01T12:00Z"),
+            _snapshot(game_time, -3.0),
+            {"requests_used": 100, "requests_remaining": 400},
+        )
+        scheduler.record_poll(
+            pd.Timestamp("2025-10-01T13:00Z"),
+            _snapshot(game_time, -4.5),
+            {"requests_used": 106, "requests_remaining": 394},
+        )
+        state = scheduler.state
+        self.assertGreater(state["volatility"], 0)
+        self.assertEqual(state["poll_cost"], 6)
+        self.assertEqual(state["last_poll_cost"], 6)
+        self.assertEqual(state["requests_remaining"], 394)
+        self.assertEqual(len(state["game_times"]), 1)
+        self.assertEqual(scheduler.s3c.push_json_to_s3.call_count, 2)
+
+    def test_poll_without_odds_requests_costs_nothing(self):
+        scheduler = self._scheduler(
+            {
+                "quota_month": "2025-10",
+                "requests_used": 100,
+                "requests_remaining": 400,
+                "poll_cost": 6,
+            }
+        )
+        scheduler.record_poll(pd.Timestamp("2025-10-01T12:00Z"), pd.DataFrame(), {})
+
+        state = scheduler.state
+        self.assertEqual(state["last_poll_cost"], 0)
+        self.assertEqual(state["poll_cost"], 6)
+        self.assertEqual(state["requests_used"], 100)
+        self.assertEqual(state["requests_remaining"], 400)
+
+    def test_line_movement(self):
+        previous = {"g1|spreads|A": [-110.0, -3.0]}
+        current = {"g1|spreads|A": [-120.0, -3.5], "g2|totals|Over": [-110.0, 44.5]}
+        self.assertAlmostEqual(line_movement(previous, current), 0.6)
+        self.assertEqual(line_movement({}, current), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from src.features.point_in_time import RankingsAsOfJoin, asof_rows, games_from_odds
+
+
+def _snapshots():
+    return pd.DataFrame(
+        {
+            "team": ["Buffalo", "Kansas City", "Kansas City", "Buffalo"],
+            "date": ["2024-09-01", "2024-09-01", "2024-09-08", "2024-09-08"],
+            "timestamp": pd.to_datetime(
+                [
+                    "2024-09-01 06:00",
+                    "2024-09-01 06:00",
+                    "2024-09-08 06:00",
+                    "2024-09-08 13:00",
+                ]
+            ).tz_localize("US/Central"),
+            "ppg": [20.0, 25.0, 27.0, 31.0],
+        }
+    )
+
+
+class TestAsOfRows(unittest.TestCase):
+    """Tests for the strictly-before searchsorted lookup"""
+
+    def test_latest_strictly_before(self):
+        seconds = np.array([10, 20, 30, 15])
+        rows = asof_rows(
+            ["a", "a", "a", "b"],
+            seconds,
+            ["a", "a", "a", "b", "b", "c"],
+            np.array([20, 21, 5, 100, 15, 50]),
+        )
+        np.testing.assert_array_equal(rows, [0, 1, -1, 3, -1, -1])
+
+    def test_max_age(self):
+        rows = asof_rows(["a"], np.array([10]), ["a", "a"], np.array([15, 50]), 10)
+        np.testing.assert_array_equal(rows, [0, -1])
+
+
+class TestRankingsAsOfJoin(unittest.TestCase):
+    """Tests for joining rankings snapshots to games"""
+
+    def setUp(self):
+        self.s3c = MagicMock()
+        self.join = RankingsAsOfJoin(self.s3c, "bucket")
+        self.games = pd.DataFrame(
+            {
+                "home_team": ["Kansas City", "Buffalo"],
+                "away_team": ["Buffalo", "Kansas City"],
+                # second game kicks off at noon, before Buffalo's 13:00 scrape
+                "game_time": pd.to_datetime(
+                    ["2024-09-05 19:20", "2024-09-08 12:00"]
+                ).tz_localize("US/Central"),
+            }
+        )
+
+    def test_join_never_uses_later_snapshots(self):
+        snapshots, rows = self.join.join(self.games, snapshots=_snapshots())
+
+        self.assertEqual(rows["home_row"].tolist(), [1, 0])
+        self.assertEqual(rows["road_row"].tolist(), [0, 2])
+        self.assertTrue((rows["home_snapshot_time"] < self.games["game_time"]).all())
+        self.assertEqual(snapshots.loc[rows["road_row"].iloc[1], "ppg"], 27.0)
+
+    def test_load_reads_only_needed_partitions(self):
+        self.s3c.read_dataframe_from_s3.return_value = _snapshots()
+        self.join.join(self.games, columns=["ppg"])
+
+        keys = [
+            call.kwargs["s3_key"]
+            for call in self.s3c.read_dataframe_from_s3.call_args_list
+        ]
+        self.assertEqual(
+            keys,
+            [
+                "data/raw/team_rankings/year=2024/month=08/data.parquet",
+                "data/raw/team_rankings/year=2024/month=09/data.parquet",
+            ],
+        )
+        columns = self.s3c.read_dataframe_from_s3.call_args.kwargs["columns"]
+        self.assertEqual(columns, ["team", "date", "timestamp", "ppg"])
+
+    def test_games_from_odds(self):
+        odds = pd.DataFrame(
+            {
+                "game_id": ["g1", "g1", "g2"],
+                "game_time": ["2024-09-08T17:00:00Z"] * 2 + ["2024-09-05T00:20:00Z"],
+                "home_team": ["A", "A", "B"],
+                "away_team": ["C", "C", "D"],
+            }
+        )
+        self.assertEqual(games_from_odds(odds)["game_id"].tolist(), ["g2", "g1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fastparquet
+import numpy as np
+import pandas as pd
+
+from src.s3_io import s3_client
+from src.s3_io.s3_client import S3Client
+
+
+class TestSharedClient(unittest.TestCase):
+    """Tests for the process-wide boto3 client"""
+
+    def setUp(self):
+        patcher = patch.dict(s3_client._clients, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        stats = patch.dict(s3_client._client_stats, {"created": 0, "reused": 0})
+        stats.start()
+        self.addCleanup(stats.stop)
+
+    @patch.object(s3_client.boto3, "client")
+    def test_client_is_created_once_and_reused(self, client):
+        first = S3Client()
+        second = S3Client()
+
+        client.assert_called_once()
+        config = client.call_args.kwargs["config"]
+        self.assertEqual(config.max_pool_connections, s3_client.MAX_POOL_CONNECTIONS)
+        self.assertIs(first.s3_client, second.s3_client)
+        self.assertEqual(s3_client.client_stats(), {"created": 1, "reused": 1})
+
+    @patch.object(s3_client.boto3, "client")
+    def test_transfers_use_the_transfer_config(self, client):
+        s3c = S3Client()
+        s3c.read_dataframe_from_s3("bucket", "key.parquet")
+        kwargs = client.return_value.download_fileobj.call_args.kwargs
+        self.assertIs(kwargs["Config"], s3_client.TRANSFER_CONFIG)
+
+
+class TestListEtags(unittest.TestCase):
+    """Tests for listing partition ETags"""
+
+    def test_pages_are_merged(self):
+        s3c = S3Client()
+        s3c.s3_client = MagicMock()
+        s3c.s3_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "a", "ETag": '"1"'}]},
+            {"Contents": [{"Key": "b", "ETag": '"2"'}]},
+            {},
+        ]
+        self.assertEqual(s3c.list_etags("bucket", "data/"), {"a": '"1"', "b": '"2"'})
+
+
+class TestRowGroups(unittest.TestCase):
+    """Tests for bounded parquet row groups"""
+
+    def test_partitions_are_written_in_bounded_row_groups(self):
+        s3c = S3Client()
+        s3c.s3_client = MagicMock()
+        df = pd.DataFrame({"team": ["Dallas"] * 1000, "rating": np.arange(1000.0)})
+        row_bytes = df.memory_usage(deep=True).sum() / len(df)
+
+        with patch.object(s3_client, "ROW_GROUP_BYTES", int(row_bytes * 300)):
+            s3c.push_dataframe_to_s3(df, "bucket", "key.parquet")
+
+        buffer = s3c.s3_client.upload_fileobj.call_args.args[0]
+        parquet = fastparquet.ParquetFile(io.BytesIO(buffer.getvalue()))
+        rows = [rg.num_rows for rg in parquet.row_groups]
+        self.assertGreater(len(rows), 1)
+        self.assertLessEqual(max(rows), 300)
+        pd.testing.assert_frame_equal(parquet.to_pandas(), df)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -145,6 +145,17 @@ class TestS3DataTypeHandling(unittest.TestCase):
         except Exception as e:
             self.fail(f"Failed to handle offense_scoring_ep_pcnt_last3 column: {e}")
 
+    def test_datetimes_become_epoch_nanoseconds(self):
+        """Test datetime columns of any resolution are stored in nanoseconds"""
+        kickoff = pd.Timestamp('2024-09-09 08:00', tz='US/Central')
+        df = pd.DataFrame({'team': ['Team A'], 'timestamp': [kickoff]})
+        df['timestamp'] = df['timestamp'].dt.as_unit('s')
+
+        df_converted = self._convert_dataframe_types(df)
+
+        self.assertEqual(df_converted['timestamp'].iloc[0], kickoff.value)
+        self.assertEqual(pd.to_datetime(df_converted['timestamp'], utc=True).iloc[0], kickoff)
+
     def test_push_dataframe_to_s3_with_problematic_data(self):
         """Integration test for push_dataframe_to_s3 with various problematic data types"""
         df = pd.DataFrame({
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.team_features import TeamFeatureEngine, lag_weights
+
+
+def _snapshots():
+    dates = pd.date_range("2024-09-01", periods=5, freq="7D").strftime("%Y-%m-%d")
+    rows = []
+    for i, date in enumerate(dates):
+        rows.append({"team": "Kansas City", "date": date, "ppg": 20.0 + i, "ypp": 5.0})
+        if i != 2:
+            rows.append({"team": "Buffalo", "date": date, "ppg": 30.0, "ypp": np.nan})
+    return pd.DataFrame(rows)
+
+
+class TestTeamFeatureEngine(unittest.TestCase):
+    """Tests for the exponentially weighted team feature engine"""
+
+    def test_matches_per_team_weighted_mean(self):
+        engine = TeamFeatureEngine(game_sample=3, decay_factor=0.5)
+        features = engine.transform(_snapshots())
+
+        kc = features[features["team"] == "Kansas City"].reset_index(drop=True)
+        # last entry: values 24, 23, 22 with weights 1, .5, .25
+        expected = (24 + 0.5 * 23 + 0.25 * 22) / 1.75
+        self.assertAlmostEqual(float(kc["ppg"].iloc[-1]), expected, places=5)
+        self.assertAlmostEqual(float(kc["ppg"].iloc[0]), 20.0, places=5)
+        self.assertEqual(features["ppg"].dtype, np.float32)
+
+    def test_teams_have_their_own_history(self):
+        features = TeamFeatureEngine(game_sample=16).transform(_snapshots())
+
+        buffalo = features[features["team"] == "Buffalo"]
+        self.assertEqual(len(buffalo), 4)
+        self.assertTrue(np.allclose(buffalo["ppg"], 30.0))
+        self.assertTrue(buffalo["ypp"].isna().all())
+
+    def test_equal_weights_for_mean(self):
+        features = TeamFeatureEngine(game_sample=2, method="mean").transform(
+            _snapshots()
+        )
+        kc = features[features["team"] == "Kansas City"]
+        self.assertAlmostEqual(float(kc["ppg"].iloc[-1]), 23.5, places=5)
+
+    def test_unknown_method_raises(self):
+        with self.assertRaises(ValueError):
+            TeamFeatureEngine(method="median")
+
+    def test_lag_weights_decay(self):
+        np.testing.assert_allclose(lag_weights(3, 0.88), [1.0, 0.88, 0.88**2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.reference import stadiums, teams
+
+
+class TestTeamRegistry(unittest.TestCase):
+    """Tests for the canonical team registry"""
+
+    def test_every_source_spelling_maps_to_one_id(self):
+        ids = teams.team_ids(
+            [
+                "Kansas City Chiefs",  # odds
+                "Kansas City (10-2)",  # team rankings before stripping
+                "kansas city",
+                "KC",  # box scores
+                "KAN",
+            ]
+        )
+        self.assertEqual(ids.dtype, np.int8)
+        self.assertEqual(set(ids.tolist()), {16})
+
+    def test_relocated_and_renamed_teams(self):
+        ids = teams.team_ids(
+            ["Oakland Raiders", "San Diego Chargers", "St. Louis Rams", "WSH"]
+        )
+        self.assertEqual(teams.abbreviations(ids).tolist(), ["LV", "LAC", "LAR", "WAS"])
+
+    def test_unmapped_and_missing_names(self):
+        with patch.object(teams, "logger") as logger:
+            ids = teams.team_ids(["NY Giants", "Nowhere", None], source="odds")
+        np.testing.assert_array_equal(ids, [24, teams.UNMAPPED, teams.UNMAPPED])
+        logger.warning.assert_called_once()
+        self.assertIn("Nowhere", logger.warning.call_args[0][0])
+        self.assertEqual(teams.unmapped_names(["Nowhere", "NYG", None]), ["Nowhere"])
+
+    def test_catalog_teams_are_registered(self):
+        catalog = stadiums.team_stadiums()
+        self.assertEqual(sorted(catalog.index), teams.team_table()["team_id"].tolist())
+        self.assertEqual(len(teams.team_table()), 32)
+
+    def test_add_and_backfill_team_ids(self):
+        df = pd.DataFrame({"home_team": ["Buffalo Bills"], "away_team": ["Miami"]})
+        df = teams.add_team_ids(df, teams.ODDS_ID_COLUMNS)
+        self.assertEqual(df["home_team_id"].tolist(), [4])
+        self.assertEqual(df["away_team_id"].dtype, np.int8)
+
+        stored = df.assign(home_team_id=np.int8(0))
+        self.assertIs(teams.backfill_team_ids(stored, teams.ODDS_ID_COLUMNS), stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.travel_features import (
+    TravelMatrix,
+    haversine_miles,
+    schedule_features,
+)
+
+
+class TestTravelMatrix(unittest.TestCase):
+    """Tests for the precomputed venue distance matrix"""
+
+    def setUp(self):
+        self.matrix = TravelMatrix()
+
+    def test_distance_matrix_is_symmetric_with_zero_diagonal(self):
+        n = len(self.matrix.venues)
+        distance = self.matrix.distance[:n, :n]
+        self.assertEqual(distance.dtype, np.float32)
+        np.testing.assert_allclose(distance, distance.T)
+        np.testing.assert_array_equal(np.diag(distance), 0)
+        self.assertTrue(np.isnan(self.matrix.distance[-1]).all())
+
+    def test_haversine(self):
+        # Arrowhead to Highmark Stadium is roughly 870 miles
+        miles = haversine_miles(39.0489, -94.4839, 42.7738, -78.7870)
+        self.assertAlmostEqual(float(miles), 870, delta=15)
+
+    def test_team_codes_accept_names_and_abbreviations(self):
+        codes = self.matrix.team_codes(["KC", "Kansas City Chiefs", "Nowhere"])
+        self.assertEqual(codes[0], codes[1])
+        self.assertEqual(codes[2], -1)
+
+    def test_team_codes_accept_registry_aliases(self):
+        codes = self.matrix.team_codes(
+            ["JAC", "WSH", "LA", "Oakland Raiders", "Washington Redskins"]
+            + ["San Diego Chargers", "LA Chargers", "NY Jets"]
+        )
+        np.testing.assert_array_equal(codes, [15, 32, 19, 17, 32, 18, 18, 25])
+        home = self.matrix.team_venue[codes]
+        self.assertEqual(self.matrix.venues[home[2]], "sofi_stadium")
+        self.assertEqual(self.matrix.venues[home[3]], "allegiant_stadium")
+
+
+class TestScheduleFeatures(unittest.TestCase):
+    """Tests for travel, rest and timezone features of a schedule"""
+
+    def setUp(self):
+        self.schedule = pd.DataFrame(
+            {
+                "home_team": ["Kansas City Chiefs", "BUF", "LV", "JAX", "ARI"],
+                "away_team": ["Buffalo Bills", "Kansas City Chiefs", "BUF", "KC", "SF"],
+                "game_time": pd.to_datetime(
+                    [
+                        "2024-09-08 17:00",
+                        "2024-09-15 17:00",
+                        "2024-09-19 00:15",  # Wednesday night Eastern
+                        "2024-10-13 13:30",  # London
+                        "2024-12-01 21:00",
+                    ],
+                    utc=True,
+                ),
+                "venue": [None, None, None, "wembley_stadium", None],
+            }
+        )
+
+    def test_travel_from_home_stadium_to_venue(self):
+        df = schedule_features(self.schedule)
+        self.assertEqual(df.loc[0, "home_travel_miles"], 0)
+        self.assertAlmostEqual(df.loc[0, "road_travel_miles"], 870, delta=15)
+        self.assertAlmostEqual(
+            df.loc[0, "travel_delta"], -df.loc[0, "road_travel_miles"], places=3
+        )
+        # neutral site: both teams travel
+        self.assertGreater(df.loc[3, "home_travel_miles"], 4000)
+        self.assertGreater(df.loc[3, "road_travel_miles"], 4000)
+
+    def test_rest_days_per_team(self):
+        df = schedule_features(self.schedule)
+        self.assertTrue(np.isnan(df.loc[0, "home_rest_days"]))
+        self.assertEqual(df.loc[1, "road_rest_days"], 7)
+        self.assertEqual(df.loc[1, "home_rest_days"], 7)
+        # Sunday to Wednesday (Eastern)
+        self.assertEqual(df.loc[2, "road_rest_days"], 3)
+        # over MAX_REST_DAYS since the previous game
+        self.assertTrue(np.isnan(df.loc[3, "road_rest_days"]))
+
+    def test_timezone_shift_at_kickoff(self):
+        df = schedule_features(self.schedule)
+        # Kansas City (Central) to Buffalo (Eastern)
+        self.assertEqual(df.loc[1, "road_tz_shift"], 1)
+        # Jacksonville to London during BST / EDT
+        self.assertEqual(df.loc[3, "home_tz_shift"], 5)
+        # Arizona has no daylight saving: in December it is an hour ahead of
+        # San Francisco, in September it would match it
+        self.assertEqual(df.loc[4, "road_tz_shift"], 1)
+
+    def test_unknown_teams_are_nan(self):
+        schedule = self.schedule.assign(home_team="Nowhere")
+        df = schedule_features(schedule.iloc[:1])
+        self.assertTrue(np.isnan(df.loc[0, "home_travel_miles"]))
+        self.assertTrue(np.isnan(df.loc[0, "travel_delta"]))
+        self.assertTrue(np.isnan(df.loc[0, "road_travel_miles"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+import fastparquet
+import pandas as pd
+
+from src import memory_guard
+from src.s3_io import upsert
+from src.s3_io.s3_client import S3Client
+
+
+class _MemoryBoto:
+    """boto3 S3 client stand-in keeping objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        self.objects[key] = buffer.read()
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        buffer.write(self.objects[key])
+
+    def upload_file(self, file_path, bucket, key, Config=None):
+        with open(file_path, "rb") as f:
+            self.objects[key] = f.read()
+
+    def download_file(self, bucket, key, file_path, Config=None):
+        data = self.objects[key]
+        with open(file_path, "wb") as f:
+            f.write(data)
+
+
+def _snapshot(date, rating):
+    return pd.DataFrame(
+        {
+            "team": ["Dallas", "Detroit", "Miami"],
+            "date": date,
+            "rating": [rating, rating + 1.0, rating + 2.0],
+            "timestamp": pd.Timestamp(date, tz="US/Central"),
+        }
+    )
+
+
+def _merge(stored, df):
+    combined = pd.concat([stored, df], ignore_index=True)
+    return combined.drop_duplicates(
+        subset=[c for c in combined.columns if c != "timestamp"], keep="last"
+    )
+
+
+def _rows(df):
+    return sorted(map(tuple, df[["team", "date", "rating"]].to_numpy().tolist()))
+
+
+KEY = "data/raw/team_rankings/year=2024/month=11/data.parquet"
+
+
+class TestUpsertPartition(unittest.TestCase):
+    """Tests for memory-bounded partition upserts"""
+
+    def setUp(self):
+        self.s3c = S3Client()
+        self.s3c.s3_client = _MemoryBoto()
+        stored = pd.concat(
+            [_snapshot(f"2024-11-{day:02d}", float(day)) for day in range(1, 11)],
+            ignore_index=True,
+        )
+        self.s3c.push_dataframe_to_s3(stored, "bucket", KEY)
+        # the date being re-scraped repeats one row and changes the others
+        self.new = _snapshot("2024-11-10", 10.0)
+        self.new["rating"] = [10.0, 50.0, 60.0]
+
+    def _upsert(self, guard):
+        return upsert.upsert_partition(
+            self.s3c, "bucket", KEY, self.new, _merge, "date", guard=guard
+        )
+
+    def _stored(self):
+        return self.s3c.read_dataframe_from_s3("bucket", KEY)
+
+    def test_new_partition_is_written_whole(self):
+        self.s3c.s3_client.objects.clear()
+        result = self._upsert(memory_guard.MemoryGuard("test", limit=2**40))
+
+        self.assertEqual(result, {"rows": 3, "mode": "new"})
+        self.assertEqual(len(self._stored()), 3)
+
+    def test_chunked_upsert_matches_in_memory_upsert(self):
+        in_memory = self._upsert(memory_guard.MemoryGuard("test", limit=2**40))
+        expected = self._stored()
+        self.setUp()
+
+        # a 1 byte limit never fits, and 100 byte chunks give many row groups
+        with patch.object(upsert, "CHUNK_BYTES", 100):
+            chunked = self._upsert(memory_guard.MemoryGuard("test", limit=1))
+
+        self.assertEqual(in_memory["mode"], "memory")
+        self.assertEqual(chunked["mode"], "chunked")
+        self.assertEqual(chunked["rows"], in_memory["rows"])
+        self.assertEqual(chunked["rows"], 32)
+        result = self._stored()
+        self.assertEqual(_rows(result), _rows(expected))
+        self.assertEqual(result["timestamp"].dtype, expected["timestamp"].dtype)
+
+        buffer = io.BytesIO(self.s3c.s3_client.objects[KEY])
+        self.assertGreater(len(fastparquet.ParquetFile(buffer).row_groups), 1)
+
+    def test_new_columns_fall_back_to_in_memory_upsert(self):
+        self.new["offense_points"] = 24.0
+
+        result = self._upsert(memory_guard.MemoryGuard("test", limit=1))
+
+        self.assertEqual(result["mode"], "memory")
+        stored = self._stored()
+        self.assertIn("offense_points", stored.columns)
+        self.assertEqual(len(stored), 33)
+
+
+class TestMemoryGuard(unittest.TestCase):
+    """Tests for the RSS guard"""
+
+    def test_limit_comes_from_the_lambda_environment(self):
+        with patch.dict(os.environ, {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": "1024"}):
+            self.assertEqual(memory_guard.limit_bytes(), 1024 * 2**20)
+        with patch.dict(os.environ, {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": ""}):
+            self.assertEqual(
+                memory_guard.limit_bytes(), memory_guard.DEFAULT_LIMIT_MB * 2**20
+            )
+
+    def test_fits_and_headroom(self):
+        with patch.object(memory_guard, "rss_bytes", return_value=300 * 2**20):
+            guard = memory_guard.MemoryGuard("test", limit=512 * 2**20)
+            self.assertEqual(guard.headroom(), 212 * 2**20)
+            self.assertTrue(guard.fits(50 * 2**20))
+            self.assertFalse(guard.fits(100 * 2**20))
+
+            with patch.object(memory_guard, "logger") as logger:
+                guard.check("scraped")
+
+        self.assertEqual(guard.peak, 300 * 2**20)
+        message = logger.info.call_args[0][0]
+        self.assertIn("212 MB headroom of 512 MB", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
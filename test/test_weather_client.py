@@ -0,0 +1,195 @@
+import io
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter
+from urllib3 import HTTPResponse
+
+from src.data_clients.weather.weather_cache import WeatherCachePolicy
+from src.data_clients.weather.weather_client import (
+    WeatherClient,
+    block_to_frame,
+    extract_hourly,
+)
+from src.reference import stadiums
+from src.reference.teams import team_ids
+
+
+def _fake_response(n_hours, n_params, offset):
+    hourly = MagicMock()
+    hourly.Time.return_value = 1_725_494_400  # 2024-09-05T00:00Z
+    hourly.TimeEnd.return_value = 1_725_494_400 + n_hours * 3600
+    hourly.Interval.return_value = 3600
+    hourly.VariablesLength.return_value = n_params
+    hourly.Variables.side_effect = lambda i: MagicMock(
+        ValuesAsNumpy=MagicMock(
+            return_value=np.full(n_hours, offset + i, dtype=np.float32)
+        )
+    )
+    response = MagicMock()
+    response.Hourly.return_value = hourly
+    return response
+
+
+class TestWeatherClientBatch(unittest.TestCase):
+    """Tests for multi-venue weather requests"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.wc = WeatherClient(WeatherCachePolicy(cache_dir=self.cache_dir.name))
+        self.wc.client = MagicMock()
+        self.wc.client.weather_api.side_effect = lambda url, params: [
+            _fake_response(24, len(params["hourly"]), offset=i * 10)
+            for i in range(len(params["latitude"]))
+        ]
+
+    def test_batch_skips_domes_and_uses_one_request(self):
+        df = self.wc.get_historical_weather_batch("2024-09-05", "2024-09-05")
+
+        self.assertEqual(self.wc.client.weather_api.call_count, 1)
+        params = self.wc.client.weather_api.call_args.kwargs["params"]
+        outdoor = stadiums.venue_catalog(include_domes=False)
+        self.assertEqual(len(params["latitude"]), len(outdoor))
+        self.assertNotIn("ford_field", set(df["venue"]))
+        self.assertEqual(set(df["venue"]), set(outdoor["venue"]))
+        self.assertEqual(len(df), 24 * len(outdoor))
+
+    def test_batch_splits_responses_by_venue(self):
+        venues = stadiums.venue_catalog()
+        venues = venues[venues["venue"].isin(["lambeau_field", "soldier_field"])]
+        df = self.wc.get_weather_forecast_batch(venues=venues, param_list=["rain"])
+
+        by_venue = df.groupby("venue", observed=True)["rain"].first()
+        first, second = venues["venue"].tolist()
+        self.assertEqual(by_venue[first], 0.0)
+        self.assertEqual(by_venue[second], 10.0)
+        self.assertEqual(str(df["time"].dt.tz), "UTC")
+
+    def test_batch_frame_is_float32_with_categorical_venue(self):
+        df = self.wc.get_historical_weather_batch("2024-09-05", "2024-09-05")
+
+        self.assertIsInstance(df["venue"].dtype, pd.CategoricalDtype)
+        params = df.columns.drop(["venue", "time"])
+        self.assertTrue((df[params].dtypes == np.float32).all())
+
+
+class TestExtractHourly(unittest.TestCase):
+    """Tests for the generic float32 hourly extractor"""
+
+    def test_columns_follow_requested_order(self):
+        hourly = _fake_response(6, 3, offset=0).Hourly()
+        params = ["wind_speed_10m", "rain", "snowfall"]
+        block = extract_hourly(hourly, params)
+
+        self.assertEqual(block.shape, (6, 3))
+        self.assertEqual(block.dtype, np.float32)
+        df = block_to_frame(block, params)
+        self.assertEqual(df["wind_speed_10m"].iloc[0], 0.0)
+        self.assertEqual(df["snowfall"].iloc[0], 2.0)
+        self.assertTrue(np.shares_memory(df["rain"].to_numpy(), block))
+
+    def test_variable_count_mismatch_raises(self):
+        hourly = _fake_response(6, 2, offset=0).Hourly()
+        with self.assertRaises(ValueError):
+            extract_hourly(hourly, ["rain", "snowfall", "cloud_cover"])
+
+
+class _StaticAdapter(BaseAdapter):
+    """Transport adapter answering every request with the same JSON body"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response.raw = HTTPResponse(
+            body=io.BytesIO(b"{}"), status=200, preload_content=False
+        )
+        return response
+
+    def close(self):
+        pass
+
+
+class TestWeatherCachePolicy(unittest.TestCase):
+    """Tests for the bounded weather response cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.adapter = _StaticAdapter()
+
+    def _session(self, policy):
+        session = policy.create_session()
+        session.mount("https://", self.adapter)
+        self.addCleanup(session.close)
+        return session
+
+    def test_lru_eviction_and_hit_counts(self):
+        policy = WeatherCachePolicy(cache_dir=self.cache_dir.name, max_entries=2)
+        session = self._session(policy)
+        archive = "https://archive-api.open-meteo.com/v1/archive?q="
+        for query in ["a", "b", "a", "c", "a", "b"]:
+            session.get(archive + query)
+
+        # "b" was least recently used when "c" arrived, so it had to be refetched
+        self.assertEqual(
+            policy.stats(), {"hits": 2, "misses": 4, "evictions": 2, "entries": 2}
+        )
+        self.assertEqual(self.adapter.calls, 4)
+
+    def test_forecast_expires_and_archive_does_not(self):
+        policy = WeatherCachePolicy(cache_dir=self.cache_dir.name)
+        session = self._session(policy)
+        archive = session.get("https://archive-api.open-meteo.com/v1/archive?q=1")
+        forecast = session.get("https://api.open-meteo.com/v1/forecast?q=1")
+        self.assertIsNone(archive.expires)
+        self.assertIsNotNone(forecast.expires)
+
+    def test_persist_uploads_to_s3_after_misses(self):
+        s3c = MagicMock()
+        policy = WeatherCachePolicy(
+            cache_dir=self.cache_dir.name, s3c=s3c, bucket="test-bucket"
+        )
+        session = self._session(policy)
+        s3c.read_file_from_s3.assert_called_once()
+        policy.persist()
+        s3c.push_file_to_s3.assert_not_called()
+        session.get("https://archive-api.open-meteo.com/v1/archive?q=1")
+        policy.persist()
+        s3c.push_file_to_s3.assert_called_once()
+
+
+class TestStadiumCatalog(unittest.TestCase):
+    """Sanity checks on the stadium catalog"""
+
+    def test_every_team_has_a_stadium(self):
+        teams = stadiums.team_stadiums()
+        self.assertEqual(len(teams), 32)
+        self.assertTrue(
+            teams["roof"]
+            .isin([stadiums.ROOF_OPEN, stadiums.ROOF_RETRACTABLE, stadiums.ROOF_DOME])
+            .all()
+        )
+        giants, jets = team_ids(["NYG", "NYJ"])
+        self.assertEqual(teams.loc[giants, "venue"], teams.loc[jets, "venue"])
+
+    def test_venue_catalog_is_unique(self):
+        venues = stadiums.venue_catalog()
+        self.assertTrue(venues["venue"].is_unique)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.data_collectors import weather_data_collector
+from src.data_collectors.weather_data_collector import (
+    WeatherDataCollector,
+    merge_spans,
+    missing_spans,
+    plan_requests,
+)
+
+
+def _day(value):
+    return pd.Timestamp(value)
+
+
+def _span(first, last):
+    return (_day(first), _day(last))
+
+
+class TestWeatherGapPlanning(unittest.TestCase):
+    """Tests for working out which (venue, date) spans to fetch"""
+
+    def test_merge_spans_joins_adjacent_and_near_spans(self):
+        spans = [_span("2024-09-10", "2024-09-12"), _span("2024-09-01", "2024-09-09")]
+        self.assertEqual(merge_spans(spans), [_span("2024-09-01", "2024-09-12")])
+
+        apart = [_span("2024-09-01", "2024-09-02"), _span("2024-09-06", "2024-09-07")]
+        self.assertEqual(len(merge_spans(apart)), 2)
+        self.assertEqual(
+            merge_spans(apart, gap_days=3), [_span("2024-09-01", "2024-09-07")]
+        )
+
+    def test_missing_spans_is_complement_of_coverage(self):
+        covered = [_span("2024-09-05", "2024-09-10"), _span("2024-09-20", "2024-10-05")]
+        missing = missing_spans(covered, _day("2024-09-01"), _day("2024-09-30"))
+        self.assertEqual(
+            missing,
+            [_span("2024-09-01", "2024-09-04"), _span("2024-09-11", "2024-09-19")],
+        )
+        self.assertEqual(
+            missing_spans(covered, _day("2024-09-06"), _day("2024-09-08")), []
+        )
+
+    def test_plan_groups_venues_and_splits_long_spans(self):
+        coverage = {
+            "lambeau_field": [_span("2022-01-01", "2024-09-30")],
+            "soldier_field": [_span("2022-01-01", "2024-09-30")],
+        }
+        plan = plan_requests(
+            coverage,
+            ["lambeau_field", "soldier_field", "wembley_stadium"],
+            _day("2024-01-01"),
+            _day("2024-10-02"),
+            max_span_days=200,
+        )
+
+        # the daily increment for both covered venues is one request, first
+        first, last, venues = plan[0]
+        self.assertEqual((first, last), _span("2024-10-01", "2024-10-02"))
+        self.assertEqual(venues, ["lambeau_field", "soldier_field"])
+        # the new venue's backfill is split newest first
+        self.assertEqual(
+            [(first, last) for first, last, _ in plan[1:]],
+            [_span("2024-03-17", "2024-10-02"), _span("2024-01-01", "2024-03-16")],
+        )
+
+
+class TestWeatherDataCollector(unittest.TestCase):
+    """Tests for the incremental weather collector"""
+
+    def setUp(self):
+        with patch.object(weather_data_collector.s3_client, "S3Client"), patch.object(
+            weather_data_collector.weather_client, "WeatherClient"
+        ):
+            self.wdc = WeatherDataCollector()
+        self.wdc.store = MagicMock()
+        self.wdc.wc.cache_policy.persist.return_value = {"hits": 0, "misses": 1}
+        self.wdc.wc.get_historical_weather_batch.return_value = pd.DataFrame(
+            {"venue": ["lambeau_field"], "time": [pd.Timestamp("2024-10-01", tz="UTC")]}
+        )
+
+    def test_collect_fetches_only_new_days_and_checkpoints(self):
+        outdoor = weather_data_collector.stadiums.venue_catalog(include_domes=False)
+        self.wdc.s3c.read_json_from_s3.return_value = {
+            "venues": {v: [["2024-08-01", "2024-09-30"]] for v in outdoor["venue"]}
+        }
+
+        result = self.wdc.collect(
+            pd.Timestamp("2024-10-07 08:00", tz="US/Central"), start="2024-08-01"
+        )
+
+        self.assertEqual(result["requests"], 1)
+        self.assertEqual(result["remaining"], 0)
+        self.assertEqual(result["cache"], {"hits": 0, "misses": 1})
+        kwargs = self.wdc.wc.get_historical_weather_batch.call_args.kwargs
+        self.assertEqual(kwargs["start_date"], "2024-10-01")
+        self.assertEqual(kwargs["end_date"], "2024-10-02")
+        self.assertEqual(len(kwargs["venues"]), len(outdoor))
+        state = self.wdc.s3c.push_json_to_s3.call_args.args[0]
+        self.assertEqual(
+            state["venues"]["lambeau_field"], [["2024-08-01", "2024-10-02"]]
+        )
+
+    def test_collect_stops_when_time_budget_is_spent(self):
+        self.wdc.s3c.read_json_from_s3.return_value = None
+
+        result = self.wdc.collect(
+            pd.Timestamp("2024-10-07"), start="2022-01-01", time_budget_seconds=0
+        )
+
+        self.assertEqual(result["requests"], 0)
+        self.assertGreater(result["remaining"], 0)
+        self.wdc.wc.get_historical_weather_batch.assert_not_called()
+
+    def test_cache_is_persisted_when_a_request_fails(self):
+        self.wdc.s3c.read_json_from_s3.return_value = None
+        self.wdc.wc.get_historical_weather_batch.side_effect = TimeoutError
+
+        with self.assertRaises(TimeoutError):
+            self.wdc.collect(pd.Timestamp("2024-10-07"), start="2024-09-01")
+
+        self.wdc.wc.cache_policy.persist.assert_called_once()
+
+    def test_cache_is_backed_by_the_shared_s3_client(self):
+        s3c = MagicMock()
+        with patch.object(
+            weather_data_collector.weather_client, "WeatherClient"
+        ) as client:
+            wdc = WeatherDataCollector(s3c=s3c)
+
+        policy = client.call_args.kwargs["cache_policy"]
+        self.assertIs(policy.s3c, s3c)
+        self.assertEqual(policy.bucket, wdc.bucket)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from src.features.weather_features import (
+    VenueDayCache,
+    WeatherFeatureBuilder,
+    game_window_features,
+)
+
+
+def _hourly(venue, start, values):
+    times = pd.date_range(start, periods=len(values), freq="h", tz="UTC")
+    return pd.DataFrame(
+        {
+            "venue": venue,
+            "time": times,
+            "wind_speed_10m": np.asarray(values, dtype=np.float32),
+            "wind_gusts_10m": np.asarray(values, dtype=np.float32) * 2,
+            "rain": np.full(len(values), 0.1, dtype=np.float32),
+        }
+    )
+
+
+class TestGameWindowFeatures(unittest.TestCase):
+    """Tests for the vectorized kickoff window lookup"""
+
+    def setUp(self):
+        self.hourly = pd.concat(
+            [
+                _hourly("lambeau_field", "2024-09-08T00:00Z", np.arange(48)),
+                _hourly("soldier_field", "2024-09-08T00:00Z", np.arange(48) + 100),
+            ]
+        ).sample(frac=1.0, random_state=0)
+
+    def test_window_aggregates(self):
+        games = pd.DataFrame(
+            {
+                "kickoff": pd.to_datetime(
+                    ["2024-09-08T17:25Z", "2024-09-09T00:20Z", "2024-09-08T17:00Z"]
+                ),
+                "venue": ["lambeau_field", "soldier_field", "ford_field"],
+            },
+            index=[10, 11, 12],
+        )
+        result = game_window_features(games, self.hourly)
+
+        self.assertEqual(list(result.index), [10, 11, 12])
+        np.testing.assert_array_equal(result["weather_hours"], [4, 4, 0])
+        self.assertAlmostEqual(result.loc[10, "wind_speed_mean"], 18.5)
+        self.assertAlmostEqual(result.loc[10, "wind_gusts_max"], 40.0)
+        self.assertAlmostEqual(result.loc[10, "rain_total"], 0.4, places=5)
+        self.assertAlmostEqual(result.loc[11, "wind_speed_mean"], 125.5)
+        self.assertTrue(np.isnan(result.loc[12, "wind_speed_mean"]))
+        self.assertNotIn("snowfall_total", result.columns)
+
+    def test_sum_of_missing_hours_is_nan(self):
+        hourly = _hourly("lambeau_field", "2024-09-08T00:00Z", np.arange(48))
+        hourly["precipitation"] = np.nan
+        hourly.loc[hourly.index[18], "precipitation"] = 0.5
+        games = pd.DataFrame(
+            {
+                "kickoff": pd.to_datetime(["2024-09-08T17:00Z", "2024-09-09T17:00Z"]),
+                "venue": ["lambeau_field", "lambeau_field"],
+            }
+        )
+        result = game_window_features(games, hourly)
+
+        self.assertAlmostEqual(result.loc[0, "precipitation_total"], 0.5)
+        self.assertTrue(np.isnan(result.loc[1, "precipitation_total"]))
+        self.assertAlmostEqual(result.loc[1, "rain_total"], 0.4, places=5)
+
+    def test_window_past_end_of_data_is_partial(self):
+        games = pd.DataFrame(
+            {
+                "kickoff": pd.to_datetime(["2024-09-09T22:00Z", "2024-09-12T00:00Z"]),
+                "venue": ["lambeau_field", "lambeau_field"],
+            }
+        )
+        result = game_window_features(games, self.hourly)
+        np.testing.assert_array_equal(result["weather_hours"], [2, 0])
+        self.assertAlmostEqual(result.loc[0, "wind_speed_mean"], 46.5)
+
+
+class TestWeatherFeatureBuilder(unittest.TestCase):
+    """Tests for reuse of cached venue days"""
+
+    def test_second_build_reuses_cache(self):
+        client = MagicMock()
+        client.get_historical_weather_batch.return_value = _hourly(
+            "lambeau_field", "2024-09-08T00:00Z", np.arange(24)
+        )
+        builder = WeatherFeatureBuilder(client, cache=VenueDayCache())
+        games = pd.DataFrame(
+            {
+                "kickoff": pd.to_datetime(["2024-09-08T17:25Z", "2024-09-08T20:25Z"]),
+                "venue": ["lambeau_field", "ford_field"],
+            }
+        )
+        now = pd.Timestamp("2025-01-01T00:00Z")
+        first = builder.build(games, now=now)
+        second = builder.build(games, now=now)
+
+        self.assertEqual(client.get_historical_weather_batch.call_count, 1)
+        venues = client.get_historical_weather_batch.call_args.kwargs["venues"]
+        self.assertEqual(list(venues["venue"]), ["lambeau_field"])
+        pd.testing.assert_frame_equal(first, second)
+        client.get_weather_forecast_batch.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data_clients.weather.weather_store import WeatherStore
+from src.s3_io.s3_client import S3Client
+
+
+class _MemoryBoto:
+    """boto3 S3 client stand-in keeping objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, buffer, bucket, key, Config=None):
+        self.objects[key] = buffer.read()
+
+    def download_fileobj(self, bucket, key, buffer, Config=None):
+        buffer.write(self.objects[key])
+
+
+def _hourly(venue, start, n_hours, rain):
+    return pd.DataFrame(
+        {
+            "venue": venue,
+            "time": pd.date_range(start, periods=n_hours, freq="h", tz="UTC"),
+            "rain": np.full(n_hours, rain),
+            "temperature_2m": np.arange(n_hours, dtype=np.float64),
+        }
+    )
+
+
+class TestWeatherStore(unittest.TestCase):
+    """Tests for the partitioned float32 weather store"""
+
+    def setUp(self):
+        self.s3c = S3Client()
+        self.s3c.s3_client = _MemoryBoto()
+        self.store = WeatherStore(self.s3c, "bucket")
+
+    def test_write_partitions_by_utc_month_and_upserts(self):
+        keys = self.store.write(_hourly("lambeau_field", "2024-09-30 22:00", 4, 1.0))
+        self.assertEqual(
+            keys,
+            [
+                "data/raw/weather/year=2024/month=09/data.parquet",
+                "data/raw/weather/year=2024/month=10/data.parquet",
+            ],
+        )
+        self.store.write(_hourly("lambeau_field", "2024-10-01 01:00", 2, 5.0))
+
+        df = self.store.read("2024-09-30", "2024-10-02")
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df["rain"].tolist(), [1.0, 1.0, 1.0, 5.0, 5.0])
+        self.assertEqual(df["rain"].dtype, np.float32)
+        self.assertEqual(df["temperature_2m"].dtype, np.float32)
+        self.assertIsInstance(df["venue"].dtype, pd.CategoricalDtype)
+
+    def test_read_filters_time_venue_and_columns(self):
+        self.store.write(
+            pd.concat(
+                [
+                    _hourly("lambeau_field", "2024-09-08", 24, 0.0),
+                    _hourly("soldier_field", "2024-09-08", 24, 2.0),
+                ]
+            )
+        )
+
+        df = self.store.read(
+            "2024-09-08 12:00",
+            "2024-09-08 15:00",
+            venues=["soldier_field"],
+            columns=["rain"],
+        )
+        self.assertEqual(list(df.columns), ["venue", "time", "rain"])
+        self.assertEqual(len(df), 4)
+        self.assertEqual(set(df["venue"]), {"soldier_field"})
+
+
+if __name__ == "__main__":
+    unittest.main()